@@ -3,8 +3,9 @@
 -- Purpose: Create clean, normalized tables for ML and analysis
 -- ============================================================================
 
--- Drop existing normalized tables if they exist
-DROP TABLE IF EXISTS unified_data CASCADE;
+-- Drop existing normalized tables if they exist. unified_data is kept: its
+-- partitions, column types and indexes come from docker/01-init-schema.sql
+-- and the Django migrations, and objects derived from it depend on it
 DROP TABLE IF EXISTS weather CASCADE;
 DROP TABLE IF EXISTS measurements CASCADE;
 
@@ -95,59 +96,11 @@ COMMENT ON TABLE weather IS 'Normalized meteorological data from Open-Meteo';
 -- ============================================================================
 -- 3. UNIFIED_DATA TABLE (ML-Ready Dataset)
 -- Combines measurements + weather for machine learning
--- One row per timestamp with all features
+-- One row per timestamp with all features. The table is created by
+-- docker/01-init-schema.sql, which normalize_data.py runs first; here it is
+-- only emptied for the reload
 -- ============================================================================
-CREATE TABLE unified_data (
-    id SERIAL PRIMARY KEY,
-    timestamp_utc TIMESTAMP NOT NULL,
-    location VARCHAR(100) NOT NULL,
-    
-    -- Air Quality Pollutants
-    pm25 DECIMAL(12,6),
-    pm10 DECIMAL(12,6),
-    no2 DECIMAL(12,6),
-    o3 DECIMAL(12,6),
-    so2 DECIMAL(12,6),
-    co DECIMAL(12,6),
-    
-    -- Weather Features
-    temperature_c DECIMAL(5,2),
-    humidity_pct INTEGER,
-    pressure_hpa DECIMAL(7,2),
-    wind_speed_ms DECIMAL(5,2),
-    wind_direction_deg INTEGER,
-    precipitation_mm DECIMAL(6,2),
-    cloud_cover_pct INTEGER,
-    
-    -- Temporal Features (for ML)
-    hour INTEGER,
-    day_of_week INTEGER,  -- 0=Monday, 6=Sunday
-    day_of_month INTEGER,
-    month INTEGER,
-    season VARCHAR(10),  -- winter, spring, summer, autumn
-    is_weekend BOOLEAN,
-    is_heating_season BOOLEAN,  -- Oct-Apr for Astana
-    
-    -- Data Completeness
-    pm25_source VARCHAR(50),
-    weather_source VARCHAR(50),
-    completeness_score DECIMAL(3,2),  -- 0.0 to 1.0
-    
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- Indexes
-CREATE INDEX idx_unified_timestamp ON unified_data(timestamp_utc);
-CREATE INDEX idx_unified_location ON unified_data(location);
-CREATE INDEX idx_unified_pm25 ON unified_data(pm25) WHERE pm25 IS NOT NULL;
-CREATE INDEX idx_unified_complete ON unified_data(completeness_score) 
-WHERE completeness_score >= 0.8;
-
--- Unique constraint
-CREATE UNIQUE INDEX idx_unified_unique 
-ON unified_data(timestamp_utc, location);
-
-COMMENT ON TABLE unified_data IS 'ML-ready unified dataset with all features';
+TRUNCATE unified_data;
 
 
 -- ============================================================================
@@ -0,0 +1,188 @@
+"""
+Coroutine versions of the dashboard data views.
+
+Served under ASGI (``backend.core.asgi``, which turns on API_ASYNC_VIEWS).
+Queries run on the async connection pool, so a request waiting on
+PostgreSQL does not hold a thread; SQL, validation and payloads are shared
+with ``data_views``, and responses are cached under the same keys.
+"""
+
+import asyncio
+
+from django.views.decorators.http import require_GET
+
+from backend.application.api.caching import cached_response
+from backend.application.api.conditional import conditional_on_data_version
+from backend.application.api.data_views import (
+    CURRENT_SQL,
+    DAILY_ROW_NAMES,
+    PARAMETER_COLUMNS,
+    TIMESERIES_ROW_NAMES,
+    bounds_range,
+    current_payload,
+    daily_args,
+    daily_payload,
+    daily_query,
+    dashboard_args,
+    hourly_pattern_query,
+    monthly_pattern_query,
+    range_from_latest,
+    series_payload,
+    statistics_args,
+    statistics_payload,
+    time_bounds,
+    timeseries_args,
+    timeseries_query,
+    timeseries_stream,
+    timeseries_window,
+)
+from backend.application.api.json_encoding import FastJsonResponse
+from backend.application.api.renderers import (
+    json_rows_response,
+    row_payload,
+    tabular_response,
+)
+from backend.infrastructure.database import async_pool, rollups, stats
+
+
+async def window_range(column, days):
+    """`data_views.window_range` on the async pool."""
+    row = await async_pool.fetchone(rollups.LATEST_BUCKET_SQL, [column])
+    return range_from_latest(row[0], days)
+
+
+async def current_range(request):
+    return await window_range('pm25', 0)
+
+
+async def timeseries_range(request):
+    bounds = time_bounds(request)
+    if bounds:
+        return bounds_range(bounds)
+    return await window_range(*timeseries_window(request))
+
+
+async def daily_range(request):
+    days, bounds = daily_args(request)
+    if bounds:
+        return bounds_range(bounds)
+    return await window_range('pm25', days)
+
+
+async def fetch_statistics(parameter='pm25', by=None):
+    rows = await async_pool.fetchall(stats.CELLS_SQL, [PARAMETER_COLUMNS[parameter]])
+    return statistics_payload(stats.cells_from_rows(rows), parameter, by)
+
+
+@require_GET
+@conditional_on_data_version
+@cached_response(current_range)
+async def current_data(request):
+    """Get the most recent air quality reading."""
+    payload = current_payload(await async_pool.fetchone(CURRENT_SQL))
+    if payload is None:
+        return FastJsonResponse({'error': 'No data available'}, status=404)
+    return FastJsonResponse(payload)
+
+
+@require_GET
+@conditional_on_data_version
+@cached_response(timeseries_range)
+async def timeseries_data(request):
+    """
+    Get time series data for charts, served from the rollup pyramid.
+
+    Streamed exports (``stream=1``) read a server-side cursor batch by
+    batch (see ``data_views.timeseries_stream``).
+    """
+    try:
+        query, max_points, method, stream = timeseries_args(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+
+    if stream:
+        return timeseries_stream(request, query)
+
+    rows = await async_pool.fetchall(query.sql, query.params)
+    meta, columns = series_payload(query, rows, max_points, method)
+    return tabular_response(request, meta, columns, row_names=TIMESERIES_ROW_NAMES)
+
+
+@require_GET
+@conditional_on_data_version
+@cached_response(daily_range)
+async def daily_averages(request):
+    """Get daily average PM2.5 for the last N days (or `start`/`end`) from the 1d rollup."""
+    try:
+        days, bounds = daily_args(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+    rows = await async_pool.fetchall(*daily_query(days, bounds))
+    meta, columns = daily_payload(days, rows, bounds)
+    return tabular_response(request, meta, columns, row_names=DAILY_ROW_NAMES)
+
+
+@require_GET
+@conditional_on_data_version
+@cached_response()
+async def statistics(request):
+    """Get summary statistics for a parameter (default PM2.5)."""
+    try:
+        parameter, by = statistics_args(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+    return FastJsonResponse(await fetch_statistics(parameter, by))
+
+
+@require_GET
+@conditional_on_data_version
+@cached_response()
+async def dashboard_bundle(request):
+    """
+    Everything the dashboard needs on first load, in one response.
+
+    The four queries run concurrently on pooled connections.
+    """
+    try:
+        days, max_points = dashboard_args(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+
+    series = timeseries_query('pm25', '1h', days)
+    current, summary, series_rows, daily_rows = await asyncio.gather(
+        async_pool.fetchone(CURRENT_SQL),
+        fetch_statistics(),
+        async_pool.fetchall(series.sql, series.params),
+        async_pool.fetchall(*daily_query(days)),
+    )
+
+    return FastJsonResponse({
+        'current': current_payload(current) or {'error': 'No data available'},
+        'statistics': summary,
+        'timeseries': row_payload(*series_payload(series, series_rows, max_points), TIMESERIES_ROW_NAMES),
+        'daily': row_payload(*daily_payload(days, daily_rows), DAILY_ROW_NAMES),
+    })
+
+
+@require_GET
+@conditional_on_data_version
+@cached_response()
+async def hourly_pattern(request):
+    """Get average PM2.5 (or `parameter`) by hour of day from the pattern cube."""
+    try:
+        meta, sql, params = hourly_pattern_query(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+    return json_rows_response(meta, await async_pool.fetch_json_rows(sql, 'hour', params))
+
+
+@require_GET
+@conditional_on_data_version
+@cached_response()
+async def monthly_pattern(request):
+    """Get average PM2.5 (or `parameter`) by month from the pattern cube."""
+    try:
+        meta, sql, params = monthly_pattern_query(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+    return json_rows_response(meta, await async_pool.fetch_json_rows(sql, 'month', params))
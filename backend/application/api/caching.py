@@ -0,0 +1,147 @@
+"""
+Response caching for the data API.
+
+`cached_response` stores a view's rendered response in the shared ``api``
+cache, keyed by endpoint, normalized query parameters and negotiated media
+type. Entries are dropped by ingestion only when the batch overlaps the
+time range the response was computed from (see
+``backend.infrastructure.cache.response_cache``). Concurrent misses for the
+same key are computed once and shared (``X-Cache: COALESCED``, see
+``backend.infrastructure.cache.coalescing``).
+"""
+
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from backend.application.api.conditional import (
+    arequest_data_version,
+    request_data_version,
+)
+from backend.application.api.renderers import negotiate
+from backend.infrastructure.cache import coalescing, response_cache
+
+
+def _to_payload(response):
+    return {
+        'status': response.status_code,
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'vary': response.get('Vary'),
+    }
+
+
+def _from_payload(payload):
+    response = HttpResponse(
+        payload['content'],
+        status=payload['status'],
+        content_type=payload['content_type'],
+    )
+    if payload['vary']:
+        patch_vary_headers(response, [v.strip() for v in payload['vary'].split(',')])
+    return response
+
+
+def _coalesced(payload):
+    response = _from_payload(payload)
+    response['X-Cache'] = 'COALESCED'
+    return response
+
+
+def _offloaded(func):
+    """
+    `func` as a coroutine run in a worker thread.
+
+    File and Redis cache calls block, which would stall every coroutine
+    of the event loop; ``sync`` stays inline as it only touches a
+    process-local cache.
+    """
+    return sync_to_async(func, thread_sensitive=False)
+
+
+def cached_response(time_range=None):
+    """
+    Cache successful, non-streaming responses of a view.
+
+    `time_range(request)` returns the ``(start, end)`` range the response
+    depends on (``end=None`` for "up to the newest data"); without it the
+    response is treated as covering the whole history. It is only called on
+    a miss, after the view has run. Requests missing the same key meanwhile
+    wait for that run instead of repeating it.
+
+    Coroutine views take a coroutine `time_range`. Sync and coroutine views
+    of the same name share entries.
+    """
+    def decorator(view_func):
+        endpoint = view_func.__name__
+
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                response_cache.sync(await arequest_data_version(request))
+                key = response_cache.make_key(endpoint, request.GET, negotiate(request))
+
+                payload = await _offloaded(response_cache.lookup)(key)
+                if payload is not None:
+                    response = _from_payload(payload)
+                    response['X-Cache'] = 'HIT'
+                    return response
+
+                async def compute():
+                    epoch = await _offloaded(response_cache.current_epoch)()
+                    response = await view_func(request, *args, **kwargs)
+                    if response.status_code != 200 or response.streaming:
+                        return response, None
+                    payload = _to_payload(response)
+                    current = await arequest_data_version(request)
+                    await _offloaded(response_cache.store)(
+                        key,
+                        payload,
+                        await time_range(request) if time_range else None,
+                        current.latest_timestamp if current else None,
+                        epoch,
+                    )
+                    response['X-Cache'] = 'MISS'
+                    return response, payload
+
+                response, payload = await coalescing.arun(key, compute)
+                return response if response is not None else _coalesced(payload)
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response_cache.sync(request_data_version(request))
+            key = response_cache.make_key(endpoint, request.GET, negotiate(request))
+
+            payload = response_cache.lookup(key)
+            if payload is not None:
+                response = _from_payload(payload)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            def compute():
+                epoch = response_cache.current_epoch()
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != 200 or response.streaming:
+                    return response, None
+                payload = _to_payload(response)
+                current = request_data_version(request)
+                response_cache.store(
+                    key,
+                    payload,
+                    time_range(request) if time_range else None,
+                    current.latest_timestamp if current else None,
+                    epoch,
+                )
+                response['X-Cache'] = 'MISS'
+                return response, payload
+
+            response, payload = coalescing.run(key, compute)
+            return response if response is not None else _coalesced(payload)
+
+        return wrapper
+    return decorator
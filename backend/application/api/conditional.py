@@ -0,0 +1,82 @@
+"""
+HTTP conditional GET for the data API.
+
+ETag and Last-Modified come from the global data version, which only moves
+when ingestion runs. A client repeating a request with If-None-Match or
+If-Modified-Since gets a 304 after one primary-key lookup, without the
+view's SQL running.
+"""
+
+import hashlib
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from backend.infrastructure.database.data_version import (
+    aget_data_version,
+    get_data_version,
+)
+
+
+def request_data_version(request):
+    """DataVersion for this request, looked up once."""
+    if not hasattr(request, '_data_version'):
+        request._data_version = get_data_version()
+    return request._data_version
+
+
+async def arequest_data_version(request):
+    """`request_data_version` for coroutine views, on the async pool."""
+    if not hasattr(request, '_data_version'):
+        request._data_version = await aget_data_version()
+    return request._data_version
+
+
+def data_etag(request, *args, **kwargs):
+    """ETag for this representation at the current data version."""
+    current = request_data_version(request)
+    if current is None:
+        return None
+    # Query string and Accept select different representations of the data
+    variant = hashlib.md5(
+        (request.get_full_path() + '|' + request.headers.get('Accept', '')).encode()
+    ).hexdigest()[:16]
+    return f'"v{current.version}-{variant}"'
+
+
+def data_last_modified(request, *args, **kwargs):
+    """Time of the last ingestion batch."""
+    current = request_data_version(request)
+    return current.updated_at if current else None
+
+
+def conditional_on_data_version(view_func):
+    """
+    Answer unchanged requests with 304 based on the data version.
+
+    Responses are marked ``no-cache`` so browsers store them but revalidate
+    on every use, which is what turns repeated polling into 304s. Coroutine
+    views are supported; their data version is read on the async pool.
+    """
+    conditional_view = condition(etag_func=data_etag, last_modified_func=data_last_modified)(view_func)
+
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            # Loaded up front so the ETag functions only read the memoized value
+            await arequest_data_version(request)
+            response = await conditional_view(request, *args, **kwargs)
+            patch_cache_control(response, no_cache=True)
+            return response
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        response = conditional_view(request, *args, **kwargs)
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    return wrapper
@@ -4,34 +4,232 @@ Provides REST endpoints for air quality data visualization.
 Updated to match actual database schema.
 """
 
-from datetime import datetime, timedelta
-from decimal import Decimal
-from django.http import JsonResponse
-from django.db import connection
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import datetime, time, timedelta, timezone
+import numpy as np
+from django.db import connection, connections
+from django.utils.dateparse import parse_date, parse_datetime
 from django.views.decorators.http import require_GET
-from django.views.decorators.cache import cache_page
 
+from backend.application import stations
+from backend.application.api.caching import cached_response
+from backend.application.api.conditional import conditional_on_data_version
+from backend.application.api.json_encoding import FastJsonResponse
+from backend.application.api.renderers import (
+    JSON,
+    json_rows_response,
+    negotiate,
+    row_payload,
+    stream_tabular_response,
+    tabular_response,
+)
+from backend.domain.services import aqi, correlation, downsampling
+from backend.domain.services.statistics import PM25_CATEGORIES, RunningStats, merge_all
+from backend.infrastructure.cache import response_cache
+from backend.infrastructure.database import patterns, pools, rollups, stats
+from backend.infrastructure.database.cursors import fetch_json_rows, iter_batches
 
-def convert_decimal(value):
-    """Convert Decimal to float for JSON serialization."""
-    if isinstance(value, Decimal):
-        return float(value)
+# Upper bound on the window of streamed exports (stream=1)
+STREAM_MAX_DAYS = 3650
+
+# Row-layout JSON keys for the columnar names used internally
+TIMESERIES_ROW_NAMES = {'t': 'timestamp', 'v': 'value'}
+DAILY_ROW_NAMES = {'t': 'date'}
+
+# Buckets a `resolution=auto` response aims for, by default and at most
+AUTO_TARGET_POINTS = 500
+MAX_TARGET_POINTS = 5000
+
+# Fewest points `max_points` may ask for: LTTB keeps the first, the last
+# and one point per bucket in between
+MIN_MAX_POINTS = 3
+
+# Buckets a non-streamed time series may hold (a year of hours)
+MAX_BUCKETS = 365 * 24
+
+# A built series query: SQL plus the fields to pick from each row
+SeriesQuery = namedtuple('SeriesQuery', ['sql', 'params', 'meta', 'names', 'positions'])
+
+# Runs the dashboard bundle's queries side by side
+_bundle_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='dashboard-bundle')
+
+# Map API parameter names to actual DB columns
+PARAMETER_COLUMNS = {
+    'pm25': 'pm25',
+    'pm10': 'pm10',
+    'no2': 'no2',
+    'so2': 'so2',
+    'o3': 'o3',
+    'co': 'co',
+    'temperature': 'temperature_c',
+    'humidity': 'humidity_pct',
+    'wind_speed': 'wind_speed_ms',
+}
+
+# Columns available to /api/correlation/
+CORRELATION_COLUMNS = {
+    'pm25': 'pm25',
+    'temperature': 'temperature_c',
+    'humidity': 'humidity_pct',
+    'wind_speed': 'wind_speed_ms',
+    'pressure': 'pressure_hpa',
+}
+
+# Seasons in calendar order, for per-season breakdowns
+SEASONS = ('winter', 'spring', 'summer', 'autumn')
+
+
+def wants_stream(request):
+    """True if the client asked for a streamed (batched) response."""
+    return request.GET.get('stream', '').lower() in ('1', 'true', 'yes')
+
+
+def window_range(column, days):
+    """
+    Cache range of a "last N days" window anchored on `column`'s newest data.
+
+    Coarse buckets start up to a week before the window, so the range does
+    too. Returns None (whole history) when there is no data yet.
+    """
+    with connection.cursor() as cursor:
+        latest = rollups.latest_bucket(cursor, column)
+    return range_from_latest(latest, days)
+
+
+def range_from_latest(latest, days):
+    """`window_range` given the newest bucket of the anchoring column."""
+    if latest is None:
+        return None
+    return (latest - timedelta(days=days + 7), None)
+
+
+def bounds_range(bounds):
+    """
+    Cache range of an explicit [start, end] window.
+
+    Buckets may start up to a month before `start` and reach up to a
+    month past `end`.
+    """
+    start, end = bounds
+    return (start - timedelta(days=31), end + timedelta(days=31))
+
+
+def int_param(request, name, default, low=None, high=None):
+    """
+    Integer query parameter `name` (`default` if absent), clamped to [low, high].
+
+    Raises ValueError with the message for the client if it is not an integer.
+    """
+    text = request.GET.get(name, '').strip()
+    if not text:
+        return default
+    try:
+        value = int(text)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer") from None
+    if low is not None:
+        value = max(value, low)
+    if high is not None:
+        value = min(value, high)
     return value
 
 
-def dictfetchall(cursor):
-    """Return all rows from a cursor as a list of dicts."""
-    columns = [col[0] for col in cursor.description]
-    return [
-        {col: convert_decimal(val) for col, val in zip(columns, row)}
-        for row in cursor.fetchall()
-    ]
+def max_points_param(request, default=None):
+    """
+    The `max_points` query parameter (`default` if absent).
+
+    Raises ValueError with the message for the client unless it is an
+    integer in [MIN_MAX_POINTS, MAX_TARGET_POINTS].
+    """
+    max_points = int_param(request, 'max_points', default)
+    if max_points is not None and not MIN_MAX_POINTS <= max_points <= MAX_TARGET_POINTS:
+        raise ValueError(f'max_points must be between {MIN_MAX_POINTS} and {MAX_TARGET_POINTS}')
+    return max_points
+
+
+def parse_instant(name, text, end=False):
+    """
+    Naive UTC datetime of an ISO 8601 date or datetime; ValueError if invalid.
+
+    A date alone is the start of that day, or its end for `end`.
+    """
+    try:
+        day = parse_date(text)
+        value = parse_datetime(text) if day is None else None
+    except ValueError:
+        value = day = None
+    if day is not None:
+        return datetime.combine(day, time.max if end else time.min)
+    if value is None:
+        raise ValueError(f"Invalid {name} '{text}', expected an ISO 8601 date or datetime")
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def time_bounds(request, max_days=STREAM_MAX_DAYS):
+    """
+    The (start, end) window of a request's `start`/`end`, or None.
+
+    Both are inclusive. Raises ValueError when only one is given, they are
+    out of order or further apart than `max_days`.
+    """
+    start, end = request.GET.get('start'), request.GET.get('end')
+    if not start and not end:
+        return None
+    if not (start and end):
+        raise ValueError('start and end must be given together')
+    start, end = parse_instant('start', start), parse_instant('end', end, end=True)
+    if start > end:
+        raise ValueError('start must not be after end')
+    if end - start > timedelta(days=max_days):
+        raise ValueError(f'start and end may be at most {max_days} days apart')
+    return start, end
+
+
+def current_range(request):
+    return window_range('pm25', 0)
+
+
+def timeseries_window(request):
+    """Anchoring column and days of a /api/timeseries/ window."""
+    parameter = request.GET.get('parameter', 'pm25').split(',')[0].strip()
+    return PARAMETER_COLUMNS.get(parameter, 'pm25'), int_param(request, 'days', 7, high=365)
+
+
+def timeseries_range(request):
+    bounds = time_bounds(request)
+    if bounds:
+        return bounds_range(bounds)
+    return window_range(*timeseries_window(request))
+
+
+def aqi_bulk_range(request):
+    return window_range('pm25', aqi_bulk_args(request))
+
+
+def correlation_range(request):
+    # Only binned summaries over a day window are anchored; raw points and
+    # whole-history summaries depend on everything
+    days = int_param(request, 'days', None)
+    if request.GET.get('mode') == 'binned' and days:
+        return window_range('pm25', days)
+    return None
+
+
+def daily_range(request):
+    days, bounds = daily_args(request)
+    if bounds:
+        return bounds_range(bounds)
+    return window_range('pm25', days)
 
 
 @require_GET
 def api_overview(request):
     """API overview and available endpoints."""
-    return JsonResponse({
+    return FastJsonResponse({
         'name': 'AAQIS API',
         'version': '1.0',
         'endpoints': {
@@ -39,330 +237,795 @@ def api_overview(request):
             '/api/timeseries/': 'Time series data for charts',
             '/api/statistics/': 'Summary statistics',
             '/api/daily/': 'Daily averages',
+            '/api/dashboard-bundle/': 'Dashboard first-load data in one call',
+            '/api/aqi/bulk/': 'Hourly multi-pollutant AQI over a window',
+            '/api/cache-stats/': 'Response cache hit/miss counters',
+            '/api/pool-stats/': 'Database connection pool statistics',
+            '/api/stations/nearest/': 'Monitoring stations nearest to a point',
         }
     })
 
 
-@require_GET
-def current_data(request):
-    """Get the most recent air quality reading."""
+CURRENT_SQL = """
+    SELECT 
+        u.timestamp_utc,
+        u.pm25, u.pm25_source,
+        u.pm10, u.no2, u.so2, u.o3, u.co,
+        u.temperature_c, u.humidity_pct,
+        u.wind_speed_ms, u.pressure_hpa,
+        n.pm25, n.pm10
+    FROM unified_data u
+    LEFT JOIN unified_data_nowcast n
+        ON n.location = u.location AND n.timestamp_utc = u.timestamp_utc
+    WHERE u.pm25 IS NOT NULL
+    ORDER BY u.timestamp_utc DESC
+    LIMIT 1
+"""
+
+
+def fetch_current():
+    """Most recent air quality reading with its AQI, or None without data."""
     with connection.cursor() as cursor:
-        cursor.execute("""
-            SELECT 
-                timestamp_utc,
-                pm25, pm25_source,
-                pm10, no2, so2, o3, co,
-                temperature_c, humidity_pct,
-                wind_speed_ms, pressure_hpa
-            FROM unified_data
-            WHERE pm25 IS NOT NULL
-            ORDER BY timestamp_utc DESC
-            LIMIT 1
-        """)
-        row = cursor.fetchone()
-    
+        cursor.execute(CURRENT_SQL)
+        return current_payload(cursor.fetchone())
+
+
+def current_payload(row):
+    """JSON fields of a CURRENT_SQL row, or None without one."""
     if not row:
-        return JsonResponse({'error': 'No data available'}, status=404)
+        return None
     
-    pm25 = convert_decimal(row[1])
+    pm25 = row[1]
+    pollutants = {
+        'pm25': pm25,
+        'pm10': row[3],
+        'no2': row[4],
+        'so2': row[5],
+        'o3': row[6],
+        'co': row[7],
+    }
     
-    # Calculate AQI
-    aqi = calculate_aqi(pm25) if pm25 else None
-    category = get_aqi_category(pm25) if pm25 else 'unknown'
+    nowcast = {'pm25': row[12], 'pm10': row[13]}
     
-    return JsonResponse({
-        'timestamp': row[0].isoformat() if row[0] else None,
+    # Overall AQI over every pollutant measured in this hour, with the
+    # 12-hour NowCast standing in for PM2.5/PM10 where it is defined
+    index, category, dominant = aqi.single(**{
+        p: value if nowcast.get(p) is None else nowcast[p]
+        for p, value in pollutants.items()
+    })
+    hourly_index = aqi.single(**pollutants)[0]
+    
+    return {
+        'timestamp': row[0],
         'pm25': pm25,
         'pm25_source': row[2],
-        'pm10': convert_decimal(row[3]),
-        'no2': convert_decimal(row[4]),
-        'so2': convert_decimal(row[5]),
-        'o3': convert_decimal(row[6]),
-        'co': convert_decimal(row[7]),
-        'aqi': aqi,
+        'pm10': pollutants['pm10'],
+        'no2': pollutants['no2'],
+        'so2': pollutants['so2'],
+        'o3': pollutants['o3'],
+        'co': pollutants['co'],
+        'nowcast': nowcast,
+        'aqi': index,
         'category': category,
+        'dominant_pollutant': dominant,
+        'hourly_aqi': hourly_index,
         'weather': {
-            'temperature': convert_decimal(row[8]),
-            'humidity': convert_decimal(row[9]),
-            'wind_speed': convert_decimal(row[10]),
-            'pressure': convert_decimal(row[11]),
+            'temperature': row[8],
+            'humidity': row[9],
+            'wind_speed': row[10],
+            'pressure': row[11],
         }
-    })
+    }
 
 
 @require_GET
-def timeseries_data(request):
-    """Get time series data for charts."""
-    # Parse parameters
-    days = int(request.GET.get('days', 7))
+@conditional_on_data_version
+@cached_response(current_range)
+def current_data(request):
+    """Get the most recent air quality reading."""
+    payload = fetch_current()
+    if payload is None:
+        return FastJsonResponse({'error': 'No data available'}, status=404)
+    return FastJsonResponse(payload)
+
+
+def timeseries_query(parameter, resolution, days, bounds=None):
+    """
+    Build the rollup query and output layout for one or more parameters.
+
+    The window is the last `days` days, or the (start, end) `bounds`.
+    Raises ValueError for unknown parameter lists or resolutions.
+    """
+    parameters = [p.strip() for p in parameter.split(',') if p.strip()]
+    multi = len(parameters) > 1
+    if multi:
+        unknown = [p for p in parameters if p not in PARAMETER_COLUMNS]
+        if unknown or len(set(parameters)) != len(parameters):
+            raise ValueError(f"Invalid parameter list '{parameter}'")
+        db_columns = [PARAMETER_COLUMNS[p] for p in parameters]
+    else:
+        db_columns = [PARAMETER_COLUMNS.get(parameter, 'pm25')]
+    
+    start, end = bounds or (None, None)
+    sql, params = rollups.bucket_query(db_columns, resolution, days, start=start, end=end)
+    
+    # Query rows are (bucket, then avg/min/max/count per column); pick the
+    # fields to return by position. Hourly buckets hold a single reading,
+    # coarser ones also carry their spread.
+    spread = resolution != '1h'
+    if multi:
+        meta = {
+            'parameters': parameters,
+            'units': {p: get_unit(p) for p in parameters},
+            'resolution': resolution,
+        }
+        fields = [('t', 0)]
+        for k, name in enumerate(parameters):
+            base = 1 + 4 * k
+            fields.append((name, base))
+            if spread:
+                fields += [(f'{name}_min', base + 1), (f'{name}_max', base + 2)]
+    else:
+        meta = {
+            'parameter': parameter,
+            'unit': get_unit(parameter),
+            'resolution': resolution,
+        }
+        fields = [('t', 0), ('v', 1)]
+        if spread:
+            fields += [('min', 2), ('max', 3), ('count', 4)]
+    if bounds:
+        meta.update(start=start, end=end)
+    
+    return SeriesQuery(
+        sql, params, meta,
+        [name for name, _ in fields],
+        [pos for _, pos in fields],
+    )
+
+
+def timeseries_args(request):
+    """
+    Parse /api/timeseries/ parameters into (query, max_points, method, stream).
+
+    The window is `start`/`end` (ISO 8601) or the last `days` days.
+    ``resolution=auto``, the default with `start`/`end`, picks the bucket
+    size giving close to `target_points` buckets.
+
+    Raises ValueError with the message for the client on invalid input.
+    """
+    days = int_param(request, 'days', 7)
+    bounds = time_bounds(request)
     parameter = request.GET.get('parameter', 'pm25')
+    resolution = request.GET.get('resolution', 'auto' if bounds else '1h')
+    max_points = max_points_param(request)
+    method = request.GET.get('downsample', 'lttb')
+    stream = wants_stream(request)
     
-    # Limit to reasonable range
-    days = min(days, 365)
-    
-    # Map parameter names to actual DB columns
-    param_map = {
-        'pm25': 'pm25',
-        'pm10': 'pm10',
-        'no2': 'no2',
-        'so2': 'so2',
-        'o3': 'o3',
-        'co': 'co',
-        'temperature': 'temperature_c',
-        'humidity': 'humidity_pct',
-        'wind_speed': 'wind_speed_ms',
-    }
+    # Limit to reasonable range; streamed exports may cover years
+    days = min(days, STREAM_MAX_DAYS if stream else 365)
+    span_hours = (bounds[1] - bounds[0]).total_seconds() / 3600 if bounds else days * 24
     
-    db_column = param_map.get(parameter, 'pm25')
+    if stream and max_points:
+        raise ValueError('max_points cannot be combined with stream')
+    if method not in downsampling.METHODS:
+        raise ValueError(f"Unknown downsampling method '{method}'")
+    if resolution == 'auto':
+        target = int_param(request, 'target_points', AUTO_TARGET_POINTS, low=1, high=MAX_TARGET_POINTS)
+        resolution = rollups.auto_resolution(span_hours, target)
+    elif bounds and not stream and span_hours / rollups.resolution_hours(resolution) > MAX_BUCKETS:
+        raise ValueError(
+            f"More than {MAX_BUCKETS} buckets; use a coarser resolution, resolution=auto or stream=1"
+        )
     
+    query = timeseries_query(parameter, resolution, days, bounds)
+    return query, max_points, method, stream
+
+
+def fetch_series(query, max_points=None, method='lttb'):
+    """Run a SeriesQuery, downsampling to `max_points`; returns (meta, columns)."""
     with connection.cursor() as cursor:
-        # Use last available data date instead of NOW() 
+        # Window is anchored on the last available data, not NOW()
         # (data ends March 2025, current date is December 2025)
-        cursor.execute(f"""
-            SELECT 
-                timestamp_utc,
-                {db_column} as value
-            FROM unified_data
-            WHERE {db_column} IS NOT NULL
-              AND timestamp_utc >= (
-                  SELECT MAX(timestamp_utc) - INTERVAL '{days} days' 
-                  FROM unified_data 
-                  WHERE {db_column} IS NOT NULL
-              )
-            ORDER BY timestamp_utc ASC
-        """)
-        rows = cursor.fetchall()
+        cursor.execute(query.sql, query.params)
+        return series_payload(query, cursor.fetchall(), max_points, method)
+
+
+def series_payload(query, rows, max_points=None, method='lttb'):
+    """(meta, columns) of a SeriesQuery's rows, downsampled to `max_points`."""
+    rows = pick_fields(rows, query.positions)
+    meta = dict(query.meta)
     
-    return JsonResponse({
-        'parameter': parameter,
-        'unit': get_unit(parameter),
-        'data': [
-            {'timestamp': row[0].isoformat(), 'value': convert_decimal(row[1])}
-            for row in rows
-        ]
-    })
+    # Bound the payload for charts; whole rows are kept so min/max survive.
+    # Multi-series responses are downsampled on the first series.
+    if max_points and len(rows) > max_points:
+        keep = downsample_rows(rows, max_points, method)
+        meta['downsampling'] = {'method': method, 'original_points': len(rows)}
+        rows = [rows[i] for i in keep]
+    
+    return meta, rows_to_columns(rows, query.names)
+
+
+def timeseries_stream(request, query):
+    """
+    The streamed (``stream=1``) response for a built series query.
+
+    Nothing is read until the response is iterated, so async views can
+    return it as well.
+    """
+    batches = (
+        pick_fields(rows, query.positions)
+        for rows in iter_batches(query.sql, query.params)
+    )
+    return stream_tabular_response(
+        request, query.meta, query.names, batches, row_names=TIMESERIES_ROW_NAMES,
+    )
+
+
+@require_GET
+@conditional_on_data_version
+@cached_response(timeseries_range)
+def timeseries_data(request):
+    """
+    Get time series data for charts, served from the rollup pyramid.
+
+    `parameter` may list several parameters (``pm25,temperature``); they are
+    fetched in one query and aligned on a single timestamp axis.
+    """
+    try:
+        query, max_points, method, stream = timeseries_args(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+    
+    if stream:
+        return timeseries_stream(request, query)
+    
+    meta, columns = fetch_series(query, max_points, method)
+    return tabular_response(request, meta, columns, row_names=TIMESERIES_ROW_NAMES)
+
+
+def daily_args(request):
+    """(days, bounds) of a /api/daily/ request; ValueError if invalid."""
+    return int_param(request, 'days', 30, high=365), time_bounds(request)
+
+
+def fetch_daily(days, bounds=None):
+    """Daily PM2.5 avg/min/max and mean temperature; returns (meta, columns)."""
+    sql, params = daily_query(days, bounds)
+    
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return daily_payload(days, cursor.fetchall(), bounds)
+
+
+def daily_query(days, bounds=None):
+    """SQL and params of the daily rollup rows behind `fetch_daily`."""
+    start, end = bounds or (None, None)
+    return rollups.bucket_query(['pm25', 'temperature_c'], '1d', days, start=start, end=end)
+
+
+def daily_payload(days, rows, bounds=None):
+    """(meta, columns) of `daily_query` rows."""
+    # Days without any PM2.5 reading are skipped, as in the raw query
+    rows = [
+        (row[0].date(), row[1], row[2], row[3], row[5])
+        for row in rows
+        if row[4]
+    ]
+    
+    return (
+        {'start': bounds[0], 'end': bounds[1]} if bounds else {'days': days},
+        rows_to_columns(rows, ['t', 'avg_pm25', 'min_pm25', 'max_pm25', 'avg_temp']),
+    )
 
 
 @require_GET
+@conditional_on_data_version
+@cached_response(daily_range)
 def daily_averages(request):
-    """Get daily average PM2.5 for the last N days."""
-    days = int(request.GET.get('days', 30))
-    days = min(days, 365)
+    """Get daily average PM2.5 for the last N days (or `start`/`end`) from the 1d rollup."""
+    try:
+        days, bounds = daily_args(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
     
+    meta, columns = fetch_daily(days, bounds)
+    return tabular_response(request, meta, columns, row_names=DAILY_ROW_NAMES)
+
+
+def stats_summary(stats, parameter):
+    """JSON fields of one RunningStats accumulator."""
+    return {
+        'total_records': stats.count,
+        'first_record': stats.first,
+        'last_record': stats.last,
+        f'avg_{parameter}': stats.mean if stats.count else None,
+        f'min_{parameter}': stats.min,
+        f'max_{parameter}': stats.max,
+        f'std_{parameter}': stats.std,
+    }
+
+
+def fetch_statistics(parameter='pm25', by=None):
+    """
+    Summary statistics (and the PM2.5 AQI distribution) from unified_data_stats.
+
+    The per-(year, season) accumulators are merged here, so the cost does
+    not grow with unified_data. `by` ('year' or 'season') adds a breakdown.
+    """
     with connection.cursor() as cursor:
-        # Use last available data date instead of NOW()
-        cursor.execute(f"""
-            SELECT 
-                DATE(timestamp_utc) as date,
-                AVG(pm25) as avg_pm25,
-                MIN(pm25) as min_pm25,
-                MAX(pm25) as max_pm25,
-                AVG(temperature_c) as avg_temp
-            FROM unified_data
-            WHERE pm25 IS NOT NULL
-              AND timestamp_utc >= (
-                  SELECT MAX(timestamp_utc) - INTERVAL '{days} days' 
-                  FROM unified_data 
-                  WHERE pm25 IS NOT NULL
-              )
-            GROUP BY DATE(timestamp_utc)
-            ORDER BY date ASC
-        """)
-        rows = dictfetchall(cursor)
-    
-    # Convert date objects to strings
-    for row in rows:
-        if row.get('date'):
-            row['date'] = row['date'].isoformat()
-    
-    return JsonResponse({
-        'days': days,
-        'data': rows
-    })
+        cells = stats.fetch_cells(cursor, PARAMETER_COLUMNS[parameter])
+    return statistics_payload(cells, parameter, by)
+
+
+def season_order(season):
+    """Sort key of seasons in calendar order; rows without a season come last."""
+    return SEASONS.index(season) if season in SEASONS else len(SEASONS)
+
+
+def statistics_payload(cells, parameter='pm25', by=None):
+    """The /api/statistics/ payload merged from unified_data_stats cells."""
+    payload = {'overall': stats_summary(merge_all(c.stats for c in cells), parameter)}
+    
+    counts = [c.categories for c in cells if c.categories]
+    if counts:
+        totals = [sum(column) for column in zip(*counts)]
+        payload['aqi_distribution'] = [
+            {'category': label, 'count': count}
+            for (label, _), count in zip(PM25_CATEGORIES, totals)
+            if count
+        ]
+    
+    if by:
+        groups = {}
+        for cell in cells:
+            key = getattr(cell, by)
+            groups[key] = groups.get(key, RunningStats()).merge(cell.stats)
+        order = season_order if by == 'season' else None
+        payload[f'by_{by}'] = [
+            {by: key, **stats_summary(groups[key], parameter)}
+            for key in sorted(groups, key=order)
+        ]
+    
+    return payload
+
+
+def statistics_args(request):
+    """(parameter, by) of a /api/statistics/ request; ValueError if invalid."""
+    parameter = request.GET.get('parameter', 'pm25')
+    by = request.GET.get('by')
+    if parameter not in PARAMETER_COLUMNS:
+        raise ValueError(f"Unknown parameter '{parameter}'")
+    if by not in (None, 'year', 'season'):
+        raise ValueError("by must be 'year' or 'season'")
+    return parameter, by
 
 
 @require_GET
+@conditional_on_data_version
+@cached_response()
 def statistics(request):
-    """Get summary statistics."""
-    with connection.cursor() as cursor:
-        # Overall stats
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_records,
-                MIN(timestamp_utc) as first_record,
-                MAX(timestamp_utc) as last_record,
-                AVG(pm25) as avg_pm25,
-                MIN(pm25) as min_pm25,
-                MAX(pm25) as max_pm25,
-                STDDEV(pm25) as std_pm25
-            FROM unified_data
-            WHERE pm25 IS NOT NULL
-        """)
-        overall = dictfetchall(cursor)[0]
-        
-        # AQI distribution
-        cursor.execute("""
-            SELECT 
-                category,
-                COUNT(*) as count
-            FROM (
-                SELECT 
-                    CASE 
-                        WHEN pm25 <= 12 THEN 'Good'
-                        WHEN pm25 <= 35.4 THEN 'Moderate'
-                        WHEN pm25 <= 55.4 THEN 'Unhealthy for Sensitive'
-                        WHEN pm25 <= 150.4 THEN 'Unhealthy'
-                        WHEN pm25 <= 250.4 THEN 'Very Unhealthy'
-                        ELSE 'Hazardous'
-                    END as category,
-                    CASE 
-                        WHEN pm25 <= 12 THEN 1
-                        WHEN pm25 <= 35.4 THEN 2
-                        WHEN pm25 <= 55.4 THEN 3
-                        WHEN pm25 <= 150.4 THEN 4
-                        WHEN pm25 <= 250.4 THEN 5
-                        ELSE 6
-                    END as sort_order
-                FROM unified_data
-                WHERE pm25 IS NOT NULL
-            ) categorized
-            GROUP BY category, sort_order
-            ORDER BY sort_order
-        """)
-        distribution = dictfetchall(cursor)
-    
-    # Convert datetime objects to strings
-    if overall.get('first_record'):
-        overall['first_record'] = overall['first_record'].isoformat()
-    if overall.get('last_record'):
-        overall['last_record'] = overall['last_record'].isoformat()
-    
-    return JsonResponse({
-        'overall': overall,
-        'aqi_distribution': distribution
+    """
+    Get summary statistics for a parameter (default PM2.5).
+
+    `by=year` or `by=season` adds per-period statistics.
+    """
+    try:
+        parameter, by = statistics_args(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+    return FastJsonResponse(fetch_statistics(parameter, by))
+
+
+def dashboard_args(request):
+    """(days, max_points) of a /api/dashboard-bundle/ request; ValueError if invalid."""
+    return int_param(request, 'days', 7, high=365), max_points_param(request, 1000)
+
+
+def _on_own_connection(func, *args):
+    """Run `func` in a worker thread, releasing that thread's DB connection."""
+    try:
+        return func(*args)
+    finally:
+        connections.close_all()
+
+
+def _submit(func, *args):
+    """`_on_own_connection` on the bundle executor, in this request's context (for metrics)."""
+    return _bundle_executor.submit(copy_context().run, _on_own_connection, func, *args)
+
+
+@require_GET
+@conditional_on_data_version
+@cached_response()
+def dashboard_bundle(request):
+    """
+    Everything the dashboard needs on first load, in one response.
+
+    The current reading, statistics, PM2.5 series and daily averages are
+    queried concurrently, each on its own connection, so the response takes
+    as long as the slowest query rather than the sum of all four.
+    """
+    try:
+        days, max_points = dashboard_args(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+    
+    series = timeseries_query('pm25', '1h', days)
+    current = _submit(fetch_current)
+    summary = _submit(fetch_statistics)
+    timeseries = _submit(fetch_series, series, max_points)
+    daily = _submit(fetch_daily, days)
+    
+    return FastJsonResponse({
+        'current': current.result() or {'error': 'No data available'},
+        'statistics': summary.result(),
+        'timeseries': row_payload(*timeseries.result(), TIMESERIES_ROW_NAMES),
+        'daily': row_payload(*daily.result(), DAILY_ROW_NAMES),
     })
 
 
-@require_GET  
+# Integer filters of the pattern endpoints with their valid ranges
+# (year has none); day_of_week 0 is Sunday
+PATTERN_INT_FILTERS = {'year': None, 'month': (1, 12), 'day_of_week': (0, 6), 'hour': (0, 23)}
+
+TRUE_VALUES = ('1', 'true', 'yes')
+FALSE_VALUES = ('0', 'false', 'no')
+
+
+def parse_ints(name, text, bounds=None):
+    """Integers of a list like '2019,2021-2023'; ValueError if invalid."""
+    values = set()
+    for part in text.split(','):
+        try:
+            first, _, last = part.strip().partition('-')
+            first = int(first)
+            last = int(last) if last else first
+        except ValueError:
+            raise ValueError(f"Invalid {name} '{part.strip()}'") from None
+        if bounds and not (bounds[0] <= first <= last <= bounds[1]):
+            raise ValueError(f"{name} must be between {bounds[0]} and {bounds[1]}")
+        values.update(range(first, last + 1))
+    return sorted(values)
+
+
+def parse_bool(name, text):
+    if text.lower() in TRUE_VALUES:
+        return True
+    if text.lower() in FALSE_VALUES:
+        return False
+    raise ValueError(f"{name} must be true or false")
+
+
+def pattern_args(request):
+    """
+    (parameter, filters) of a pattern request; ValueError if invalid.
+
+    Filters are year, month, day_of_week and hour (lists and ranges),
+    season (list), is_heating_season and is_weekend (booleans); each maps
+    to the values its cube dimension may take.
+    """
+    parameter = request.GET.get('parameter', 'pm25')
+    if parameter not in PARAMETER_COLUMNS:
+        raise ValueError(f"Unknown parameter '{parameter}'")
+
+    filters = {}
+    for name, bounds in PATTERN_INT_FILTERS.items():
+        if request.GET.get(name):
+            filters[name] = parse_ints(name, request.GET[name], bounds)
+    if request.GET.get('season'):
+        filters['season'] = [season.strip().lower() for season in request.GET['season'].split(',')]
+        unknown = set(filters['season']) - set(SEASONS)
+        if unknown:
+            raise ValueError(f"Unknown season '{sorted(unknown)[0]}'")
+    if request.GET.get('is_heating_season'):
+        filters['is_heating_season'] = [parse_bool('is_heating_season', request.GET['is_heating_season'])]
+    if request.GET.get('is_weekend'):
+        weekend = parse_bool('is_weekend', request.GET['is_weekend'])
+        days = [d for d in range(7) if (d in patterns.WEEKEND_DAYS) == weekend]
+        filters['day_of_week'] = [d for d in filters.get('day_of_week', days) if d in days]
+    return parameter, filters
+
+
+def hourly_pattern_query(request):
+    """(meta, sql, params) of an /api/hourly-pattern/ request; ValueError if invalid."""
+    parameter, filters = pattern_args(request)
+    sql, params = patterns.pattern_sql(
+        'hour', {f'avg_{parameter}': PARAMETER_COLUMNS[parameter]}, filters, temperature='avg_temp',
+    )
+    return ({'filters': filters} if filters else {}), sql, params
+
+
+def monthly_pattern_query(request):
+    """(meta, sql, params) of an /api/monthly-pattern/ request; ValueError if invalid."""
+    parameter, filters = pattern_args(request)
+    sql, params = patterns.pattern_sql(
+        'month', {f'avg_{parameter}': PARAMETER_COLUMNS[parameter]}, filters, count='count',
+    )
+    sql = f"""
+        SELECT q.*, to_char(make_date(2000, q.month, 1), 'Mon') AS month_name
+        FROM ({sql}) q
+        ORDER BY q.month
+    """
+    return ({'filters': filters} if filters else {}), sql, params
+
+
+@require_GET
+@conditional_on_data_version
+@cached_response()
 def hourly_pattern(request):
-    """Get average PM2.5 by hour of day."""
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            SELECT 
-                hour,
-                AVG(pm25) as avg_pm25,
-                AVG(temperature_c) as avg_temp
-            FROM unified_data
-            WHERE pm25 IS NOT NULL
-            GROUP BY hour
-            ORDER BY hour
-        """)
-        rows = dictfetchall(cursor)
-    
-    return JsonResponse({'data': rows})
+    """
+    Get average PM2.5 (or `parameter`) by hour of day from the pattern cube.
+
+    Accepts the filters of `pattern_args`, e.g.
+    ``?is_heating_season=true&is_weekend=true&year=2023``.
+    """
+    try:
+        meta, sql, params = hourly_pattern_query(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+    return json_rows_response(meta, fetch_json_rows(sql, 'hour', params))
 
 
 @require_GET
+@conditional_on_data_version
+@cached_response()
 def monthly_pattern(request):
-    """Get average PM2.5 by month."""
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            SELECT 
-                month,
-                AVG(pm25) as avg_pm25,
-                COUNT(*) as count
-            FROM unified_data
-            WHERE pm25 IS NOT NULL
-            GROUP BY month
-            ORDER BY month
-        """)
-        rows = dictfetchall(cursor)
-    
-    # Add month names
-    month_names = ['', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    for row in rows:
-        if row.get('month'):
-            row['month_name'] = month_names[int(row['month'])]
-    
-    return JsonResponse({'data': rows})
+    """Get average PM2.5 (or `parameter`) by month from the pattern cube, filterable."""
+    try:
+        meta, sql, params = monthly_pattern_query(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+    return json_rows_response(meta, fetch_json_rows(sql, 'month', params))
 
 
 @require_GET
+@conditional_on_data_version
+@cached_response(correlation_range)
 def correlation_data(request):
-    """Get data for correlation analysis (PM2.5 vs weather)."""
-    limit = int(request.GET.get('limit', 1000))
-    limit = min(limit, 10000)
+    """
+    Get data for correlation analysis (PM2.5 vs weather).
+
+    `mode=binned` returns server-side summaries (see fetch_binned_correlation)
+    instead of raw points.
+    """
+    names = ['pm25', 'temperature', 'humidity', 'wind_speed', 'pressure']
     
-    with connection.cursor() as cursor:
-        cursor.execute(f"""
+    try:
+        binned = binned_args(request) if request.GET.get('mode') == 'binned' else None
+        # Streamed exports have no row cap unless one is given
+        limit = int_param(request, 'limit', None if wants_stream(request) else 1000, low=1)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+    
+    if binned:
+        return FastJsonResponse(fetch_binned_correlation(*binned))
+    
+    if wants_stream(request):
+        limit_sql = f"LIMIT {limit}" if limit else ""
+        sql = f"""
             SELECT 
-                pm25, temperature_c, humidity_pct,
-                wind_speed_ms, pressure_hpa
+                pm25::double precision, temperature_c::double precision,
+                humidity_pct::double precision, wind_speed_ms::double precision,
+                pressure_hpa::double precision
             FROM unified_data
             WHERE pm25 IS NOT NULL 
               AND temperature_c IS NOT NULL
             ORDER BY timestamp_utc DESC
-            LIMIT {limit}
-        """)
+            {limit_sql}
+        """
+        return stream_tabular_response(request, {}, names, iter_batches(sql))
+    
+    limit = min(limit, 10000)
+    sql = f"""
+        SELECT 
+            pm25, temperature_c AS temperature, humidity_pct AS humidity,
+            wind_speed_ms AS wind_speed, pressure_hpa AS pressure, timestamp_utc
+        FROM unified_data
+        WHERE pm25 IS NOT NULL 
+          AND temperature_c IS NOT NULL
+        ORDER BY timestamp_utc DESC
+        LIMIT {limit}
+    """
+    
+    # Row-layout JSON is written by PostgreSQL; other formats are columnar
+    if negotiate(request) == JSON:
+        return json_rows_response({}, fetch_json_rows(sql, 'timestamp_utc DESC', columns=names))
+    
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
         rows = cursor.fetchall()
     
-    return JsonResponse({
-        'data': [
-            {
-                'pm25': convert_decimal(row[0]),
-                'temperature': convert_decimal(row[1]),
-                'humidity': convert_decimal(row[2]),
-                'wind_speed': convert_decimal(row[3]),
-                'pressure': convert_decimal(row[4])
-            }
-            for row in rows
-        ]
-    })
+    return tabular_response(request, {}, rows_to_columns(rows, names))
+
+
+def binned_args(request):
+    """(against, days, bins, shape) of a binned /api/correlation/ request; ValueError if invalid."""
+    against = [p.strip() for p in request.GET.get('x', 'temperature,wind_speed').split(',') if p.strip()]
+    days = int_param(request, 'days', None)
+    bins = int_param(request, 'bins', 40, low=2, high=200)
+    shape = request.GET.get('shape', 'grid')
+    if not against or any(p not in CORRELATION_COLUMNS or p == 'pm25' for p in against):
+        raise ValueError(f"x must list some of {', '.join(c for c in CORRELATION_COLUMNS if c != 'pm25')}")
+    if shape not in correlation.SHAPES:
+        raise ValueError(f"Unknown bin shape '{shape}'")
+    return against, days, bins, shape
+
+
+def fetch_binned_correlation(against, days=None, bins=40, shape='grid'):
+    """
+    PM2.5 against each parameter in `against`, reduced in NumPy.
+
+    Each pair gets 2D counts, per-bin PM2.5 means, Pearson/Spearman and a
+    regression line; the payload size depends on `bins`, not on the number
+    of rows. `days` limits the data to the last N days, otherwise the whole
+    history is used.
+    """
+    columns = ['pm25'] + against
+    select = ', '.join(f'{CORRELATION_COLUMNS[c]}::double precision' for c in columns)
+    where, params = "pm25 IS NOT NULL", {}
+    if days:
+        where += """
+              AND timestamp_utc > (
+                  SELECT MAX(timestamp_utc) FROM unified_data WHERE pm25 IS NOT NULL
+              ) - make_interval(days => %(days)s)"""
+        params['days'] = days
+    
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {select} FROM unified_data WHERE {where}", params)
+        values = np.array(cursor.fetchall(), dtype=float).reshape(-1, len(columns))
+    
+    pm25 = values[:, 0]
+    return {
+        'y': 'pm25',
+        'days': days,
+        'bins': bins,
+        'shape': shape,
+        'pairs': {
+            name: correlation.summarize(values[:, k + 1], pm25, bins, shape)
+            for k, name in enumerate(against)
+        },
+    }
 
 
 # Helper functions
-def calculate_aqi(pm25):
-    """Calculate US EPA AQI from PM2.5 concentration."""
-    if pm25 is None:
-        return None
+def fetch_aqi_bulk(days):
+    """Hourly AQI, category, dominant pollutant and sub-indices; returns (meta, columns)."""
+    pollutants = list(aqi.POLLUTANTS)
+    with connection.cursor() as cursor:
+        latest = rollups.latest_bucket(cursor, 'pm25')
+        cursor.execute(f"""
+            SELECT timestamp_utc, {', '.join(f'{p}::double precision' for p in pollutants)}
+            FROM unified_data
+            WHERE timestamp_utc > %(latest)s - make_interval(days => %(days)s)
+              AND timestamp_utc < %(latest)s + INTERVAL '1 hour'
+            ORDER BY timestamp_utc ASC
+        """, {'latest': latest, 'days': days})
+        rows = cursor.fetchall()
     
-    # Convert Decimal to float if needed
-    pm25 = float(pm25)
+    # None becomes NaN, which the engine treats as "not measured"
+    values = np.array([row[1:] for row in rows], dtype=float).reshape(len(rows), len(pollutants))
+    result = aqi.compute_aqi({p: values[:, k] for k, p in enumerate(pollutants)})
     
-    breakpoints = [
-        (0, 12.0, 0, 50),
-        (12.1, 35.4, 51, 100),
-        (35.5, 55.4, 101, 150),
-        (55.5, 150.4, 151, 200),
-        (150.5, 250.4, 201, 300),
-        (250.5, 500.4, 301, 500),
-    ]
+    columns = {
+        't': [row[0] for row in rows],
+        'aqi': nullable_ints(result.aqi),
+        'category': aqi.categories(result.aqi).tolist(),
+        'dominant': result.dominant.tolist(),
+    }
+    for p in pollutants:
+        columns[f'aqi_{p}'] = nullable_ints(result.sub_indices[p])
     
-    for bp_lo, bp_hi, i_lo, i_hi in breakpoints:
-        if bp_lo <= pm25 <= bp_hi:
-            return round(((i_hi - i_lo) / (bp_hi - bp_lo)) * (pm25 - bp_lo) + i_lo)
-    
-    return 500 if pm25 > 500.4 else 0
-
-
-def get_aqi_category(pm25):
-    """Get AQI category from PM2.5."""
-    if pm25 is None:
-        return 'unknown'
-    pm25 = float(pm25)  # Convert Decimal to float if needed
-    if pm25 <= 12:
-        return 'good'
-    elif pm25 <= 35.4:
-        return 'moderate'
-    elif pm25 <= 55.4:
-        return 'unhealthy_sensitive'
-    elif pm25 <= 150.4:
-        return 'unhealthy'
-    elif pm25 <= 250.4:
-        return 'very_unhealthy'
-    else:
-        return 'hazardous'
+    return {'days': days, 'units': aqi.UNITS}, columns
+
+
+def aqi_bulk_args(request):
+    """Days of an /api/aqi/bulk/ request; ValueError if invalid."""
+    return int_param(request, 'days', 30, high=STREAM_MAX_DAYS)
+
+
+@require_GET
+@conditional_on_data_version
+@cached_response(aqi_bulk_range)
+def aqi_bulk(request):
+    """
+    AQI for every hour of the last N days (up to ten years), all pollutants.
+
+    Computed in one vectorized pass; supports the same formats as /api/timeseries/.
+    """
+    try:
+        days = aqi_bulk_args(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+    meta, columns = fetch_aqi_bulk(days)
+    return tabular_response(request, meta, columns, row_names=TIMESERIES_ROW_NAMES)
+
+
+@require_GET
+def cache_stats(request):
+    """Hit/miss counters of the response cache in this worker process."""
+    return FastJsonResponse(response_cache.cache_stats())
+
+
+@require_GET
+def pool_stats(request):
+    """Connection pool sizes, checkouts, waits and saturation in this worker process."""
+    return FastJsonResponse(pools.pool_stats())
+
+
+# Neighbours /api/stations/nearest/ returns, by default and at most
+NEAREST_DEFAULT_K = 5
+NEAREST_MAX_K = 50
+
+
+def nearest_args(request):
+    """(lat, lon, k) of a /api/stations/nearest/ request; ValueError if invalid."""
+    try:
+        lat = float(request.GET['lat'])
+        lon = float(request.GET['lon'])
+    except KeyError:
+        raise ValueError('lat and lon are required') from None
+    except ValueError:
+        raise ValueError('lat and lon must be numbers') from None
+    k = int_param(request, 'k', NEAREST_DEFAULT_K)
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError('lat must be within [-90, 90] and lon within [-180, 180]')
+    if not 1 <= k <= NEAREST_MAX_K:
+        raise ValueError(f'k must be between 1 and {NEAREST_MAX_K}')
+    return lat, lon, k
+
+
+@require_GET
+def nearest_stations(request):
+    """The k active monitoring stations nearest to lat/lon, by great-circle distance."""
+    try:
+        lat, lon, k = nearest_args(request)
+    except ValueError as exc:
+        return FastJsonResponse({'error': str(exc)}, status=400)
+    return FastJsonResponse({
+        'lat': lat,
+        'lon': lon,
+        'k': k,
+        'stations': [
+            {**station._asdict(), 'distance_km': round(distance, 3)}
+            for station, distance in stations.nearest(lat, lon, k)
+        ],
+    })
+
+
+def rows_to_columns(rows, names):
+    """Transpose cursor rows into named column lists (extra fields are dropped)."""
+    if not rows:
+        return {name: [] for name in names}
+    return {name: list(values) for name, values in zip(names, zip(*rows))}
+
+
+def nullable_ints(values):
+    """Float array of whole numbers to a list of ints, NaN as None."""
+    missing = np.isnan(values)
+    out = np.where(missing, 0, values).astype(np.int64).astype(object)
+    out[missing] = None
+    return out.tolist()
+
+
+def pick_fields(rows, positions):
+    """Reorder/select row fields by position."""
+    return [tuple(row[i] for i in positions) for row in rows]
+
+
+def downsample_rows(rows, max_points, method='lttb'):
+    """Indices of the (timestamp, value, ...) rows to keep for a chart."""
+    x = np.array([row[0] for row in rows], dtype='datetime64[s]').astype(np.int64)
+    y = np.array([row[1] for row in rows], dtype=float)
+    
+    # Gaps (buckets where only another series has data) are interpolated
+    missing = np.isnan(y)
+    if missing.all():
+        y[:] = 0.0
+    elif missing.any():
+        y[missing] = np.interp(x[missing], x[~missing], y[~missing])
+    
+    return downsampling.downsample_indices(x, y, max_points, method)
 
 
 def get_unit(parameter):
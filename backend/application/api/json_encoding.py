@@ -0,0 +1,76 @@
+"""
+Fast JSON encoding for API responses.
+
+``dumps`` serializes with orjson when it is installed and falls back to
+the standard library otherwise (or when ``API_JSON_ENCODER = 'json'``).
+Both produce compact UTF-8 and accept datetimes, dates, Decimals and NumPy
+scalars/arrays as they are, so views pass database values straight
+through instead of converting them row by row.
+
+``FastJsonResponse`` is the drop-in for Django's ``JsonResponse``; DRF
+views render through ``renderers.FastJSONRenderer``, which uses `dumps`.
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.functional import Promise
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def _default(obj):
+    """Values neither encoder handles natively."""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, Promise):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def orjson_dumps(obj):
+    return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+
+
+def stdlib_dumps(obj):
+    return json.dumps(obj, default=_default, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+ENCODERS = {'json': stdlib_dumps}
+if orjson is not None:
+    ENCODERS['orjson'] = orjson_dumps
+
+
+def dumps(obj, encoder=None):
+    """
+    Serialize `obj` to JSON bytes.
+
+    `encoder` names an entry of ENCODERS; by default the
+    ``API_JSON_ENCODER`` setting, or the standard library when that
+    encoder is not installed.
+    """
+    name = encoder or getattr(settings, 'API_JSON_ENCODER', 'orjson')
+    return ENCODERS.get(name, stdlib_dumps)(obj)
+
+
+class FastJsonResponse(HttpResponse):
+    """``JsonResponse`` serialized with `dumps`."""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
@@ -0,0 +1,71 @@
+"""
+Request metrics middleware and the ``/metrics`` endpoint.
+
+`MetricsMiddleware` times every request and labels it with the URL name it
+resolved to (``api:timeseries``, ...; ``unresolved`` for 404s), so the
+cardinality stays that of the URL configuration. See
+``backend.infrastructure.metrics`` for what is recorded.
+"""
+
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from backend.application.api.json_encoding import FastJsonResponse
+from backend.infrastructure import metrics
+
+
+def view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'unresolved'
+
+
+class MetricsMiddleware:
+    """Record latency, SQL queries and time, and response size per URL name."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        start, token = time.perf_counter(), metrics.start_sql()
+        try:
+            response = self.get_response(request)
+        finally:
+            queries, sql_seconds = metrics.stop_sql(token)
+        self.observe(request, response, time.perf_counter() - start, queries, sql_seconds)
+        return response
+
+    async def __acall__(self, request):
+        start, token = time.perf_counter(), metrics.start_sql()
+        try:
+            response = await self.get_response(request)
+        finally:
+            queries, sql_seconds = metrics.stop_sql(token)
+        self.observe(request, response, time.perf_counter() - start, queries, sql_seconds)
+        return response
+
+    def observe(self, request, response, seconds, queries, sql_seconds):
+        # Streamed bodies are not buffered to be measured
+        size = None if response.streaming else len(response.content)
+        metrics.observe_request(
+            view_label(request), request.method, response.status_code,
+            seconds, queries, sql_seconds, size,
+        )
+
+
+@require_GET
+def metrics_view(request):
+    """Every metric of the API (and, with PROMETHEUS_MULTIPROC_DIR, the workers)."""
+    if metrics.prometheus_client is None:
+        return FastJsonResponse({'error': 'prometheus_client is not installed'}, status=503)
+    return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
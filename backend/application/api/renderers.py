@@ -0,0 +1,318 @@
+"""
+Content negotiation for tabular API responses.
+
+Views hand over their result as parallel column lists; this module turns
+them into the representation picked by the ``Accept`` header (or a
+``?format=`` override):
+
+- ``application/json`` - the original row-per-object layout (default)
+- ``application/vnd.aaqis.columnar+json`` - parallel arrays, epoch seconds
+- ``application/msgpack`` - the columnar layout packed with MessagePack
+- ``application/vnd.apache.arrow.stream`` - an Arrow IPC stream
+
+Streaming responses (``stream_tabular_response``) support JSON, NDJSON and
+Arrow, which can all be written batch by batch.
+"""
+
+import json
+from datetime import date, datetime
+
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+
+from backend.application.api.json_encoding import FastJsonResponse, dumps
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+JSON = 'application/json'
+COLUMNAR_JSON = 'application/vnd.aaqis.columnar+json'
+MSGPACK = 'application/msgpack'
+ARROW = 'application/vnd.apache.arrow.stream'
+NDJSON = 'application/x-ndjson'
+
+# Arrow IPC end-of-stream marker (continuation token + zero length)
+ARROW_EOS = b'\xff\xff\xff\xff\x00\x00\x00\x00'
+
+# ?format= shortcuts for clients that cannot set headers (e.g. a browser tab)
+FORMAT_ALIASES = {
+    'json': JSON,
+    'columnar': COLUMNAR_JSON,
+    'msgpack': MSGPACK,
+    'arrow': ARROW,
+    'ndjson': NDJSON,
+}
+
+
+def available_media_types():
+    """Media types this process can produce, in server preference order."""
+    types = [JSON, COLUMNAR_JSON]
+    if msgpack is not None:
+        types += [MSGPACK, 'application/x-msgpack']
+    if pa is not None:
+        types.append(ARROW)
+    return types
+
+
+def available_stream_types():
+    """Media types that can be produced incrementally."""
+    types = [JSON, NDJSON]
+    if pa is not None:
+        types.append(ARROW)
+    return types
+
+
+def negotiate(request, available=None):
+    """Pick the response media type, or None if nothing acceptable is available."""
+    available = available or available_media_types()
+    fmt = request.GET.get('format')
+    if fmt:
+        media_type = FORMAT_ALIASES.get(fmt)
+        return media_type if media_type in available else None
+
+    media_type = request.get_preferred_type(available)
+    if media_type == 'application/x-msgpack':
+        return MSGPACK
+    return media_type
+
+
+def is_time_column(values):
+    """True if the column holds dates/datetimes (checked on the first value)."""
+    return next((isinstance(v, (date, datetime)) for v in values if v is not None), False)
+
+
+def to_epoch_seconds(values):
+    """Convert a list of dates/datetimes (naive UTC) to epoch-second ints."""
+    return np.array(values, dtype='datetime64[s]').astype(np.int64).tolist()
+
+
+def columnar_payload(meta, columns):
+    """
+    Meta fields plus one array per column, with time columns as epoch ints.
+
+    Date/datetime meta fields (e.g. the requested ``start``/``end``) become
+    ISO strings, as in the JSON layouts: MessagePack has no type for them.
+    """
+    payload = {
+        key: value.isoformat() if isinstance(value, (date, datetime)) else value
+        for key, value in meta.items()
+    }
+    for name, values in columns.items():
+        payload[name] = to_epoch_seconds(values) if is_time_column(values) else list(values)
+    return payload
+
+
+def row_payload(meta, columns, row_names):
+    """The original layout: meta fields plus a ``data`` list of row objects."""
+    names = [row_names.get(name, name) for name in columns]
+    payload = dict(meta)
+    payload['data'] = [dict(zip(names, row)) for row in zip(*columns.values())]
+    return payload
+
+
+def arrow_stream(meta, columns):
+    """Serialize the columns as an Arrow IPC stream; meta goes in the schema."""
+    arrays, names = [], []
+    for name, values in columns.items():
+        if is_time_column(values):
+            arrays.append(pa.array(
+                np.array(values, dtype='datetime64[s]'), type=pa.timestamp('s')
+            ))
+        else:
+            arrays.append(pa.array(list(values)))
+        names.append(name)
+
+    table = pa.Table.from_arrays(arrays, names=names)
+    table = table.replace_schema_metadata({'aaqis': json.dumps(meta, default=str)})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def json_rows_response(meta, rows_json):
+    """
+    The row-layout JSON response around an already serialized ``data`` array.
+
+    Used with ``fetch_json_rows``: the rows go out exactly as PostgreSQL
+    wrote them, only the meta fields are serialized here.
+    """
+    head = dumps(meta)[:-1]
+    response = HttpResponse(
+        head + (b',' if meta else b'') + b'"data":' + rows_json.encode() + b'}',
+        content_type=JSON,
+    )
+    patch_vary_headers(response, ['Accept'])
+    return response
+
+
+class FastJSONRenderer(JSONRenderer):
+    """DRF JSON renderer serialized with the API encoder (see ``json_encoding``)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Indented output (the browsable API) and exotic types keep the DRF path
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+def not_acceptable(available):
+    """406 response listing what the endpoint can produce."""
+    response = FastJsonResponse({'error': 'Not acceptable', 'available': available}, status=406)
+    patch_vary_headers(response, ['Accept'])
+    return response
+
+
+def tabular_response(request, meta, columns, row_names=None):
+    """
+    Render a column-oriented result in the negotiated format.
+
+    `columns` maps column names to equal-length lists; `row_names` renames
+    columns for the row-per-object JSON layout (e.g. ``t`` -> ``timestamp``).
+    """
+    media_type = negotiate(request)
+
+    if media_type is None:
+        return not_acceptable(available_media_types())
+    elif media_type == JSON:
+        response = FastJsonResponse(row_payload(meta, columns, row_names or {}))
+    elif media_type == COLUMNAR_JSON:
+        response = FastJsonResponse(columnar_payload(meta, columns), content_type=COLUMNAR_JSON)
+    elif media_type == MSGPACK:
+        response = HttpResponse(
+            msgpack.packb(columnar_payload(meta, columns), use_bin_type=True),
+            content_type=MSGPACK,
+        )
+    else:
+        response = HttpResponse(arrow_stream(meta, columns), content_type=ARROW)
+
+    patch_vary_headers(response, ['Accept'])
+    return response
+
+
+def _json_rows(names, rows):
+    """Row objects for one batch."""
+    return [dict(zip(names, row)) for row in rows]
+
+
+def _arrow_type(values):
+    """Arrow type for a column, inferred from its first non-null value."""
+    sample = next((v for v in values if v is not None), None)
+    if isinstance(sample, (date, datetime)):
+        return pa.timestamp('s')
+    if isinstance(sample, int) and not isinstance(sample, bool):
+        return pa.int64()
+    if isinstance(sample, str):
+        return pa.string()
+    return pa.float64()
+
+
+def _arrow_batch(schema, rows):
+    arrays = []
+    for field, values in zip(schema, zip(*rows)):
+        if pa.types.is_timestamp(field.type):
+            values = np.array(values, dtype='datetime64[s]')
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _stream_json(meta, names, batches):
+    head = dumps(meta)[:-1]
+    yield head + (b',' if meta else b'') + b'"data":['
+    first = True
+    for rows in batches:
+        chunk = dumps(_json_rows(names, rows))[1:-1]
+        if chunk:
+            yield chunk if first else b',' + chunk
+            first = False
+    yield b']}'
+
+
+def _stream_ndjson(names, batches):
+    for rows in batches:
+        yield b''.join(dumps(row) + b'\n' for row in _json_rows(names, rows))
+
+
+def _stream_arrow(meta, names, batches):
+    schema = None
+    for rows in batches:
+        if schema is None:
+            columns = list(zip(*rows))
+            schema = pa.schema(
+                [pa.field(name, _arrow_type(col)) for name, col in zip(names, columns)],
+                metadata={'aaqis': json.dumps(meta, default=str)},
+            )
+            yield schema.serialize().to_pybytes()
+        yield _arrow_batch(schema, rows).serialize().to_pybytes()
+    if schema is None:
+        # Empty result: still a valid stream with an all-float schema
+        schema = pa.schema(
+            [pa.field(name, pa.float64()) for name in names],
+            metadata={'aaqis': json.dumps(meta, default=str)},
+        )
+        yield schema.serialize().to_pybytes()
+    yield ARROW_EOS
+
+
+async def _aiterate(chunks):
+    """
+    Step a sync iterator of chunks from the event loop.
+
+    Each step runs in the request's thread for sync code, so a cursor and
+    transaction opened by the iterator stay on the thread that owns them.
+    """
+    step = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await step(chunks, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+def stream_tabular_response(request, meta, names, batches, row_names=None):
+    """
+    Stream batches of rows in the negotiated format.
+
+    `batches` is an iterator of row lists (e.g. from a server-side cursor),
+    so memory use is bounded by the batch size, not the result size. JSON
+    keeps the non-streaming row layout; NDJSON writes one row per line.
+
+    Under ASGI, Django reads a sync iterator of a streaming response into
+    memory before sending it, so for ASGI requests the chunks are handed
+    over as an async iterator that fetches one batch at a time.
+    """
+    available = available_stream_types()
+    media_type = negotiate(request, available)
+    row_names = row_names or {}
+
+    if media_type is None:
+        return not_acceptable(available)
+    elif media_type == JSON:
+        content = _stream_json(meta, [row_names.get(n, n) for n in names], batches)
+    elif media_type == NDJSON:
+        content = _stream_ndjson([row_names.get(n, n) for n in names], batches)
+    else:
+        content = _stream_arrow(meta, names, batches)
+
+    if isinstance(request, ASGIRequest):
+        content = _aiterate(content)
+    response = StreamingHttpResponse(content, content_type=media_type)
+    patch_vary_headers(response, ['Accept'])
+    return response
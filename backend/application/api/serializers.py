@@ -0,0 +1,17 @@
+"""API serializers."""
+
+from rest_framework import serializers
+
+from backend.domain.models import AirQualityMeasurement, Forecast
+
+
+class MeasurementSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AirQualityMeasurement
+        fields = '__all__'
+
+
+class ForecastSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Forecast
+        fields = '__all__'
@@ -1,28 +1,59 @@
 """API URL configuration."""
 
-from django.urls import path
-from . import data_views
+from django.conf import settings
+from django.urls import include, path
+from rest_framework.routers import SimpleRouter
+
+from . import data_views, views
+
+# Dashboard endpoints run as coroutines on the async pool under ASGI
+if settings.API_ASYNC_VIEWS:
+    from . import async_views as dashboard_views
+else:
+    dashboard_views = data_views
 
 app_name = 'api'
 
+router = SimpleRouter()
+router.register('measurements', views.MeasurementViewSet, basename='measurement')
+router.register('forecasts', views.ForecastViewSet, basename='forecast')
+
 urlpatterns = [
     # API Overview
     path('', data_views.api_overview, name='overview'),
     
     # Current data
-    path('current/', data_views.current_data, name='current'),
+    path('current/', dashboard_views.current_data, name='current'),
     
     # Time series
-    path('timeseries/', data_views.timeseries_data, name='timeseries'),
-    path('daily/', data_views.daily_averages, name='daily'),
+    path('timeseries/', dashboard_views.timeseries_data, name='timeseries'),
+    path('daily/', dashboard_views.daily_averages, name='daily'),
     
     # Statistics
-    path('statistics/', data_views.statistics, name='statistics'),
+    path('statistics/', dashboard_views.statistics, name='statistics'),
     
     # Patterns
-    path('hourly-pattern/', data_views.hourly_pattern, name='hourly_pattern'),
-    path('monthly-pattern/', data_views.monthly_pattern, name='monthly_pattern'),
+    path('hourly-pattern/', dashboard_views.hourly_pattern, name='hourly_pattern'),
+    path('monthly-pattern/', dashboard_views.monthly_pattern, name='monthly_pattern'),
+    
+    # Dashboard first load (current + statistics + timeseries + daily)
+    path('dashboard-bundle/', dashboard_views.dashboard_bundle, name='dashboard_bundle'),
+    
+    # AQI
+    path('aqi/bulk/', data_views.aqi_bulk, name='aqi_bulk'),
     
     # Correlation
     path('correlation/', data_views.correlation_data, name='correlation'),
+    
+    # Response cache
+    path('cache-stats/', data_views.cache_stats, name='cache_stats'),
+    
+    # Database connection pools
+    path('pool-stats/', data_views.pool_stats, name='pool_stats'),
+    
+    # Monitoring stations
+    path('stations/nearest/', data_views.nearest_stations, name='nearest_stations'),
+    
+    # Model API (keyset-paginated)
+    path('', include(router.urls)),
 ]
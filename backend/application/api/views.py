@@ -4,12 +4,17 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
+from backend.application.api.pagination import KeysetPagination
+from backend.application.api.serializers import ForecastSerializer, MeasurementSerializer
 from backend.domain.models import AirQualityMeasurement, Forecast
 
 
 class MeasurementViewSet(viewsets.ReadOnlyModelViewSet):
-    """API endpoint for air quality measurements."""
+    """API endpoint for air quality measurements, newest first."""
     queryset = AirQualityMeasurement.objects.all()
+    serializer_class = MeasurementSerializer
+    pagination_class = KeysetPagination
+    keyset_field = 'timestamp'
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -27,12 +32,16 @@ class MeasurementViewSet(viewsets.ReadOnlyModelViewSet):
         if end_date:
             queryset = queryset.filter(timestamp__lte=end_date)
         
-        return queryset.order_by('-timestamp')
+        # Ordering (-timestamp, -id) is applied by KeysetPagination
+        return queryset
 
 
 class ForecastViewSet(viewsets.ReadOnlyModelViewSet):
-    """API endpoint for forecasts."""
+    """API endpoint for forecasts, most recently created first."""
     queryset = Forecast.objects.all()
+    serializer_class = ForecastSerializer
+    pagination_class = KeysetPagination
+    keyset_field = 'created_at'
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -41,7 +50,8 @@ class ForecastViewSet(viewsets.ReadOnlyModelViewSet):
         if model_type:
             queryset = queryset.filter(model_type=model_type)
         
-        return queryset.order_by('-created_at')
+        # Ordering (-created_at, -id) is applied by KeysetPagination
+        return queryset
 
 
 @api_view(['GET'])
@@ -1,7 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class ApplicationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'backend.application'
     verbose_name = 'Application Layer'
+
+    def ready(self):
+        from backend.application import stations
+        from backend.domain.models import City, MonitoringStation
+
+        # Station (and city name) changes rebuild the nearest-station index
+        for model in (MonitoringStation, City):
+            post_save.connect(stations.invalidate, sender=model, dispatch_uid=f'stations-{model.__name__}-save')
+            post_delete.connect(stations.invalidate, sender=model, dispatch_uid=f'stations-{model.__name__}-delete')
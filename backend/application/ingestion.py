@@ -0,0 +1,34 @@
+"""
+Post-ingestion maintenance.
+
+Everything derived from unified_data (rollups, statistics, the pattern cube,
+NowCast and friends) is refreshed from here, so loaders only need to report
+the time range they wrote.
+"""
+
+from django.db import connection, transaction
+
+from backend.infrastructure.cache import response_cache
+from backend.infrastructure.database import nowcast, patterns, rollups, stats
+from backend.infrastructure.database.data_version import bump_data_version
+
+
+def refresh_derived_data(start=None, end=None):
+    """
+    Refresh all tables derived from unified_data for rows in [start, end].
+
+    Call after every ingestion batch. Without bounds everything is rebuilt.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        if start is None and end is None:
+            rollups.rebuild_rollups(cursor)
+        else:
+            rollups.refresh_rollups(cursor, start, end)
+        stats.refresh_stats(cursor, start, end)
+        patterns.refresh_patterns(cursor, start, end)
+        nowcast.refresh_nowcast(cursor, start, end)
+        # Last: ETags and cached responses are validated against this version
+        extends = bump_data_version(cursor, start, end)
+
+        # Cached responses are only dropped once the new rows are visible
+        transaction.on_commit(lambda: response_cache.invalidate(start, end, extends))
@@ -0,0 +1,94 @@
+"""Load synthetic unified_data, measurements and weather rows for load testing."""
+
+import time
+from datetime import date, datetime
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from backend.application.ingestion import refresh_derived_data
+from backend.domain.services import synthetic
+from backend.infrastructure.database import synthetic as loader
+
+# Upper bound on the rows of one run, over all tables
+MAX_ROWS = 100_000_000
+
+# Rows per city and hour in each table
+ROWS_PER_HOUR = {
+    'unified_data': 1,
+    'weather': 1,
+    'measurements': len(synthetic.POLLUTANTS) * (1 - synthetic.OUTAGE_SHARE),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate hourly synthetic series for --cities cities over --years years "
+        "and COPY them into unified_data, measurements and weather"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cities', type=int, default=1, help="Number of cities (default: 1)")
+        parser.add_argument('--years', type=int, default=1, help="Number of calendar years (default: 1)")
+        parser.add_argument('--start-year', type=int, help="First year (default: --years before the current one)")
+        parser.add_argument('--tables', nargs='+', choices=loader.TABLES, default=list(loader.TABLES),
+                            help="Tables to fill (default: all)")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+        parser.add_argument('--no-refresh', action='store_true',
+                            help="Skip refreshing the tables derived from unified_data")
+
+    def handle(self, *args, **options):
+        if options['cities'] < 1 or options['years'] < 1:
+            raise CommandError("--cities and --years must be at least 1")
+        first_year = options['start_year'] or date.today().year - options['years']
+        last_year = first_year + options['years'] - 1
+        start, end = datetime(first_year, 1, 1), datetime(last_year + 1, 1, 1)
+        tables = [table for table in loader.TABLES if table in options['tables']]
+
+        hours = (end - start).days * 24
+        estimate = int(options['cities'] * hours * sum(ROWS_PER_HOUR[table] for table in tables))
+        if estimate > MAX_ROWS:
+            raise CommandError(
+                f"About {estimate:,} rows requested; at most {MAX_ROWS:,} per run "
+                "(fewer --cities/--years, or fewer --tables)"
+            )
+
+        rng = np.random.default_rng(options['seed'])
+        cities = synthetic.cities(options['cities'], rng)
+        with transaction.atomic(), connection.cursor() as cursor:
+            loader.ensure_tables(cursor, tables)
+            # Generated rows would sit next to the real ones and count twice
+            for table in tables:
+                taken = loader.ingested_locations(cursor, table, [city.name for city in cities], start, end)
+                if taken:
+                    raise CommandError(
+                        f"{table} already holds ingested rows for {', '.join(taken)} in "
+                        f"{first_year}-{last_year}; choose other --start-year/--years"
+                    )
+            created = loader.ensure_partitions(cursor, first_year, last_year)
+        if created:
+            self.stdout.write(f"Created partitions for {', '.join(map(str, created))}")
+
+        began = time.monotonic()
+        totals = dict.fromkeys(tables, 0)
+        for city in cities:
+            city_began = time.monotonic()
+            frame = synthetic.generate(city, start, end, rng)
+            # One transaction per city keeps a large run restartable
+            with transaction.atomic(), connection.cursor() as cursor:
+                counts = loader.load(cursor, frame, city, start, end, tables)
+            for table, count in counts.items():
+                totals[table] += count
+            rows = sum(counts.values())
+            elapsed = time.monotonic() - city_began
+            self.stdout.write(f"{city.name}: {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+
+        if 'unified_data' in tables and not options['no_refresh']:
+            refresh_derived_data(start, end)
+
+        summary = ', '.join(f"{table} {count:,}" for table, count in totals.items())
+        elapsed = time.monotonic() - began
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {summary} rows for {first_year}-{last_year} in {elapsed:.0f}s"
+        ))
@@ -0,0 +1,28 @@
+"""Create upcoming yearly partitions of unified_data."""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from backend.infrastructure.database import partitions
+
+
+class Command(BaseCommand):
+    help = "Create missing yearly partitions of unified_data, up to --ahead years past the current one"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ahead', type=int, default=1, help="Years to create ahead (default: 1)")
+
+    def handle(self, *args, **options):
+        if options['ahead'] < 0:
+            raise CommandError("--ahead must not be negative")
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            if not partitions.is_partitioned(cursor):
+                raise CommandError("unified_data is not partitioned; run migrate first")
+            created = partitions.ensure_partitions(cursor, options['ahead'])
+
+        if created:
+            names = ', '.join(partitions.partition_name(year) for year in created)
+            self.stdout.write(self.style.SUCCESS(f"Created {names}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("All partitions present"))
@@ -0,0 +1,29 @@
+"""Refresh tables derived from unified_data after an ingestion run."""
+
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.application.ingestion import refresh_derived_data
+
+
+class Command(BaseCommand):
+    help = "Refresh tables derived from unified_data (full rebuild without --start/--end)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help="First timestamp of the batch (ISO 8601, UTC)")
+        parser.add_argument('--end', help="Last timestamp of the batch (ISO 8601, UTC)")
+
+    def handle(self, *args, **options):
+        try:
+            start = datetime.fromisoformat(options['start']) if options['start'] else None
+            end = datetime.fromisoformat(options['end']) if options['end'] else None
+        except ValueError as exc:
+            raise CommandError(f"Invalid timestamp: {exc}")
+
+        if (start is None) != (end is None):
+            raise CommandError("--start and --end must be given together")
+
+        refresh_derived_data(start, end)
+        scope = f"{start} .. {end}" if start else "full history"
+        self.stdout.write(self.style.SUCCESS(f"Aggregates refreshed ({scope})"))
@@ -0,0 +1,105 @@
+"""
+In-memory nearest-station index over active MonitoringStations.
+
+The index is built on first use in each process and rebuilt after stations
+change: saving or deleting a station (signals, see ``apps``) bumps a
+version in the ``api`` cache, which is checked before a lookup. Bulk
+loaders that bypass signals (``bulk_create``, ``update``) call `invalidate`
+themselves. The version reaches other processes only when that cache is
+shared (API_CACHE_BACKEND file or redis); with the default per-process
+locmem cache it reaches the process that made the change, and the others
+rebuild within STATION_INDEX_TTL seconds, the bound on staleness either way.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+from backend.domain.models import MonitoringStation
+from backend.domain.services.spatial import SphereIndex, idw
+from backend.infrastructure.cache import response_cache
+
+VERSION_KEY = 'gen:stations'
+
+Station = namedtuple('Station', [
+    'id', 'station_id', 'name', 'city', 'source', 'latitude', 'longitude', 'is_reference',
+])
+
+StationIndex = namedtuple('StationIndex', ['stations', 'tree', 'version', 'built_at'])
+
+_index = None
+_lock = threading.Lock()
+
+
+def _version():
+    return response_cache.get_cache().get(VERSION_KEY, 0)
+
+
+def invalidate(**kwargs):
+    """Rebuild the index on its next lookup (in every process sharing the ``api`` cache)."""
+    cache = response_cache.get_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+def build_index():
+    """A fresh StationIndex of the active stations."""
+    version = _version()
+    stations = [
+        Station(*row)
+        for row in MonitoringStation.objects.filter(is_active=True).order_by('id').values_list(
+            'id', 'station_id', 'name', 'city__name', 'source', 'latitude', 'longitude', 'is_reference',
+        )
+    ]
+    tree = SphereIndex([s.latitude for s in stations], [s.longitude for s in stations])
+    return StationIndex(stations, tree, version, time.monotonic())
+
+
+def get_index():
+    """This process's StationIndex, rebuilt when stations changed or it expired."""
+    global _index
+    index = _index
+    ttl = getattr(settings, 'STATION_INDEX_TTL', 300)
+    if index is None or index.version != _version() or time.monotonic() - index.built_at > ttl:
+        with _lock:
+            if _index is index:
+                _index = build_index()
+            index = _index
+    return index
+
+
+def nearest(lat, lon, k=5):
+    """The `k` active stations nearest to (lat, lon) as (Station, distance_km) pairs."""
+    index = get_index()
+    positions, distances = index.tree.nearest(lat, lon, k)
+    return [(index.stations[p], float(d)) for p, d in zip(positions, distances)]
+
+
+def interpolate(lat, lon, readings, k=5, power=2.0):
+    """
+    Value at (lat, lon) blended from the `k` nearest stations with a reading.
+
+    `readings` maps station ids (primary keys) to values; stations without
+    one are passed over. Inverse-distance weighted; None without readings.
+    """
+    index = get_index()
+    wanted = min(k, len(index.tree))
+    while True:
+        positions, distances = index.tree.nearest(lat, lon, wanted)
+        found = [
+            (d, readings[index.stations[p].id])
+            for p, d in zip(positions, distances)
+            if readings.get(index.stations[p].id) is not None
+        ]
+        # Widen the search until k stations with readings are in it
+        if len(found) >= k or wanted >= len(index.tree):
+            break
+        wanted = min(wanted * 2, len(index.tree))
+    if not found:
+        return None
+    distances, values = zip(*found[:k])
+    return idw(distances, values, power)
@@ -0,0 +1,16 @@
+"""Celery tasks for keeping derived aggregates in sync with ingestion."""
+
+from datetime import datetime
+
+from celery import shared_task
+
+from backend.application.ingestion import refresh_derived_data
+
+
+@shared_task
+def refresh_aggregates(start=None, end=None):
+    """Refresh derived tables for an ingested batch (ISO timestamps)."""
+    refresh_derived_data(
+        datetime.fromisoformat(start) if start else None,
+        datetime.fromisoformat(end) if end else None,
+    )
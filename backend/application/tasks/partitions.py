@@ -0,0 +1,13 @@
+"""Celery tasks for unified_data partition maintenance."""
+
+from celery import shared_task
+from django.db import connection, transaction
+
+from backend.infrastructure.database import partitions
+
+
+@shared_task
+def maintain_partitions(ahead=1):
+    """Create missing yearly partitions; returns the years created."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        return partitions.ensure_partitions(cursor, ahead)
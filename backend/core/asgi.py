@@ -0,0 +1,16 @@
+"""
+ASGI config for AAQIS project.
+
+Serves the dashboard data endpoints with coroutine views on an async
+connection pool (see ``backend.application.api.async_views``), e.g.::
+
+    uvicorn backend.core.asgi:application --workers 2
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.core.settings')
+os.environ.setdefault('API_ASYNC_VIEWS', 'True')
+application = get_asgi_application()
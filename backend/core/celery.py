@@ -3,7 +3,9 @@ Celery configuration for AAQIS project.
 """
 
 import os
+import time
 from celery import Celery
+from celery.signals import task_postrun, task_prerun, worker_process_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.core.settings')
 
@@ -17,4 +19,52 @@ app.conf.beat_schedule = {
         'task': 'backend.application.tasks.data_collection.fetch_aqicn_data',
         'schedule': 3600.0,  # Every hour
     },
+    'maintain-partitions-daily': {
+        'task': 'backend.application.tasks.partitions.maintain_partitions',
+        'schedule': 86400.0,  # Every day; a no-op once next year's partition exists
+    },
 }
+
+
+@worker_process_init.connect
+def reset_db_pools(**kwargs):
+    """Give each forked worker its own connection pool, not a copy of the parent's."""
+    from django.db import connections
+
+    for conn in connections.all(initialized_only=True):
+        # The parent only dispatches tasks, so closing the inherited
+        # connections cannot break a query in progress
+        conn.close_pool()
+
+
+@task_prerun.connect
+@task_postrun.connect
+def release_db_connections(**kwargs):
+    """Return connections to the pool around tasks, as Django does around requests."""
+    from django.db import close_old_connections
+
+    close_old_connections()
+
+
+# (start time, SQL counter token) of the tasks running in this process
+_task_timers = {}
+
+
+@task_prerun.connect
+def start_task_timer(task_id=None, **kwargs):
+    from backend.infrastructure import metrics
+
+    _task_timers[task_id] = (time.perf_counter(), metrics.start_sql())
+
+
+@task_postrun.connect
+def observe_task(task_id=None, task=None, state=None, **kwargs):
+    """Record the task's run time and query count (see backend.infrastructure.metrics)."""
+    from backend.infrastructure import metrics
+
+    timer = _task_timers.pop(task_id, None)
+    if timer is None:
+        return
+    start, token = timer
+    queries, _ = metrics.stop_sql(token)
+    metrics.observe_task(task.name if task else 'unknown', state or 'UNKNOWN', time.perf_counter() - start, queries)
@@ -39,6 +39,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so the timings include every other middleware
+    'backend.application.api.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -68,8 +70,19 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'backend.core.wsgi.application'
+ASGI_APPLICATION = 'backend.core.asgi.application'
 
 # Database
+# Each WSGI/Celery process keeps a psycopg pool of DB_POOL_MIN_SIZE to
+# DB_POOL_MAX_SIZE connections. With a pool, Django turns CONN_HEALTH_CHECKS
+# into the pool's `check` callback (ConnectionPool.check_connection), so a
+# connection is checked as it is taken from the pool; it is closed after
+# DB_POOL_MAX_IDLE seconds unused and replaced after DB_POOL_MAX_LIFETIME
+# seconds, and a request waits up to DB_POOL_TIMEOUT seconds for one. With
+# DB_POOL=False connections are kept per thread for CONN_MAX_AGE seconds
+# and checked at the start of each request instead.
+DB_POOL = os.getenv('DB_POOL', 'True').lower() == 'true'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -78,9 +91,31 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', 'aaqis_password'),
         'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
         'PORT': os.getenv('POSTGRES_PORT', '5432'),
+        'CONN_HEALTH_CHECKS': True,
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('CONN_MAX_AGE', 60)),
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+                'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+                'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+                'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', 300)),
+                'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),
+                'name': 'aaqis',
+            },
+        } if DB_POOL else {},
     }
 }
 
+# Async connection pool of the coroutine data views. They are routed only
+# when API_ASYNC_VIEWS is on, which backend.core.asgi sets by default; under
+# WSGI every request would run in its own event loop and defeat the pool.
+API_ASYNC_VIEWS = os.getenv('API_ASYNC_VIEWS', 'False').lower() == 'true'
+ASYNC_DB_POOL = {
+    'min_size': int(os.getenv('ASYNC_DB_POOL_MIN_SIZE', 2)),
+    'max_size': int(os.getenv('ASYNC_DB_POOL_MAX_SIZE', 20)),
+    'timeout': float(os.getenv('ASYNC_DB_POOL_TIMEOUT', 30)),
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -106,13 +141,17 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'backend.application.api.renderers.FastJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
 }
 
+# JSON encoder for API responses: orjson (falls back to json when not
+# installed) or json
+API_JSON_ENCODER = os.getenv('API_JSON_ENCODER', 'orjson')
+
 # CORS
 CORS_ALLOWED_ORIGINS = os.getenv(
     'CORS_ALLOWED_ORIGINS', 
@@ -123,6 +162,50 @@ CORS_ALLOWED_ORIGINS = os.getenv(
 CELERY_BROKER_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = CELERY_BROKER_URL
 
+# Caches
+# The `api` alias holds rendered API responses; API_CACHE_BACKEND selects
+# locmem (per process, LRU), file (shared by workers on one host) or redis
+# (shared by all hosts; configure the server with an allkeys-lru policy).
+API_CACHE_BACKEND = os.getenv('API_CACHE_BACKEND', 'locmem')
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 3600))
+API_CACHE_MAX_ENTRIES = int(os.getenv('API_CACHE_MAX_ENTRIES', 2000))
+# Seconds a cache miss waits for an identical one in progress (in this
+# process, or in another worker through a lock in the shared cache) before
+# computing the response itself; 0 disables coalescing
+API_COALESCE_TIMEOUT = float(os.getenv('API_COALESCE_TIMEOUT', 30))
+
+_API_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'aaqis-api',
+        'OPTIONS': {'MAX_ENTRIES': API_CACHE_MAX_ENTRIES},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('API_CACHE_DIR', str(BASE_DIR / '.cache' / 'api')),
+        'OPTIONS': {'MAX_ENTRIES': API_CACHE_MAX_ENTRIES},
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('API_CACHE_REDIS_URL', os.getenv('REDIS_URL', 'redis://localhost:6379/1')),
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': {
+        **_API_CACHE_BACKENDS[API_CACHE_BACKEND],
+        'TIMEOUT': API_CACHE_TIMEOUT,
+        'KEY_PREFIX': 'aaqis',
+    },
+}
+
+# Seconds before the nearest-station index is rebuilt even without a
+# station change (catches bulk loads that bypass model signals)
+STATION_INDEX_TTL = int(os.getenv('STATION_INDEX_TTL', 300))
+
 # API Keys (loaded from environment)
 AQICN_API_TOKEN = os.getenv('AQICN_API_TOKEN', '')
 OPENAQ_API_KEY = os.getenv('OPENAQ_API_KEY', '')
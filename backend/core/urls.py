@@ -5,8 +5,11 @@ URL configuration for AAQIS project.
 from django.contrib import admin
 from django.urls import path, include
 
+from backend.application.api.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('backend.application.api.urls')),
+    path('metrics', metrics_view, name='metrics'),
     path('', include('backend.presentation.urls')),
 ]
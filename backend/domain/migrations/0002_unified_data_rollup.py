@@ -0,0 +1,36 @@
+"""
+Rollup pyramid for unified_data.
+
+unified_data itself is created by docker/01-init-schema.sql, so the rollup
+table is managed with raw SQL here. It is filled by
+``manage.py refresh_aggregates``, run after migrate, so this migration
+does not depend on how the current code aggregates.
+"""
+
+from django.db import migrations
+
+CREATE_ROLLUP_TABLE = """
+CREATE TABLE IF NOT EXISTS unified_data_rollup (
+    resolution VARCHAR(4) NOT NULL,
+    parameter VARCHAR(20) NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    value_count INTEGER NOT NULL,
+    value_sum DOUBLE PRECISION NOT NULL,
+    value_min DOUBLE PRECISION NOT NULL,
+    value_max DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (resolution, parameter, bucket_start)
+);
+"""
+
+DROP_ROLLUP_TABLE = "DROP TABLE IF EXISTS unified_data_rollup;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_ROLLUP_TABLE, DROP_ROLLUP_TABLE),
+    ]
@@ -0,0 +1,43 @@
+"""
+Single-row data version counter bumped by every ingestion batch.
+"""
+
+from django.db import migrations
+
+CREATE_DATA_VERSION = """
+CREATE TABLE IF NOT EXISTS data_version (
+    id SMALLINT PRIMARY KEY CHECK (id = 1),
+    version BIGINT NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL,
+    latest_timestamp TIMESTAMP
+);
+
+INSERT INTO data_version (id, version, updated_at, latest_timestamp)
+VALUES (1, 1, NOW(), NULL)
+ON CONFLICT (id) DO NOTHING;
+"""
+
+DROP_DATA_VERSION = "DROP TABLE IF EXISTS data_version;"
+
+
+def seed_latest_timestamp(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('unified_data') IS NOT NULL")
+        if cursor.fetchone()[0]:
+            cursor.execute("""
+                UPDATE data_version
+                SET latest_timestamp = (SELECT MAX(timestamp_utc) FROM unified_data)
+                WHERE id = 1
+            """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0002_unified_data_rollup'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_DATA_VERSION, DROP_DATA_VERSION),
+        migrations.RunPython(seed_latest_timestamp, migrations.RunPython.noop),
+    ]
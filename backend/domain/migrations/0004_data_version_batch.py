@@ -0,0 +1,32 @@
+"""
+Record the time range of the last ingestion batch with the data version.
+
+Processes with a private response cache replay the invalidation from it.
+"""
+
+from django.db import migrations
+
+ADD_BATCH_COLUMNS = """
+ALTER TABLE data_version
+    ADD COLUMN IF NOT EXISTS batch_start TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS batch_end TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS batch_extends BOOLEAN NOT NULL DEFAULT TRUE;
+"""
+
+DROP_BATCH_COLUMNS = """
+ALTER TABLE data_version
+    DROP COLUMN IF EXISTS batch_start,
+    DROP COLUMN IF EXISTS batch_end,
+    DROP COLUMN IF EXISTS batch_extends;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0003_data_version'),
+    ]
+
+    operations = [
+        migrations.RunSQL(ADD_BATCH_COLUMNS, DROP_BATCH_COLUMNS),
+    ]
@@ -0,0 +1,37 @@
+"""
+Per-cell summary statistics for unified_data (see infrastructure.database.stats).
+
+The table is filled by ``manage.py refresh_aggregates``, run after migrate.
+"""
+
+from django.db import migrations
+
+CREATE_STATS_TABLE = """
+CREATE TABLE IF NOT EXISTS unified_data_stats (
+    parameter VARCHAR(20) NOT NULL,
+    year SMALLINT NOT NULL,
+    season VARCHAR(20) NOT NULL,
+    value_count BIGINT NOT NULL,
+    value_mean DOUBLE PRECISION NOT NULL,
+    value_m2 DOUBLE PRECISION NOT NULL,
+    value_min DOUBLE PRECISION NOT NULL,
+    value_max DOUBLE PRECISION NOT NULL,
+    first_record TIMESTAMP NOT NULL,
+    last_record TIMESTAMP NOT NULL,
+    category_counts INTEGER[],
+    PRIMARY KEY (parameter, year, season)
+);
+"""
+
+DROP_STATS_TABLE = "DROP TABLE IF EXISTS unified_data_stats;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0004_data_version_batch'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_STATS_TABLE, DROP_STATS_TABLE),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0005_unified_data_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='airqualitymeasurement',
+            index=models.Index(fields=['timestamp', 'id'], name='airq_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='airqualitymeasurement',
+            index=models.Index(fields=['pollutant', 'timestamp', 'id'], name='airq_pollutant_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='forecast',
+            index=models.Index(fields=['created_at', 'id'], name='forecast_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='forecast',
+            index=models.Index(fields=['model_type', 'created_at', 'id'], name='forecast_model_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+"""
+Store unified_data measurements as DOUBLE PRECISION instead of DECIMAL.
+
+Drivers return DECIMAL columns as Decimal objects, which every response
+had to convert back to float cell by cell; doubles arrive as floats.
+"""
+
+from django.db import migrations
+
+# Column -> original DECIMAL type (docker/01-init-schema.sql), for reversal
+DECIMAL_COLUMNS = {
+    'pm25': 'DECIMAL(10, 2)',
+    'pm10': 'DECIMAL(10, 2)',
+    'no2': 'DECIMAL(10, 4)',
+    'o3': 'DECIMAL(10, 4)',
+    'so2': 'DECIMAL(10, 4)',
+    'co': 'DECIMAL(10, 4)',
+    'temperature_c': 'DECIMAL(5, 2)',
+    'humidity_pct': 'DECIMAL(5, 2)',
+    'pressure_hpa': 'DECIMAL(7, 2)',
+    'wind_speed_ms': 'DECIMAL(5, 2)',
+    'wind_direction_deg': 'DECIMAL(5, 2)',
+    'precipitation_mm': 'DECIMAL(5, 2)',
+    'cloud_cover_pct': 'DECIMAL(5, 2)',
+    'completeness_score': 'DECIMAL(5, 4)',
+}
+
+
+def _alter(schema_editor, types):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('unified_data') IS NOT NULL")
+        if not cursor.fetchone()[0]:
+            return
+        # One ALTER TABLE rewrites the table once for all columns
+        cursor.execute("ALTER TABLE unified_data " + ", ".join(
+            f"ALTER COLUMN {col} TYPE {sql_type} USING {col}::{sql_type}"
+            for col, sql_type in types.items()
+        ))
+
+
+def to_double(apps, schema_editor):
+    _alter(schema_editor, {col: 'DOUBLE PRECISION' for col in DECIMAL_COLUMNS})
+
+
+def to_decimal(apps, schema_editor):
+    _alter(schema_editor, DECIMAL_COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0006_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(to_double, to_decimal),
+    ]
@@ -0,0 +1,93 @@
+"""
+Partition unified_data by year (see infrastructure.database.partitions).
+
+The table is rebuilt as a partitioned table with one partition per year of
+existing data, the next year and a default partition. The B-tree indexes
+on timestamp_utc, pm25, month and hour are replaced by a BRIN index on
+timestamp_utc and a partial B-tree for latest-reading lookups; the primary
+key becomes (id, timestamp_utc), as a partitioned table requires.
+"""
+
+from datetime import date
+
+from django.db import migrations
+
+from backend.infrastructure.database import partitions
+
+# Indexes of the plain table (docker/01-init-schema.sql), for reversal
+PLAIN_INDEXES = (
+    "CREATE INDEX idx_unified_data_timestamp ON unified_data(timestamp_utc)",
+    "CREATE INDEX idx_unified_data_pm25 ON unified_data(pm25)",
+    "CREATE INDEX idx_unified_data_month ON unified_data(month)",
+    "CREATE INDEX idx_unified_data_hour ON unified_data(hour)",
+)
+
+
+def _rebuild(cursor, old, create_parent):
+    """Move unified_data to `old`, create the new table, copy rows, drop `old`."""
+    cursor.execute("SELECT pg_get_serial_sequence('unified_data', 'id')")
+    sequence = cursor.fetchone()[0]
+    cursor.execute(f"ALTER TABLE unified_data RENAME TO {old}")
+    # Keep the id sequence alive when the old table is dropped
+    if sequence:
+        cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+    cursor.execute(f"ALTER TABLE {old} DROP CONSTRAINT IF EXISTS unified_data_pkey")
+    create_parent(cursor)
+    cursor.execute(f"INSERT INTO unified_data SELECT * FROM {old}")
+    if sequence:
+        cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY unified_data.id")
+    cursor.execute(f"DROP TABLE {old} CASCADE")
+    cursor.execute("ANALYZE unified_data")
+
+
+def partition(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        if not partitions.table_exists(cursor) or partitions.is_partitioned(cursor):
+            return
+
+        cursor.execute("""
+            SELECT EXTRACT(YEAR FROM MIN(timestamp_utc))::int,
+                   EXTRACT(YEAR FROM MAX(timestamp_utc))::int
+            FROM unified_data
+        """)
+        first, last = cursor.fetchone()
+        current = date.today().year
+        years = range(first or current, max(last or current, current) + 2)
+
+        def create_parent(cursor):
+            cursor.execute("""
+                CREATE TABLE unified_data (LIKE unified_data_unpartitioned INCLUDING DEFAULTS)
+                PARTITION BY RANGE (timestamp_utc)
+            """)
+            cursor.execute("ALTER TABLE unified_data ADD PRIMARY KEY (id, timestamp_utc)")
+            partitions.create_indexes(cursor)
+            for year in years:
+                partitions.create_partition(cursor, year)
+            partitions.create_default_partition(cursor)
+
+        _rebuild(cursor, 'unified_data_unpartitioned', create_parent)
+
+
+def unpartition(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        if not partitions.is_partitioned(cursor):
+            return
+
+        def create_parent(cursor):
+            cursor.execute("CREATE TABLE unified_data (LIKE unified_data_partitioned INCLUDING DEFAULTS)")
+            cursor.execute("ALTER TABLE unified_data ADD PRIMARY KEY (id)")
+            for sql in PLAIN_INDEXES:
+                cursor.execute(sql)
+
+        _rebuild(cursor, 'unified_data_partitioned', create_parent)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0007_unified_data_double_precision'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -0,0 +1,28 @@
+"""
+NowCast PM2.5/PM10 per hour of unified_data (see infrastructure.database.nowcast).
+
+The table is keyed by location from 0012 on.
+"""
+
+from django.db import migrations
+
+CREATE_NOWCAST_TABLE = """
+CREATE TABLE IF NOT EXISTS unified_data_nowcast (
+    timestamp_utc TIMESTAMP PRIMARY KEY,
+    pm25 DOUBLE PRECISION,
+    pm10 DOUBLE PRECISION
+);
+"""
+
+DROP_NOWCAST_TABLE = "DROP TABLE IF EXISTS unified_data_nowcast;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0008_partition_unified_data'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_NOWCAST_TABLE, DROP_NOWCAST_TABLE),
+    ]
@@ -0,0 +1,35 @@
+"""
+Pattern cube of unified_data (see infrastructure.database.patterns).
+
+The table is filled by ``manage.py refresh_aggregates``, run after migrate.
+"""
+
+from django.db import migrations
+
+CREATE_PATTERN_TABLE = """
+CREATE TABLE IF NOT EXISTS unified_data_pattern (
+    parameter VARCHAR(20) NOT NULL,
+    year SMALLINT NOT NULL,
+    month SMALLINT NOT NULL,
+    day_of_week SMALLINT NOT NULL,
+    hour SMALLINT NOT NULL,
+    season VARCHAR(20) NOT NULL,
+    is_heating_season BOOLEAN NOT NULL,
+    value_count INTEGER NOT NULL,
+    value_sum DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (parameter, year, month, day_of_week, hour, season, is_heating_season)
+);
+"""
+
+DROP_PATTERN_TABLE = "DROP TABLE IF EXISTS unified_data_pattern;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0009_unified_data_nowcast'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_PATTERN_TABLE, DROP_PATTERN_TABLE),
+    ]
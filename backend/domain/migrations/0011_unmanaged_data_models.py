@@ -0,0 +1,77 @@
+"""
+Record the unmanaged Measurement, UnifiedData and Weather models.
+
+Their tables are created outside Django (docker/01-init-schema.sql and the
+ETL scripts), so this migration only adds them to the migration state and
+runs no SQL.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0010_unified_data_pattern'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Measurement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField(db_index=True)),
+                ('source', models.CharField(max_length=50)),
+                ('parameter', models.CharField(max_length=50)),
+                ('value', models.FloatField()),
+                ('unit', models.CharField(default='µg/m³', max_length=20)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'measurements',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='UnifiedData',
+            fields=[
+                ('timestamp', models.DateTimeField(db_index=True, primary_key=True, serialize=False)),
+                ('pm25', models.FloatField(blank=True, null=True)),
+                ('pm25_source', models.CharField(blank=True, max_length=50, null=True)),
+                ('pm10', models.FloatField(blank=True, null=True)),
+                ('no2', models.FloatField(blank=True, null=True)),
+                ('so2', models.FloatField(blank=True, null=True)),
+                ('o3', models.FloatField(blank=True, null=True)),
+                ('co', models.FloatField(blank=True, null=True)),
+                ('temperature_2m', models.FloatField(blank=True, null=True)),
+                ('relative_humidity_2m', models.FloatField(blank=True, null=True)),
+                ('surface_pressure', models.FloatField(blank=True, null=True)),
+                ('wind_speed_10m', models.FloatField(blank=True, null=True)),
+                ('wind_direction_10m', models.FloatField(blank=True, null=True)),
+                ('precipitation', models.FloatField(blank=True, null=True)),
+                ('cloud_cover', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'unified_data',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Weather',
+            fields=[
+                ('timestamp', models.DateTimeField(db_index=True, primary_key=True, serialize=False)),
+                ('temperature_2m', models.FloatField(blank=True, null=True)),
+                ('relative_humidity_2m', models.FloatField(blank=True, null=True)),
+                ('surface_pressure', models.FloatField(blank=True, null=True)),
+                ('wind_speed_10m', models.FloatField(blank=True, null=True)),
+                ('wind_direction_10m', models.FloatField(blank=True, null=True)),
+                ('precipitation', models.FloatField(blank=True, null=True)),
+                ('cloud_cover', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'weather',
+                'managed': False,
+            },
+        ),
+    ]
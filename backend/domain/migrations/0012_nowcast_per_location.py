@@ -0,0 +1,42 @@
+"""
+Key unified_data_nowcast by (location, timestamp_utc).
+
+The table held one NowCast per hour averaged over every location, so
+/api/current/ paired one location's reading with a NowCast of all of them.
+It is recreated per location; ``manage.py refresh_aggregates``, run after
+migrate, fills it.
+"""
+
+from django.db import migrations
+
+CREATE_NOWCAST_TABLE = """
+DROP TABLE IF EXISTS unified_data_nowcast;
+CREATE TABLE unified_data_nowcast (
+    location VARCHAR(100) NOT NULL,
+    timestamp_utc TIMESTAMP NOT NULL,
+    pm25 DOUBLE PRECISION,
+    pm10 DOUBLE PRECISION,
+    PRIMARY KEY (location, timestamp_utc)
+);
+"""
+
+# Back to the hourly table of 0009; it is left empty
+DROP_NOWCAST_TABLE = """
+DROP TABLE IF EXISTS unified_data_nowcast;
+CREATE TABLE unified_data_nowcast (
+    timestamp_utc TIMESTAMP PRIMARY KEY,
+    pm25 DOUBLE PRECISION,
+    pm10 DOUBLE PRECISION
+);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0011_unmanaged_data_models'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_NOWCAST_TABLE, DROP_NOWCAST_TABLE),
+    ]
@@ -0,0 +1,36 @@
+"""
+Temperature sums per pattern cell (see infrastructure.database.patterns).
+
+avg_temp of the hourly pattern is the mean temperature of the rows that
+hold the requested parameter, so each cell carries the count and sum of
+those rows' temperatures. The cells are emptied, since they lack these
+sums and rows with NULL calendar fields; ``manage.py refresh_aggregates``,
+run after migrate, refills them.
+"""
+
+from django.db import migrations
+
+ADD_TEMPERATURE = """
+TRUNCATE unified_data_pattern;
+ALTER TABLE unified_data_pattern
+    ADD COLUMN temperature_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN temperature_sum DOUBLE PRECISION NOT NULL DEFAULT 0;
+"""
+
+DROP_TEMPERATURE = """
+TRUNCATE unified_data_pattern;
+ALTER TABLE unified_data_pattern
+    DROP COLUMN temperature_count,
+    DROP COLUMN temperature_sum;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0012_nowcast_per_location'),
+    ]
+
+    operations = [
+        migrations.RunSQL(ADD_TEMPERATURE, DROP_TEMPERATURE),
+    ]
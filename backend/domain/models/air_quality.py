@@ -85,6 +85,9 @@ class AirQualityMeasurement(models.Model):
         indexes = [
             models.Index(fields=['timestamp', 'pollutant']),
             models.Index(fields=['station', 'pollutant', 'timestamp']),
+            # Keyset pagination, unfiltered and by pollutant
+            models.Index(fields=['timestamp', 'id'], name='airq_keyset_idx'),
+            models.Index(fields=['pollutant', 'timestamp', 'id'], name='airq_pollutant_keyset_idx'),
         ]
     
     def __str__(self):
@@ -177,6 +180,9 @@ class Forecast(models.Model):
         indexes = [
             models.Index(fields=['city', 'forecast_timestamp']),
             models.Index(fields=['model_type', 'created_at']),
+            # Keyset pagination, unfiltered and by model
+            models.Index(fields=['created_at', 'id'], name='forecast_keyset_idx'),
+            models.Index(fields=['model_type', 'created_at', 'id'], name='forecast_model_keyset_idx'),
         ]
     
     def __str__(self):
@@ -5,6 +5,8 @@ These models map to existing PostgreSQL tables created by ETL scripts.
 
 from django.db import models
 
+from backend.domain.services import aqi
+
 
 class Measurement(models.Model):
     """Air quality measurements from OpenAQ and CAMS."""
@@ -82,43 +84,23 @@ class UnifiedData(models.Model):
     def __str__(self):
         return f"Data @ {self.timestamp} - PM2.5: {self.pm25}"
     
+    def _aqi(self):
+        return aqi.single(
+            pm25=self.pm25, pm10=self.pm10, o3=self.o3,
+            no2=self.no2, so2=self.so2, co=self.co,
+        )
+    
     @property
     def aqi_category(self):
-        """Calculate AQI category based on PM2.5."""
-        if self.pm25 is None:
-            return 'unknown'
-        if self.pm25 <= 12:
-            return 'good'
-        elif self.pm25 <= 35.4:
-            return 'moderate'
-        elif self.pm25 <= 55.4:
-            return 'unhealthy_sensitive'
-        elif self.pm25 <= 150.4:
-            return 'unhealthy'
-        elif self.pm25 <= 250.4:
-            return 'very_unhealthy'
-        else:
-            return 'hazardous'
+        """US EPA AQI category over all measured pollutants."""
+        return self._aqi()[1]
     
     @property
     def aqi_value(self):
-        """Calculate US EPA AQI from PM2.5."""
-        if self.pm25 is None:
-            return None
-        
-        # EPA AQI breakpoints for PM2.5
-        breakpoints = [
-            (0, 12.0, 0, 50),
-            (12.1, 35.4, 51, 100),
-            (35.5, 55.4, 101, 150),
-            (55.5, 150.4, 151, 200),
-            (150.5, 250.4, 201, 300),
-            (250.5, 500.4, 301, 500),
-        ]
-        
-        pm = self.pm25
-        for bp_lo, bp_hi, i_lo, i_hi in breakpoints:
-            if bp_lo <= pm <= bp_hi:
-                return round(((i_hi - i_lo) / (bp_hi - bp_lo)) * (pm - bp_lo) + i_lo)
-        
-        return 500 if pm > 500.4 else 0
+        """US EPA AQI: the highest pollutant sub-index."""
+        return self._aqi()[0]
+    
+    @property
+    def dominant_pollutant(self):
+        """Pollutant with the highest sub-index, or None."""
+        return self._aqi()[2]
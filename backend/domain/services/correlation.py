@@ -0,0 +1,174 @@
+"""
+Binned scatter summaries for correlation charts.
+
+Instead of shipping every (x, y) point, the server reduces a scatter to a
+2D count grid (rectangular or hexagonal), per-x-bin means of y,
+Pearson/Spearman coefficients and a least-squares line. All functions take
+NumPy arrays and ignore pairs where either value is NaN.
+"""
+
+import numpy as np
+
+SHAPES = ('grid', 'hex')
+
+
+def drop_missing(x, y):
+    """Keep only pairs where both values are present."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = ~(np.isnan(x) | np.isnan(y))
+    return x[keep], y[keep]
+
+
+def pearson(x, y):
+    """Pearson correlation coefficient, or None if undefined."""
+    if len(x) < 2:
+        return None
+    dx, dy = x - x.mean(), y - y.mean()
+    denom = np.sqrt((dx * dx).sum() * (dy * dy).sum())
+    return float((dx * dy).sum() / denom) if denom else None
+
+
+def average_ranks(values):
+    """Ranks starting at 1, ties sharing the mean of their positions."""
+    order = np.argsort(values, kind='mergesort')
+    sorted_values = values[order]
+    # Start of each run of equal values, and the average rank of the run
+    starts = np.flatnonzero(np.r_[True, sorted_values[1:] != sorted_values[:-1]])
+    ends = np.r_[starts[1:], len(values)]
+    run_ranks = (starts + ends + 1) / 2.0
+    ranks = np.empty(len(values))
+    ranks[order] = np.repeat(run_ranks, ends - starts)
+    return ranks
+
+
+def spearman(x, y):
+    """Spearman rank correlation (Pearson on average ranks)."""
+    if len(x) < 2:
+        return None
+    return pearson(average_ranks(x), average_ranks(y))
+
+
+def linear_fit(x, y):
+    """Least-squares line y = slope * x + intercept, with R²; None if undefined."""
+    if len(x) < 2 or np.ptp(x) == 0:
+        return None
+    slope, intercept = np.polyfit(x, y, 1)
+    r = pearson(x, y)
+    return {
+        'slope': float(slope),
+        'intercept': float(intercept),
+        'r2': r * r if r is not None else None,
+    }
+
+
+def robust_range(values, tail=0.5):
+    """Range between the `tail` and `100 - tail` percentiles."""
+    lo, hi = np.percentile(values, [tail, 100 - tail])
+    if hi <= lo:
+        hi = lo + 1.0
+    return float(lo), float(hi)
+
+
+def grid_counts(x, y, bins, x_range, y_range):
+    """
+    Rectangular 2D histogram.
+
+    Points outside the ranges are clamped into the edge bins so the counts
+    add up to the number of points. Returns (x_edges, y_edges, counts) with
+    counts indexed ``[y_bin][x_bin]``, the layout of a heatmap.
+    """
+    x = np.clip(x, *x_range)
+    y = np.clip(y, *y_range)
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins, range=[x_range, y_range])
+    return x_edges, y_edges, counts.T.astype(np.int64)
+
+
+def hex_counts(x, y, bins, x_range, y_range):
+    """
+    Hexagonal binning with `bins` hexagons across the x range.
+
+    Each point goes to the nearest centre of two offset rectangular
+    lattices, which together form a hexagonal tiling. Returns the centres
+    of non-empty cells and their counts as (cx, cy, counts).
+    """
+    (x_lo, x_hi), (y_lo, y_hi) = x_range, y_range
+    # As in matplotlib's hexbin: fewer rows than columns for regular hexagons
+    rows = max(1, int(bins / np.sqrt(3)))
+    sx = (x_hi - x_lo) / bins
+    sy = (y_hi - y_lo) / rows
+    ix = (np.clip(x, x_lo, x_hi) - x_lo) / sx
+    iy = (np.clip(y, y_lo, y_hi) - y_lo) / sy
+
+    # Lattice 1 at integer nodes, lattice 2 offset by half a cell
+    i1, j1 = np.rint(ix), np.rint(iy)
+    i2, j2 = np.floor(ix) + 0.5, np.floor(iy) + 0.5
+    d1 = (ix - i1) ** 2 + 3.0 * (iy - j1) ** 2
+    d2 = (ix - i2) ** 2 + 3.0 * (iy - j2) ** 2
+    on_first = d1 <= d2
+    ci = np.where(on_first, i1, i2)
+    cj = np.where(on_first, j1, j2)
+
+    # Count per distinct centre; doubling makes the half-offsets integral
+    keys = np.stack([(2 * ci).astype(np.int64), (2 * cj).astype(np.int64)], axis=1)
+    centres, counts = np.unique(keys, axis=0, return_counts=True)
+    cx = x_lo + centres[:, 0] / 2.0 * sx
+    cy = y_lo + centres[:, 1] / 2.0 * sy
+    return cx, cy, counts
+
+
+def bin_means(x, y, edges):
+    """Mean of y and point count for each x bin defined by `edges`."""
+    k = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, len(edges) - 2)
+    counts = np.bincount(k, minlength=len(edges) - 1)
+    sums = np.bincount(k, weights=y, minlength=len(edges) - 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    return means, counts
+
+
+def summarize(x, y, bins=40, shape='grid'):
+    """
+    Binned summary of the scatter of y against x.
+
+    Returns a JSON-ready dict with the point count, Pearson and Spearman
+    coefficients, the regression line, per-x-bin means of y and the 2D
+    counts in the requested `shape`. Bin ranges cover the 0.5-99.5th
+    percentiles so a few extreme readings do not flatten the plot.
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown bin shape '{shape}'")
+    x, y = drop_missing(x, y)
+    summary = {
+        'n': int(len(x)),
+        'pearson': pearson(x, y),
+        'spearman': spearman(x, y),
+        'regression': linear_fit(x, y),
+    }
+    if not len(x):
+        return summary
+
+    x_range, y_range = robust_range(x), robust_range(y)
+    x_edges = np.linspace(*x_range, bins + 1)
+    means, counts = bin_means(np.clip(x, *x_range), y, x_edges)
+    summary['x_bins'] = {
+        'centers': ((x_edges[:-1] + x_edges[1:]) / 2).tolist(),
+        'mean_y': [None if np.isnan(m) else float(m) for m in means],
+        'count': counts.tolist(),
+    }
+
+    if shape == 'grid':
+        x_edges, y_edges, grid = grid_counts(x, y, bins, x_range, y_range)
+        summary['grid'] = {
+            'x_edges': x_edges.tolist(),
+            'y_edges': y_edges.tolist(),
+            'counts': grid.tolist(),
+        }
+    else:
+        cx, cy, hex_n = hex_counts(x, y, bins, x_range, y_range)
+        summary['hex'] = {
+            'x': cx.tolist(),
+            'y': cy.tolist(),
+            'counts': hex_n.tolist(),
+        }
+    return summary
@@ -0,0 +1,89 @@
+"""
+Time series downsampling for chart payloads.
+
+Both methods return the *indices* of the points to keep, so callers can
+select whole rows (timestamp, value, min/max, ...) rather than just (x, y).
+"""
+
+import numpy as np
+
+METHODS = ('lttb', 'minmax')
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, from each of the `n_out - 2`
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket. Spikes make large
+    triangles, so they survive.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("LTTB needs at least 3 output points")
+
+    # n_out - 2 buckets over the interior points [1, n - 1)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    counts = np.diff(edges)
+
+    # Bucket means via prefix sums; the bucket after the last one is the
+    # final point itself.
+    csum_x = np.concatenate(([0.0], np.cumsum(x)))
+    csum_y = np.concatenate(([0.0], np.cumsum(y)))
+    mean_x = (csum_x[edges[1:]] - csum_x[edges[:-1]]) / counts
+    mean_y = (csum_y[edges[1:]] - csum_y[edges[:-1]]) / counts
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for k in range(n_out - 2):
+        lo, hi = edges[k], edges[k + 1]
+        # Twice the triangle area; the constant factor does not change argmax
+        area = np.abs(
+            (x[a] - next_x[k]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (next_y[k] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[k + 1] = a
+
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """
+    Min/max-preserving downsampling.
+
+    Splits the series into `n_out // 2` equal buckets and keeps the minimum
+    and maximum of each, so every extreme value is guaranteed to appear.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+
+    buckets = max(1, n_out // 2)
+    bucket_id = (np.arange(n) * buckets) // n
+
+    # Sort by bucket, then by value: first/last of each run are min/max
+    order = np.lexsort((y, bucket_id))
+    ends = np.cumsum(np.bincount(bucket_id, minlength=buckets))
+    starts = ends - np.bincount(bucket_id, minlength=buckets)
+
+    return np.unique(np.concatenate((order[starts], order[ends - 1])))
+
+
+def downsample_indices(x, y, n_out, method='lttb'):
+    """Dispatch to one of METHODS; raises ValueError for unknown methods."""
+    if method == 'lttb':
+        return lttb_indices(x, y, n_out)
+    if method == 'minmax':
+        return minmax_indices(y, n_out)
+    raise ValueError(f"Unknown downsampling method '{method}'")
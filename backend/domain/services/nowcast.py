@@ -0,0 +1,66 @@
+"""
+EPA NowCast for PM2.5 and PM10.
+
+The NowCast of an hour is a weighted average of the 12 hours ending with
+it, newest first, with weights w^0, w^1, ... where w is the ratio of the
+lowest to the highest concentration in the window, floored at 0.5. Steady
+air averages over the whole half day, a sudden change is dominated by the
+last few hours. At least two of the three most recent hours must be
+measured; missing hours are skipped.
+
+`nowcast_series` slides the window over an hourly series as a whole, so
+each new hour costs one fixed-size window.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from backend.domain.services.aqi import TABLES
+
+WINDOW_HOURS = 12
+MIN_WEIGHT = 0.5
+POLLUTANTS = ('pm25', 'pm10')
+
+
+def nowcast_series(concentrations, pollutant='pm25'):
+    """
+    NowCast for every hour of a gap-free hourly series, oldest first.
+
+    Missing hours are None/NaN. The first 11 values see a partial window,
+    as if the hours before the series were missing. Results are truncated
+    to the precision of the pollutant's AQI table; NaN where the NowCast
+    is undefined.
+    """
+    c = np.asarray(concentrations, dtype=float)
+    if c.size == 0:
+        return c
+    padded = np.concatenate([np.full(WINDOW_HOURS - 1, np.nan), np.maximum(c, 0.0)])
+    # One row per hour, newest hour of the window first
+    windows = sliding_window_view(padded, WINDOW_HOURS)[:, ::-1]
+    valid = ~np.isnan(windows)
+
+    filled = np.where(valid, windows, 0.0)
+    c_max = filled.max(axis=1)
+    c_min = np.where(valid, windows, np.inf).min(axis=1)
+    ratio = np.divide(c_min, c_max, out=np.ones_like(c_max), where=c_max > 0)
+    weight = np.maximum(ratio, MIN_WEIGHT)
+
+    powers = weight[:, None] ** np.arange(WINDOW_HOURS) * valid
+    total = powers.sum(axis=1)
+    result = np.divide((powers * filled).sum(axis=1), total, out=np.full_like(total, np.nan), where=total > 0)
+
+    result[valid[:, :3].sum(axis=1) < 2] = np.nan
+    scale = 10.0 ** TABLES[pollutant].decimals
+    return np.floor(result * scale + 1e-6) / scale
+
+
+def nowcast(concentrations, pollutant='pm25'):
+    """
+    NowCast of the last hour of `concentrations` (oldest first), or None.
+
+    Only the last 12 values are used.
+    """
+    result = nowcast_series(list(concentrations)[-WINDOW_HOURS:], pollutant)
+    if result.size == 0 or np.isnan(result[-1]):
+        return None
+    return float(result[-1])
@@ -0,0 +1,68 @@
+"""
+Nearest-neighbour search on the sphere and inverse-distance blending.
+
+`SphereIndex` wraps scikit-learn's BallTree with the haversine metric, so
+a query visits O(log n) nodes for the stations of a region instead of
+measuring the distance to every one.
+"""
+
+import numpy as np
+from sklearn.neighbors import BallTree
+
+# Mean Earth radius (IUGG), km
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between points in degrees; broadcasts."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class SphereIndex:
+    """Haversine ball tree over latitude/longitude points in degrees."""
+
+    def __init__(self, lat, lon):
+        points = np.radians(np.column_stack([
+            np.asarray(lat, dtype=float).ravel(), np.asarray(lon, dtype=float).ravel(),
+        ]))
+        # BallTree cannot be built without points
+        self.tree = BallTree(points, metric='haversine') if len(points) else None
+        self.size = len(points)
+
+    def __len__(self):
+        return self.size
+
+    def nearest(self, lat, lon, k=1):
+        """
+        The `k` points nearest to (lat, lon), nearest first.
+
+        Returns ``(positions, distances_km)`` arrays; positions index the
+        points the index was built from.
+        """
+        k = min(int(k), len(self))
+        if k <= 0:
+            return np.array([], dtype=int), np.array([])
+        distances, positions = self.tree.query(np.radians([[lat, lon]]), k=k)
+        return positions[0], distances[0] * EARTH_RADIUS_KM
+
+
+def idw(distances_km, values, power=2.0):
+    """
+    Inverse-distance weighted blend of `values` at `distances_km`.
+
+    Missing values (None/NaN) are skipped; a value at distance zero is
+    returned as is. None when no value is available.
+    """
+    d = np.asarray(distances_km, dtype=float)
+    v = np.array([np.nan if value is None else value for value in values], dtype=float)
+    available = ~np.isnan(v)
+    if not available.any():
+        return None
+    d, v = d[available], v[available]
+    exact = d == 0
+    if exact.any():
+        return float(v[exact].mean())
+    weights = d ** -power
+    return float((weights * v).sum() / weights.sum())
@@ -0,0 +1,92 @@
+"""
+Mergeable summary statistics.
+
+`RunningStats` holds count, mean and the sum of squared deviations (M2),
+plus min/max and the first/last timestamp. Two accumulators combine
+exactly with Chan's parallel formula, so statistics kept per
+(parameter, year, season) cell can be merged into any coarser breakdown
+without touching the underlying rows.
+"""
+
+import math
+from collections import namedtuple
+
+from backend.domain.services import aqi
+
+# PM2.5 category labels, in the order of aqi.CATEGORIES
+PM25_LABELS = (
+    'Good',
+    'Moderate',
+    'Unhealthy for Sensitive',
+    'Unhealthy',
+    'Very Unhealthy',
+    'Hazardous',
+)
+
+
+def _pm25_categories():
+    # Highest concentration of each category, from the AQI engine's table
+    highest = {i_hi: c_hi for _, c_hi, _, i_hi in aqi.TABLES['pm25'].segments}
+    return tuple(
+        (label, None if upper is None else highest[upper])
+        for label, (_, upper) in zip(PM25_LABELS, aqi.CATEGORIES)
+    )
+
+
+# PM2.5 categories (US EPA) with their upper bounds in µg/m³, in order;
+# concentrations are truncated to PM25_DECIMALS places before comparing,
+# as `aqi.sub_index` does
+PM25_CATEGORIES = _pm25_categories()
+PM25_DECIMALS = aqi.TABLES['pm25'].decimals
+
+
+class RunningStats(namedtuple(
+    'RunningStats',
+    ['count', 'mean', 'm2', 'min', 'max', 'first', 'last'],
+    defaults=[0, 0.0, 0.0, None, None, None, None],
+)):
+    __slots__ = ()
+
+    def merge(self, other):
+        """Combine two accumulators (Chan et al.)."""
+        if not other.count:
+            return self
+        if not self.count:
+            return other
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return RunningStats(
+            count=count,
+            mean=self.mean + delta * other.count / count,
+            m2=self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+            min=min(self.min, other.min),
+            max=max(self.max, other.max),
+            first=_earliest(self.first, other.first),
+            last=_latest(self.last, other.last),
+        )
+
+    @property
+    def variance(self):
+        """Sample variance, like SQL STDDEV/VARIANCE; None below two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def std(self):
+        variance = self.variance
+        return math.sqrt(max(variance, 0.0)) if variance is not None else None
+
+
+def merge_all(accumulators):
+    """Merge an iterable of RunningStats into one."""
+    total = RunningStats()
+    for stats in accumulators:
+        total = total.merge(stats)
+    return total
+
+
+def _earliest(a, b):
+    return b if a is None else a if b is None else min(a, b)
+
+
+def _latest(a, b):
+    return b if a is None else a if b is None else max(a, b)
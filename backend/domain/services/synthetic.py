@@ -0,0 +1,228 @@
+"""
+Synthetic hourly air quality and weather series for load testing.
+
+Each city gets a temperature cycle (annual plus diurnal, in local time)
+with slow weather anomalies, and pollution driven by it the way the
+Astana data behaves:
+
+* heating season (October-April) PM2.5 two to three times the summer
+  level, growing with the cold;
+* morning (8-9) and evening (18-20) peaks of local time;
+* PM2.5 correlated with temperature at about r = -0.4 and diluted by wind.
+
+Anomalies and noise are AR(1) processes, so values persist from hour to
+hour like real readings do. Calendar columns follow unified_data: UTC
+hour and date, PostgreSQL day of week (0 is Sunday).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+City = namedtuple('City', [
+    'name', 'latitude', 'longitude', 'elevation_m', 'utc_offset',
+    'mean_temp', 'temp_swing', 'pm25_base',
+])
+
+# Mean annual temperature and half the January-July swing, °C; pm25_base
+# is the summer mean in µg/m³. Pollutants come in the units of aqi.UNITS.
+CITIES = (
+    City('Astana', 51.1694, 71.4491, 347, 5, 3.5, 17.5, 8.0),
+    City('Almaty', 43.2389, 76.8897, 800, 5, 10.0, 14.0, 14.0),
+    City('Shymkent', 42.3417, 69.5901, 500, 5, 13.0, 14.5, 11.0),
+    City('Karaganda', 49.8047, 73.1094, 550, 5, 3.5, 17.0, 10.0),
+    City('Aktobe', 50.2839, 57.1670, 220, 5, 5.0, 18.0, 7.0),
+    City('Pavlodar', 52.2873, 76.9674, 125, 5, 3.0, 19.0, 9.0),
+    City('Oskemen', 49.9483, 82.6275, 290, 5, 3.0, 19.5, 12.0),
+    City('Semey', 50.4111, 80.2275, 200, 5, 3.5, 19.0, 9.0),
+    City('Kostanay', 53.2144, 63.6246, 170, 5, 3.0, 18.5, 7.0),
+    City('Atyrau', 47.0945, 51.9238, -20, 5, 8.5, 17.0, 8.0),
+    City('Taraz', 42.9000, 71.3667, 620, 5, 10.0, 13.5, 10.0),
+    City('Kyzylorda', 44.8479, 65.4999, 130, 5, 10.5, 16.5, 9.0),
+)
+
+POLLUTANTS = ('pm25', 'pm10', 'no2', 'o3', 'so2', 'co')
+
+HEATING_MONTHS = (10, 11, 12, 1, 2, 3, 4)
+
+SEASONS = {12: 'winter', 1: 'winter', 2: 'winter', 3: 'spring', 4: 'spring', 5: 'spring',
+           6: 'summer', 7: 'summer', 8: 'summer', 9: 'autumn', 10: 'autumn', 11: 'autumn'}
+
+# Weights of unified_data.completeness_score, as normalize_data.py builds it
+COMPLETENESS = {'pm25': 0.3, 'temperature_c': 0.2, 'humidity_pct': 0.15,
+                'wind_speed_ms': 0.15, 'pressure_hpa': 0.1, 'pm10': 0.1}
+
+# Share of hours lost to monitor outages, and their mean length in hours
+OUTAGE_SHARE = 0.05
+OUTAGE_HOURS = 36
+
+
+def cities(n, rng=None):
+    """
+    `n` cities: the built-in ones first, then made-up ones.
+
+    Made-up cities are spread over the same latitudes with a climate
+    following them, named 'City 13', 'City 14', ...
+    """
+    chosen = list(CITIES[:n])
+    rng = rng if rng is not None else np.random.default_rng(0)
+    for k in range(len(CITIES) + 1, n + 1):
+        lat = rng.uniform(41.0, 54.0)
+        chosen.append(City(
+            f'City {k}', round(lat, 4), round(rng.uniform(50.0, 85.0), 4),
+            int(rng.uniform(0, 900)), 5,
+            round(38.0 - 0.68 * lat + rng.normal(0, 1), 1),
+            round(0.4 * lat - 3.0 + rng.normal(0, 1), 1),
+            round(rng.uniform(6.0, 15.0), 1),
+        ))
+    return chosen
+
+
+def ar1(shocks, phi, start=0.0, block=64):
+    """
+    AR(1) process x[t] = phi * x[t-1] + shocks[t] from x[-1] = `start`.
+
+    Solved in closed form a block at a time: within a block
+    x[t] = phi^t * (start + cumsum(shocks / phi^k)), with blocks short
+    enough that phi^-k stays well inside float range.
+    """
+    shocks = np.asarray(shocks, dtype=float)
+    out = np.empty_like(shocks)
+    powers = phi ** np.arange(1, block + 1)
+    prev = start
+    for i in range(0, len(shocks), block):
+        chunk = shocks[i:i + block]
+        p = powers[:len(chunk)]
+        out[i:i + block] = p * (prev + np.cumsum(chunk / p))
+        prev = out[i + len(chunk) - 1]
+    return out
+
+
+def anomaly(rng, n, phi, sd):
+    """Stationary AR(1) noise of standard deviation `sd`."""
+    start = rng.normal(0.0, sd)
+    return ar1(rng.normal(0.0, sd * np.sqrt(1 - phi * phi), n), phi, start)
+
+
+def outages(rng, n, share=OUTAGE_SHARE, mean_hours=OUTAGE_HOURS):
+    """Boolean mask of hours inside monitor outages."""
+    starts = np.flatnonzero(rng.random(n) < share / mean_hours)
+    lengths = rng.geometric(1.0 / mean_hours, len(starts))
+    edges = np.zeros(n + 1, dtype=int)
+    np.add.at(edges, starts, 1)
+    np.add.at(edges, np.minimum(starts + lengths, n), -1)
+    return np.cumsum(edges[:-1]) > 0
+
+
+def _peak(hours, center, width):
+    """Bell curve over the hour of day, wrapping around midnight."""
+    distance = (hours - center + 12) % 24 - 12
+    return np.exp(-0.5 * (distance / width) ** 2)
+
+
+def calendar(timestamps):
+    """unified_data's temporal columns of UTC `timestamps` (a DatetimeIndex)."""
+    month = timestamps.month.to_numpy()
+    # pandas counts Monday as 0, PostgreSQL's DOW Sunday
+    dow = (timestamps.dayofweek.to_numpy() + 1) % 7
+    return {
+        'hour': timestamps.hour.to_numpy(),
+        'day_of_week': dow,
+        'day_of_month': timestamps.day.to_numpy(),
+        'month': month,
+        'season': pd.Series(month).map(SEASONS).to_numpy(),
+        'is_weekend': np.isin(dow, (0, 6)),
+        'is_heating_season': np.isin(month, HEATING_MONTHS),
+    }
+
+
+def generate(city, start, end, rng):
+    """
+    Hourly series of `city` over [start, end) as a DataFrame.
+
+    Has every unified_data column plus the weather table's extra ones;
+    pollutants are NaN during outages.
+    """
+    timestamps = pd.date_range(start, end, freq='h', inclusive='left')
+    n = len(timestamps)
+    local = timestamps + pd.Timedelta(hours=city.utc_offset)
+    hour = local.hour.to_numpy() + 0.5
+    weekday = local.dayofweek.to_numpy()
+    # 1 in mid-January, -1 in mid-July
+    winter = np.cos(2 * np.pi * (local.dayofyear.to_numpy() - 15) / 365.25)
+    heating = np.isin(local.month.to_numpy(), HEATING_MONTHS)
+
+    # Weather
+    diurnal = np.cos(2 * np.pi * (hour - 15) / 24)
+    temp_anomaly = anomaly(rng, n, 0.985, 4.0) * (1 + 0.35 * winter)
+    temperature = city.mean_temp - city.temp_swing * winter + (4.0 - winter) * diurnal + temp_anomaly
+    humidity = np.clip(
+        68 + 10 * winter - 8 * diurnal - 1.2 * temp_anomaly + anomaly(rng, n, 0.95, 8.0), 12, 100,
+    )
+    wind = np.clip(np.exp(np.log(3.5) + anomaly(rng, n, 0.95, 0.4)), 0.3, 20) * (1 + 0.25 * _peak(hour, 14, 3))
+    gust = wind * (1.4 + 0.3 * rng.random(n))
+    direction = (230 + anomaly(rng, n, 0.97, 70.0)) % 360
+    pressure_msl = 1013 + 9 * winter - 0.3 * temp_anomaly + anomaly(rng, n, 0.99, 7.0)
+    pressure = pressure_msl - city.elevation_m / 8.3
+    wet = anomaly(rng, n, 0.9, 1.0)
+    precipitation = np.round(np.maximum(wet - 1.5, 0) * 1.2, 1)
+    snowing = (precipitation > 0) & (temperature < 0.5)
+    cloud = np.clip(55 + 12 * winter + 30 * anomaly(rng, n, 0.95, 1.0) + 40 * (precipitation > 0), 0, 100)
+    dew_point = temperature - (100 - humidity) / 5
+    feels_like = np.where(
+        temperature < 10, 13.12 + 0.6215 * temperature - 11.37 * (wind * 3.6) ** 0.16
+        + 0.3965 * temperature * (wind * 3.6) ** 0.16, temperature,
+    )
+    weather_code = np.select(
+        [snowing, precipitation > 2, precipitation > 0, cloud > 85, cloud > 50],
+        [73, 63, 61, 3, 2], 0,
+    )
+
+    # Pollution: heating load grows with the cold, traffic peaks at rush
+    # hours on weekdays, and wind dilutes both
+    cold = np.clip((16 - temperature) / 30, 0.1, 1.3)
+    rush = 0.45 * _peak(hour, 8.5, 1.3) + 0.55 * _peak(hour, 19, 1.6)
+    traffic = np.where(weekday >= 5, 0.7, 1.0) * (0.6 + rush)
+    dilution = np.exp(-0.12 * (wind - 3.5))
+    log_pm25 = (
+        np.log(city.pm25_base) + np.log1p(2.0 * heating * cold)
+        + 0.55 * rush - 0.2 * _peak(hour, 14, 2.5) + anomaly(rng, n, 0.93, 0.6)
+    )
+    pm25 = np.exp(log_pm25) * dilution
+    pm10 = pm25 * (1.5 + 0.4 * (winter < 0)) * np.exp(anomaly(rng, n, 0.9, 0.15))
+    no2 = 22 * traffic * (1 + 0.3 * heating) * dilution * np.exp(anomaly(rng, n, 0.9, 0.3))
+    sun = np.clip(np.cos(2 * np.pi * (hour - 13.5) / 24), 0, None) * (1 - 0.5 * winter)
+    o3 = np.clip(35 + 45 * sun - 0.5 * no2 + anomaly(rng, n, 0.95, 8.0), 2, None)
+    so2 = (4 + 22 * heating * cold) * dilution * np.exp(anomaly(rng, n, 0.9, 0.35))
+    co = (0.25 + 0.6 * heating * cold + 0.25 * traffic) * dilution * np.exp(anomaly(rng, n, 0.9, 0.25))
+
+    pollutants = {'pm25': pm25, 'pm10': pm10, 'no2': no2, 'o3': o3, 'so2': so2, 'co': co}
+    down = outages(rng, n)
+    for name, values in pollutants.items():
+        pollutants[name] = np.where(down, np.nan, np.round(values, 3 if name == 'co' else 2))
+
+    frame = pd.DataFrame({
+        'timestamp_utc': timestamps,
+        'location': city.name,
+        **pollutants,
+        'temperature_c': np.round(temperature, 1),
+        'humidity_pct': np.round(humidity),
+        'pressure_hpa': np.round(pressure, 1),
+        'wind_speed_ms': np.round(wind, 1),
+        'wind_direction_deg': np.round(direction),
+        'precipitation_mm': precipitation,
+        'cloud_cover_pct': np.round(cloud),
+        **calendar(timestamps),
+        'feels_like_c': np.round(feels_like, 1),
+        'dew_point_c': np.round(dew_point, 1),
+        'rain_mm': np.where(snowing, 0.0, precipitation),
+        'snow_cm': np.round(np.where(snowing, precipitation * 0.7, 0.0), 2),
+        'pressure_msl_hpa': np.round(pressure_msl, 1),
+        'wind_gust_ms': np.round(gust, 1),
+        'weather_code': weather_code,
+    })
+    frame['completeness_score'] = np.round(
+        sum(weight * frame[column].notna() for column, weight in COMPLETENESS.items()), 2,
+    )
+    return frame
@@ -0,0 +1,228 @@
+"""
+Single-flight computation of cache misses.
+
+When an entry is missing or was just invalidated, concurrent requests for
+it would each run the same aggregate query. `run` (`arun` for coroutines)
+lets the first caller of a key compute it while the others wait for its
+payload: threads and coroutines of one process wait on the computation in
+flight, other worker processes on a lock in the shared ``api`` cache,
+polling until the leader has stored the entry. Waits are bounded by
+API_COALESCE_TIMEOUT seconds; a waiter that times out, or whose leader
+failed or produced nothing cacheable, computes the response itself.
+
+A computation that asks for its own key again (a coroutine view handing
+over to the sync view through ``sync_to_async``, which carries context
+variables along) runs it directly instead of waiting on itself.
+"""
+
+import asyncio
+import contextvars
+import math
+import threading
+import time
+import uuid
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+
+from backend.infrastructure.cache import response_cache
+
+# Seconds between checks of the shared cache while another worker computes
+POLL_INTERVAL = 0.05
+
+
+class _Flight:
+    """A computation in progress; `payload` is set before `done`."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.payload = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+# Futures of coroutine leaders, per event loop
+_async_flights = weakref.WeakKeyDictionary()
+
+
+# Keys whose computation the current context is running
+_leading = contextvars.ContextVar('coalescing_leading', default=frozenset())
+
+
+def wait_timeout():
+    return getattr(settings, 'API_COALESCE_TIMEOUT', 30)
+
+
+def join(key, compute, timeout):
+    """
+    Run `compute()` once for concurrent callers of `key` in this process.
+
+    `compute` returns ``(result, payload)``. The caller running it gets both
+    back; callers arriving meanwhile wait up to `timeout` seconds and get
+    ``(None, payload)``. A None payload (an error or an uncacheable result)
+    sends them to run `compute` themselves.
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+    if not leader:
+        if flight.done.wait(timeout) and flight.payload is not None:
+            response_cache.record('coalesced')
+            return None, flight.payload
+        return compute()
+    try:
+        result, flight.payload = compute()
+        return result, flight.payload
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+
+
+async def ajoin(key, compute, timeout):
+    """`join` for coroutine callers of one event loop; `compute` is async."""
+    loop = asyncio.get_running_loop()
+    flights = _async_flights.setdefault(loop, {})
+    future = flights.get(key)
+    if future is not None:
+        try:
+            payload = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            payload = None
+        if payload is not None:
+            response_cache.record('coalesced')
+            return None, payload
+        return await compute()
+    future = flights[key] = loop.create_future()
+    payload = None
+    try:
+        result, payload = await compute()
+        return result, payload
+    finally:
+        del flights[key]
+        future.set_result(payload)
+
+
+def _shared():
+    # A process-local cache has no other workers to coordinate with
+    return not isinstance(response_cache.get_cache(), LocMemCache)
+
+
+def _acquire(key, token, timeout):
+    return response_cache.get_cache().add(f'lock:{key}', token, timeout=math.ceil(timeout))
+
+
+def _release(key, token):
+    cache = response_cache.get_cache()
+    # Past its timeout the lock may belong to another worker by now
+    if cache.get(f'lock:{key}') == token:
+        cache.delete(f'lock:{key}')
+
+
+def _stored(key):
+    payload = response_cache.lookup(key, count=False)
+    if payload is not None:
+        response_cache.record('coalesced')
+    return payload
+
+
+def _locked(key, compute, timeout):
+    """Run `compute` under the shared lock of `key`, or take the payload its holder stores."""
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + timeout
+    contended = False
+    while not _acquire(key, token, timeout):
+        contended = True
+        payload = _stored(key)
+        if payload is not None:
+            return None, payload
+        if time.monotonic() >= deadline:
+            return compute()
+        time.sleep(POLL_INTERVAL)
+    try:
+        # The previous holder may have stored it just before releasing
+        payload = _stored(key) if contended else None
+        return (None, payload) if payload is not None else compute()
+    finally:
+        _release(key, token)
+
+
+async def _alocked(key, compute, timeout):
+    """
+    `_locked` for coroutine views.
+
+    The shared cache is a file or Redis backend, whose calls block; they
+    run in worker threads so the other coroutines of the loop carry on.
+    """
+    acquire, stored, release = (
+        sync_to_async(func, thread_sensitive=False) for func in (_acquire, _stored, _release)
+    )
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + timeout
+    contended = False
+    while not await acquire(key, token, timeout):
+        contended = True
+        payload = await stored(key)
+        if payload is not None:
+            return None, payload
+        if time.monotonic() >= deadline:
+            return await compute()
+        await asyncio.sleep(POLL_INTERVAL)
+    try:
+        payload = await stored(key) if contended else None
+        return (None, payload) if payload is not None else await compute()
+    finally:
+        await release(key, token)
+
+
+def _leading_call(key, compute):
+    """`compute` marked as the current context's computation of `key`."""
+    def call():
+        token = _leading.set(_leading.get() | {key})
+        try:
+            return compute()
+        finally:
+            _leading.reset(token)
+    return call
+
+
+def _aleading_call(key, compute):
+    async def call():
+        token = _leading.set(_leading.get() | {key})
+        try:
+            return await compute()
+        finally:
+            _leading.reset(token)
+    return call
+
+
+def run(key, compute):
+    """
+    Compute the entry `key` once across threads and workers.
+
+    Returns ``(result, payload)`` as `join` does: a None result means the
+    payload was computed by another request.
+    """
+    timeout = wait_timeout()
+    if timeout <= 0 or key in _leading.get():
+        return compute()
+    compute = _leading_call(key, compute)
+    if _shared():
+        return join(key, lambda: _locked(key, compute, timeout), timeout)
+    return join(key, compute, timeout)
+
+
+async def arun(key, compute):
+    """`run` for coroutine views; `compute` is async."""
+    timeout = wait_timeout()
+    if timeout <= 0 or key in _leading.get():
+        return await compute()
+    compute = _aleading_call(key, compute)
+    if _shared():
+        return await ajoin(key, lambda: _alocked(key, compute, timeout), timeout)
+    return await ajoin(key, compute, timeout)
@@ -0,0 +1,210 @@
+"""
+Shared cache for API responses with time-range invalidation.
+
+Entries live in the ``api`` cache alias (local memory, file or Redis, see
+settings). Every entry records the time range its response was computed
+from as a set of generation counters: one per calendar month it covers,
+``tail`` if the range is open-ended (a "last N days" window) and ``all`` if
+it spans the whole history. Ingestion bumps the counters of the months it
+wrote, so only entries overlapping that range stop validating; everything
+else keeps being served.
+"""
+
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+CACHE_ALIAS = 'api'
+
+ALL = 'gen:all'
+TAIL = 'gen:tail'
+# Every entry depends on this one; bumped when the whole history is rebuilt
+BASE = 'gen:base'
+
+_counters = Counter()
+_counters_lock = threading.Lock()
+
+# Last data version this process has applied to a process-local cache
+_seen_version = None
+_seen_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def make_key(endpoint, params, media_type=None):
+    """
+    Cache key for an endpoint and its query parameters.
+
+    Parameters are sorted and stripped and empty values dropped, so
+    ``?b=1&a=2`` and ``?a=2&b=1&c=`` share an entry.
+    """
+    items = sorted(
+        (name, value.strip())
+        for name, values in params.lists()
+        for value in values
+        if value.strip()
+    )
+    digest = hashlib.md5(repr((items, media_type)).encode()).hexdigest()
+    return f'resp:{endpoint}:{digest}'
+
+
+def month_keys(start, end):
+    """Generation keys for every calendar month from start to end, inclusive."""
+    keys = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        keys.append(f'gen:{year:04d}-{month:02d}')
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return keys
+
+
+def dependency_keys(time_range, latest=None):
+    """
+    Generation keys an entry covering `time_range` depends on.
+
+    `time_range` is None for whole-history responses, otherwise
+    ``(start, end)``; ``end=None`` means "up to the newest data", which is
+    `latest` (the data version's latest timestamp).
+    """
+    if time_range is None:
+        return [BASE, ALL]
+    start, end = time_range
+    keys = [BASE] + month_keys(start, end or latest or start)
+    if end is None:
+        keys.append(TAIL)
+    return keys
+
+
+def _initial_generation():
+    # Not 0: a counter evicted and re-created must never repeat a value an
+    # older entry may have recorded.
+    return time.time_ns()
+
+
+def generations(keys):
+    """Current value of each generation counter, creating missing ones."""
+    cache = get_cache()
+    values = cache.get_many(keys)
+    missing = [key for key in keys if key not in values]
+    if missing:
+        for key in missing:
+            cache.add(key, _initial_generation(), timeout=None)
+        values.update(cache.get_many(missing))
+    return values
+
+
+def _bump(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_generation(), timeout=None)
+
+
+def invalidate(start=None, end=None, extends=True):
+    """
+    Drop cached responses overlapping [start, end].
+
+    `extends` says the batch wrote past the previous newest timestamp, which
+    also moves every open-ended "last N days" window. Without bounds every
+    entry is dropped.
+    """
+    cache = get_cache()
+    if start is None or end is None:
+        keys = [ALL, BASE]
+    else:
+        keys = [ALL] + month_keys(start, end)
+        if extends:
+            keys.append(TAIL)
+    for key in keys:
+        _bump(cache, key)
+
+
+def sync(data_version):
+    """
+    Replay invalidations made by other processes on a process-local cache.
+
+    Shared backends (file, Redis) are invalidated directly by the ingesting
+    process. A local-memory cache is not, so each process compares the data
+    version with the last one it saw: one step means the recorded batch
+    range is invalidated, a larger jump drops everything.
+    """
+    global _seen_version
+    if data_version is None or not isinstance(get_cache(), LocMemCache):
+        return
+    with _seen_lock:
+        seen, _seen_version = _seen_version, data_version.version
+    if seen is None or seen == data_version.version:
+        return
+    if data_version.version == seen + 1:
+        invalidate(data_version.batch_start, data_version.batch_end, data_version.batch_extends)
+    else:
+        invalidate()
+
+
+def current_epoch():
+    """Counter that changes with every invalidation (see `store`)."""
+    return generations([ALL])[ALL]
+
+
+def lookup(key, count=True):
+    """
+    Cached payload for `key`, or None if missing or invalidated.
+
+    `count=False` leaves the hit/miss counters alone (for repeated checks
+    while another request computes the entry).
+    """
+    entry = get_cache().get(key)
+    if entry is not None:
+        current = get_cache().get_many(list(entry['generations']))
+        if current == entry['generations']:
+            if count:
+                record('hits')
+            return entry['payload']
+    if count:
+        record('misses')
+    return None
+
+
+def store(key, payload, time_range, latest, epoch):
+    """
+    Cache `payload` for the range it was computed from.
+
+    `epoch` is `current_epoch()` read before computing the payload; if an
+    ingestion batch landed in between the payload may be stale and is not
+    stored.
+    """
+    dependencies = generations(dependency_keys(time_range, latest))
+    latest_epoch = dependencies[ALL] if ALL in dependencies else current_epoch()
+    if latest_epoch != epoch:
+        return
+    get_cache().set(key, {'generations': dependencies, 'payload': payload})
+    record('stores')
+
+
+def record(event):
+    with _counters_lock:
+        _counters[event] += 1
+
+
+def cache_stats():
+    """
+    Hit/miss counters of this process; `coalesced` counts misses answered
+    with the payload another request computed.
+    """
+    with _counters_lock:
+        counters = dict(_counters)
+    hits, misses = counters.get('hits', 0), counters.get('misses', 0)
+    return {
+        'backend': get_cache().__class__.__name__,
+        'hits': hits,
+        'misses': misses,
+        'stores': counters.get('stores', 0),
+        'coalesced': counters.get('coalesced', 0),
+        'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else None,
+    }
@@ -0,0 +1,107 @@
+"""
+Async PostgreSQL connection pool for the coroutine data views.
+
+A psycopg ``AsyncConnectionPool`` is opened on first use in each event loop
+with the credentials of ``DATABASES['default']`` and the sizes in the
+``ASYNC_DB_POOL`` setting. A request waiting on PostgreSQL holds a pooled
+connection, not a worker, so one process can serve many concurrent
+clients. The SQL is the same the sync views run: ``%s`` and ``%(name)s``
+placeholders work unchanged.
+"""
+
+import asyncio
+import time
+from weakref import WeakKeyDictionary
+
+from django.conf import settings
+
+from backend.infrastructure import metrics
+from backend.infrastructure.database.cursors import json_rows_sql
+
+try:
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:  # pragma: no cover - optional dependency
+    AsyncConnectionPool = None
+
+# One pool per event loop; a pool cannot be shared across loops
+_pools = WeakKeyDictionary()
+
+
+def connection_kwargs(alias='default'):
+    """psycopg connection arguments for a Django database alias."""
+    db = settings.DATABASES[alias]
+    kwargs = {
+        'dbname': db.get('NAME'),
+        'user': db.get('USER'),
+        'password': db.get('PASSWORD'),
+        'host': db.get('HOST'),
+        'port': db.get('PORT'),
+    }
+    kwargs = {key: value for key, value in kwargs.items() if value}
+    # Autocommit, as Django's connections: read-only queries need no transaction
+    kwargs['autocommit'] = True
+    return kwargs
+
+
+async def get_pool():
+    """The pool of the running event loop, opened on first use."""
+    if AsyncConnectionPool is None:
+        raise RuntimeError("The async views need psycopg with the pool extra (psycopg[pool])")
+
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        options = settings.ASYNC_DB_POOL
+        pool = AsyncConnectionPool(
+            kwargs=connection_kwargs(),
+            min_size=options['min_size'],
+            max_size=options['max_size'],
+            timeout=options['timeout'],
+            name='aaqis-async',
+            open=False,
+        )
+        _pools[loop] = pool
+        # Opening does not wait for connections, so concurrent first
+        # requests queue on the pool instead of opening a second one
+        await pool.open()
+    return pool
+
+
+def open_pools():
+    """The async pools of this process (one per event loop that used one)."""
+    return list(_pools.values())
+
+
+async def close_pool():
+    """Close the pool of the running event loop, if any."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
+
+
+async def fetchall(sql, params=None):
+    """Run `sql` on a pooled connection and return all rows."""
+    pool = await get_pool()
+    async with pool.connection() as conn:
+        start = time.perf_counter()
+        cursor = await conn.execute(sql, params)
+        rows = await cursor.fetchall()
+        metrics.record_query(time.perf_counter() - start)
+        return rows
+
+
+async def fetchone(sql, params=None):
+    """Run `sql` on a pooled connection and return the first row, or None."""
+    pool = await get_pool()
+    async with pool.connection() as conn:
+        start = time.perf_counter()
+        cursor = await conn.execute(sql, params)
+        row = await cursor.fetchone()
+        metrics.record_query(time.perf_counter() - start)
+        return row
+
+
+async def fetch_json_rows(sql, order_by, params=None, columns=None):
+    """`cursors.fetch_json_rows` on a pooled connection."""
+    row = await fetchone(json_rows_sql(sql, order_by, columns), params)
+    return row[0]
@@ -0,0 +1,56 @@
+"""
+Cursor helpers for large result sets.
+"""
+
+from django.db import connection, transaction
+
+# Rows fetched per round-trip when streaming
+STREAM_BATCH_SIZE = 2000
+
+
+def iter_batches(sql, params=None, batch_size=STREAM_BATCH_SIZE):
+    """
+    Yield lists of at most `batch_size` rows from a named (server-side) cursor.
+
+    The cursor lives inside a transaction so PostgreSQL produces rows lazily;
+    a holdable cursor (what autocommit would give us) materializes the whole
+    result before the first fetch.
+    """
+    with transaction.atomic(), connection.chunked_cursor() as cursor:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+
+
+def json_rows_sql(sql, order_by, columns=None):
+    """
+    Wrap `sql` so it returns its rows as the text of one JSON array.
+
+    The array is sorted by `order_by`, an ORDER BY list over the columns of
+    `sql`: string_agg is not bound to the order of its input, so an ORDER BY
+    inside `sql` is not enough. `columns` limits the objects to those
+    columns, which lets `sql` select sort keys that are not returned.
+    """
+    # A record of just `columns`, serialized under their names
+    row = f"(SELECT r FROM (SELECT {', '.join(f'q.{c}' for c in columns)}) r)" if columns else "q"
+    # Text, not json, so the driver does not parse it back into objects
+    return f"""
+        SELECT COALESCE('[' || string_agg(row_to_json({row})::text, ',' ORDER BY {order_by}) || ']', '[]')
+        FROM ({sql}) q
+    """
+
+
+def fetch_json_rows(sql, order_by, params=None, columns=None):
+    """
+    Run `sql` and return its rows as the text of a JSON array of objects.
+
+    PostgreSQL builds the JSON (keys are the column names, timestamps come
+    out in ISO 8601 like ``datetime.isoformat()``), so no Python object is
+    created per cell. See `json_rows_sql` for `order_by` and `columns`.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(json_rows_sql(sql, order_by, columns), params)
+        return cursor.fetchone()[0]
@@ -0,0 +1,88 @@
+"""
+Global data version for unified_data.
+
+A single-row table holds a counter that every ingestion batch bumps, the
+time of the bump, the newest timestamp loaded so far and the range of the
+last batch. Reading it is a primary-key lookup, so request handlers can use
+it to validate cached responses without querying unified_data.
+"""
+
+from collections import namedtuple
+
+from django.db import ProgrammingError, connection, transaction
+from psycopg import errors
+
+from backend.infrastructure.database import async_pool
+
+DataVersion = namedtuple('DataVersion', [
+    'version', 'updated_at', 'latest_timestamp',
+    'batch_start', 'batch_end', 'batch_extends',
+])
+
+
+DATA_VERSION_SQL = """
+    SELECT version, updated_at, latest_timestamp,
+           batch_start, batch_end, batch_extends
+    FROM data_version
+    WHERE id = 1
+"""
+
+
+def _fetch_data_version():
+    with connection.cursor() as cursor:
+        cursor.execute(DATA_VERSION_SQL)
+        return cursor.fetchone()
+
+
+def get_data_version():
+    """Current DataVersion, or None if the table has not been created."""
+    try:
+        if connection.in_atomic_block:
+            # A savepoint keeps the failed query from aborting the caller's transaction
+            with transaction.atomic():
+                row = _fetch_data_version()
+        else:
+            row = _fetch_data_version()
+    except ProgrammingError as exc:
+        if not isinstance(exc.__cause__, errors.UndefinedTable):
+            raise
+        return None
+    return DataVersion(*row) if row else None
+
+
+async def aget_data_version():
+    """`get_data_version` on the async connection pool."""
+    try:
+        row = await async_pool.fetchone(DATA_VERSION_SQL)
+    except errors.UndefinedTable:
+        return None
+    return DataVersion(*row) if row else None
+
+
+def bump_data_version(cursor, start=None, end=None):
+    """
+    Advance the version after a batch covering [start, end].
+
+    Returns whether the batch extended the data past the previous newest
+    timestamp (always True for a full rebuild without bounds).
+    """
+    # The right-hand sides all see the row as it was before the update
+    cursor.execute("""
+        UPDATE data_version
+        SET version = version + 1,
+            updated_at = NOW(),
+            latest_timestamp = CASE
+                WHEN %(end)s::timestamp IS NULL
+                    THEN (SELECT MAX(timestamp_utc) FROM unified_data)
+                ELSE GREATEST(latest_timestamp, %(end)s::timestamp)
+            END,
+            batch_start = %(start)s::timestamp,
+            batch_end = %(end)s::timestamp,
+            batch_extends = %(end)s::timestamp IS NULL
+                OR latest_timestamp IS NULL
+                OR %(end)s::timestamp > latest_timestamp
+        WHERE id = 1
+        RETURNING batch_extends
+    """, {'start': start, 'end': end})
+    row = cursor.fetchone()
+    return row[0] if row else True
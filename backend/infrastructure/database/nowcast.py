@@ -0,0 +1,90 @@
+"""
+NowCast PM2.5/PM10 of every hour of unified_data, per location.
+
+unified_data_nowcast holds one row per location and hour with readings,
+each computed from that location's own series. An ingestion batch changes
+the NowCast of its own hours and of the 11 hours after it, so a refresh
+reads the 11 hours before the batch for context and rewrites only those
+hours: one new hour costs one 12-hour window per location, and the current
+reading is a primary-key lookup.
+"""
+
+from datetime import timedelta
+from itertools import groupby
+from operator import itemgetter
+
+import numpy as np
+
+from backend.domain.services.nowcast import POLLUTANTS, WINDOW_HOURS, nowcast_series
+
+CONTEXT = timedelta(hours=WINDOW_HOURS - 1)
+
+
+def _series(cursor, start, end):
+    """
+    Gap-free hourly series of [start, end] per location with a flag for hours in unified_data.
+
+    Rows are (location, hour, present, *POLLUTANTS), ordered by location and
+    hour; each location's series spans its own first to last reading.
+    """
+    where = "location IS NOT NULL"
+    if start is not None:
+        where += " AND timestamp_utc BETWEEN %(start)s AND %(end)s"
+    averages = ', '.join(f'AVG({p}) AS {p}' for p in POLLUTANTS)
+    cursor.execute(f"""
+        WITH hourly AS (
+            SELECT location, timestamp_utc, {averages}
+            FROM unified_data
+            WHERE {where}
+            GROUP BY location, timestamp_utc
+        ),
+        bounds AS (
+            SELECT location,
+                   date_trunc('hour', MIN(timestamp_utc)) AS lo,
+                   date_trunc('hour', MAX(timestamp_utc)) AS hi
+            FROM hourly
+            GROUP BY location
+        )
+        SELECT b.location, g.hour, h.timestamp_utc IS NOT NULL, {', '.join(f'h.{p}' for p in POLLUTANTS)}
+        FROM bounds b
+        CROSS JOIN LATERAL generate_series(b.lo, b.hi, INTERVAL '1 hour') AS g(hour)
+        LEFT JOIN hourly h ON h.location = b.location AND h.timestamp_utc = g.hour
+        ORDER BY b.location, g.hour
+    """, {'start': start, 'end': end})
+    return cursor.fetchall()
+
+
+def refresh_nowcast(cursor, start=None, end=None):
+    """
+    Recompute the NowCast of hours whose window overlaps [start, end].
+
+    Without bounds every hour is rebuilt.
+    """
+    if start is None or end is None:
+        cursor.execute("TRUNCATE unified_data_nowcast")
+        rows = _series(cursor, None, None)
+        first = None
+    else:
+        rows = _series(cursor, start - CONTEXT, end + CONTEXT)
+        first = start
+        cursor.execute("""
+            DELETE FROM unified_data_nowcast
+            WHERE timestamp_utc BETWEEN %(start)s AND %(end)s
+        """, {'start': start, 'end': end + CONTEXT})
+
+    values = []
+    for location, group in groupby(rows, key=itemgetter(0)):
+        group = list(group)
+        series = [nowcast_series([row[3 + k] for row in group], p) for k, p in enumerate(POLLUTANTS)]
+        values += [
+            (location, hour, *(None if np.isnan(column[i]) else float(column[i]) for column in series))
+            for i, (_, hour, present, *_) in enumerate(group)
+            if present and (first is None or hour >= first)
+        ]
+    if not values:
+        return
+
+    cursor.executemany(f"""
+        INSERT INTO unified_data_nowcast (location, timestamp_utc, {', '.join(POLLUTANTS)})
+        VALUES (%s, %s, {', '.join(['%s'] * len(POLLUTANTS))})
+    """, values)
@@ -0,0 +1,125 @@
+"""
+Yearly range partitions of unified_data.
+
+unified_data is partitioned by ``timestamp_utc`` into one table per
+calendar year (``unified_data_y2024`` holds 2024) plus a default partition
+that catches rows no year partition covers yet. Queries bounded in time
+only touch the partitions of their range. Partitions for the coming years
+are created ahead of time by the ``maintain_partitions`` command; rows
+that already landed in the default partition are moved into the new one.
+"""
+
+from datetime import date, datetime
+
+PARENT = 'unified_data'
+DEFAULT_PARTITION = 'unified_data_default'
+PARTITION_PREFIX = 'unified_data_y'
+
+# Indexes of the partitioned table, inherited by every partition. BRIN
+# serves time ranges at a tiny size (16 pages is about a month of hourly
+# rows per city); the partial B-tree serves "latest reading" lookups,
+# which BRIN cannot order.
+INDEXES = (
+    f"""CREATE INDEX IF NOT EXISTS unified_data_timestamp_brin ON {PARENT}
+        USING brin (timestamp_utc) WITH (pages_per_range = 16, autosummarize = on)""",
+    f"""CREATE INDEX IF NOT EXISTS unified_data_latest_pm25_idx ON {PARENT}
+        (timestamp_utc) WHERE pm25 IS NOT NULL""",
+)
+
+
+def partition_name(year):
+    return f'{PARTITION_PREFIX}{int(year)}'
+
+
+def table_exists(cursor, name=PARENT):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+    return cursor.fetchone()[0]
+
+
+def is_partitioned(cursor):
+    """True if unified_data exists as a partitioned table."""
+    cursor.execute("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(%s)", [PARENT])
+    row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def partition_years(cursor):
+    """Years that have a partition, ascending."""
+    cursor.execute("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+    """, [PARENT])
+    return sorted(
+        int(name[len(PARTITION_PREFIX):])
+        for (name,) in cursor.fetchall()
+        if name.startswith(PARTITION_PREFIX)
+    )
+
+
+def create_default_partition(cursor):
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT} DEFAULT")
+
+
+def create_partition(cursor, year):
+    """
+    Create the partition for `year`.
+
+    Rows of that year already in the default partition are moved into it
+    before it is attached, as PostgreSQL requires.
+    """
+    name = partition_name(year)
+    bounds = {'start': datetime(year, 1, 1), 'end': datetime(year + 1, 1, 1)}
+    cursor.execute(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS)")
+    if table_exists(cursor, DEFAULT_PARTITION):
+        cursor.execute(f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE timestamp_utc >= %(start)s AND timestamp_utc < %(end)s
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """, bounds)
+    # Attaching builds the partition's copies of the parent's indexes
+    cursor.execute(f"""
+        ALTER TABLE {PARENT} ATTACH PARTITION {name}
+        FOR VALUES FROM (%(start)s) TO (%(end)s)
+    """, bounds)
+
+
+def default_partition_years(cursor):
+    """Years of the rows sitting in the default partition."""
+    if not table_exists(cursor, DEFAULT_PARTITION):
+        return []
+    cursor.execute(f"""
+        SELECT DISTINCT EXTRACT(YEAR FROM timestamp_utc)::int
+        FROM {DEFAULT_PARTITION}
+        ORDER BY 1
+    """)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def ensure_partitions(cursor, ahead=1, today=None):
+    """
+    Create missing partitions; returns the years created.
+
+    Covers every year from the first partition (or the first year with
+    data) through `ahead` years past the current one, and any year whose
+    rows ended up in the default partition.
+    """
+    existing = set(partition_years(cursor))
+    stray = default_partition_years(cursor)
+    current = (today or date.today()).year
+    first = min([current, *existing, *stray])
+    wanted = set(range(first, current + ahead + 1)) | set(stray)
+
+    created = sorted(wanted - existing)
+    for year in created:
+        create_partition(cursor, year)
+    return created
+
+
+def create_indexes(cursor):
+    for sql in INDEXES:
+        cursor.execute(sql)
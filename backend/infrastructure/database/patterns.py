@@ -0,0 +1,134 @@
+"""
+Pattern cube: sums and counts of unified_data per calendar cell.
+
+unified_data_pattern holds one row per parameter and (year, month,
+day_of_week, hour, season, is_heating_season) cell with the count and sum
+of the parameter's values, and the count and sum of the temperatures of
+the same rows. Sums and counts merge by addition, so any
+diurnal, weekly, monthly or seasonal pattern under any combination of
+filters is a GROUP BY over a few thousand cells instead of a scan of
+unified_data. A cell never spans two months, so ingestion only rebuilds
+the months a batch touched.
+"""
+
+from backend.infrastructure.database.rollups import COLUMNS
+
+# Cube dimensions, in key order
+DIMENSIONS = ('year', 'month', 'day_of_week', 'hour', 'season', 'is_heating_season')
+
+# day_of_week follows PostgreSQL's DOW: 0 is Sunday
+WEEKEND_DAYS = (0, 6)
+
+# Calendar fields of a unified_data row `u`. NULL fields are derived from
+# timestamp_utc the way the ETL fills them, so such rows still count.
+CALENDAR = {
+    'month': "COALESCE(u.month, EXTRACT(MONTH FROM u.timestamp_utc)::int)",
+    'day_of_week': "COALESCE(u.day_of_week, EXTRACT(DOW FROM u.timestamp_utc)::int)",
+    'hour': "COALESCE(u.hour, EXTRACT(HOUR FROM u.timestamp_utc)::int)",
+    'season': """COALESCE(u.season, CASE
+        WHEN EXTRACT(MONTH FROM u.timestamp_utc) IN (12, 1, 2) THEN 'winter'
+        WHEN EXTRACT(MONTH FROM u.timestamp_utc) IN (3, 4, 5) THEN 'spring'
+        WHEN EXTRACT(MONTH FROM u.timestamp_utc) IN (6, 7, 8) THEN 'summer'
+        ELSE 'autumn'
+    END)""",
+    'is_heating_season': (
+        "COALESCE(u.is_heating_season, EXTRACT(MONTH FROM u.timestamp_utc) IN (10, 11, 12, 1, 2, 3, 4))"
+    ),
+}
+
+
+def refresh_patterns(cursor, start=None, end=None):
+    """
+    Recompute the cells of every calendar month overlapping [start, end].
+
+    Without bounds every cell is rebuilt.
+    """
+    if start is None or end is None:
+        cursor.execute("TRUNCATE unified_data_pattern")
+        params = {}
+        where = "TRUE"
+    else:
+        params = {'start': start, 'end': end}
+        where = """
+            u.timestamp_utc >= date_trunc('month', %(start)s::timestamp)
+            AND u.timestamp_utc < date_trunc('month', %(end)s::timestamp) + INTERVAL '1 month'
+        """
+        cursor.execute("""
+            DELETE FROM unified_data_pattern
+            WHERE make_date(year, month, 1)
+                BETWEEN date_trunc('month', %(start)s::timestamp)
+                AND date_trunc('month', %(end)s::timestamp)
+        """, params)
+
+    values = ', '.join(f"('{col}', u.{col}::double precision)" for col in COLUMNS)
+    calendar = ', '.join(f"{sql} AS {name}" for name, sql in CALENDAR.items())
+    # By position: a bare name like month would group by u.month, not its
+    # derived value
+    cursor.execute(f"""
+        INSERT INTO unified_data_pattern
+            (parameter, {', '.join(DIMENSIONS)}, value_count, value_sum,
+             temperature_count, temperature_sum)
+        SELECT
+            p.parameter,
+            EXTRACT(YEAR FROM u.timestamp_utc)::int AS year,
+            {calendar},
+            COUNT(*),
+            SUM(p.value),
+            COUNT(u.temperature_c),
+            COALESCE(SUM(u.temperature_c::double precision), 0)
+        FROM unified_data u
+        CROSS JOIN LATERAL (VALUES {values}) AS p(parameter, value)
+        WHERE p.value IS NOT NULL
+          AND {where}
+        GROUP BY {', '.join(str(k) for k in range(1, len(DIMENSIONS) + 2))}
+    """, params)
+
+
+def where_clause(filters):
+    """
+    SQL condition and params restricting the cube to `filters`.
+
+    `filters` maps dimensions to the values they may take.
+    """
+    conditions, params = [], {}
+    for dimension in DIMENSIONS:
+        if dimension in filters:
+            conditions.append(f"{dimension} = ANY(%({dimension})s)")
+            params[dimension] = list(filters[dimension])
+    return ' AND '.join(conditions) or 'TRUE', params
+
+
+def pattern_sql(by, averages, filters, count=None, temperature=None):
+    """
+    Averages per value of the `by` dimension under `filters`.
+
+    `averages` maps output names to parameters; `temperature`, if given,
+    names a column with the mean temperature of the rows holding the first
+    parameter, and `count` one with the value count of the first parameter.
+    Groups without a value of the first parameter are left out. Returns
+    ``(sql, params)``.
+    """
+    where, params = where_clause(filters)
+    columns, parameters = [], []
+    for k, (name, parameter) in enumerate(averages.items()):
+        params[f'parameter_{k}'] = parameter
+        parameters.append(f'%(parameter_{k})s')
+        of = f"FILTER (WHERE parameter = %(parameter_{k})s)"
+        columns.append(f"SUM(value_sum) {of} / NULLIF(SUM(value_count) {of}, 0) AS {name}")
+    first = "FILTER (WHERE parameter = %(parameter_0)s)"
+    if temperature:
+        columns.append(
+            f"SUM(temperature_sum) {first} / NULLIF(SUM(temperature_count) {first}, 0) AS {temperature}"
+        )
+    if count:
+        columns.append(f"SUM(value_count) {first} AS {count}")
+
+    sql = f"""
+        SELECT {by}, {', '.join(columns)}
+        FROM unified_data_pattern
+        WHERE parameter IN ({', '.join(parameters)}) AND {where}
+        GROUP BY {by}
+        HAVING SUM(value_count) {first} > 0
+        ORDER BY {by}
+    """
+    return sql, params
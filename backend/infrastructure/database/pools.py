@@ -0,0 +1,49 @@
+"""
+Connection pool statistics.
+
+Django keeps one psycopg ``ConnectionPool`` per database alias and process
+(``OPTIONS['pool']`` in settings); the coroutine views have their own
+async pool. The counters are cumulative since the pool was opened, so
+sizing decisions come from how often requests had to wait and how close
+the pool runs to its maximum.
+"""
+
+from django.db import connections
+
+from backend.infrastructure.database import async_pool
+
+
+def describe_pool(pool):
+    """Sizes, checkouts, waits and saturation of one psycopg pool."""
+    stats = pool.get_stats()  # counters that are still zero are omitted
+    in_use = stats.get('pool_size', 0) - stats.get('pool_available', 0)
+    return {
+        'name': pool.name,
+        'min_size': pool.min_size,
+        'max_size': pool.max_size,
+        'size': stats.get('pool_size', 0),
+        'available': stats.get('pool_available', 0),
+        'in_use': in_use,
+        'saturation': round(in_use / pool.max_size, 3),
+        'checkouts': stats.get('requests_num', 0),
+        'waits': stats.get('requests_queued', 0),
+        'wait_ms': stats.get('requests_wait_ms', 0),
+        'waiting': stats.get('requests_waiting', 0),
+        'timeouts': stats.get('requests_errors', 0),
+        'connections_opened': stats.get('connections_num', 0),
+        'connections_lost': stats.get('connections_lost', 0),
+        'returned_bad': stats.get('returns_bad', 0),
+    }
+
+
+def pool_stats():
+    """Statistics of every connection pool of this process, by alias."""
+    result = {}
+    for alias in connections:
+        # Pools open on the first query of the process
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is not None and not pool.closed:
+            result[alias] = describe_pool(pool)
+    for k, pool in enumerate(async_pool.open_pools()):
+        result['async' if k == 0 else f'async-{k}'] = describe_pool(pool)
+    return result
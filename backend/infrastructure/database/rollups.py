@@ -0,0 +1,243 @@
+"""
+Multi-resolution rollups of unified_data.
+
+The rollup table keeps count/sum/min/max per parameter and time bucket at
+five levels (1h, 6h, 1d, 1w, 1mo). The 1h level is built from raw rows and
+every coarser level is built from the level below it, so a refresh only
+re-aggregates the buckets touched by an ingestion batch.
+"""
+
+import re
+from collections import namedtuple
+
+# Columns of unified_data that are rolled up
+COLUMNS = (
+    'pm25', 'pm10', 'no2', 'so2', 'o3', 'co',
+    'temperature_c', 'humidity_pct', 'wind_speed_ms', 'pressure_hpa',
+)
+
+# All bins share one origin (a Monday, midnight) so that 6h/1d/1w buckets
+# line up with date_trunc and with each other.
+BIN_ORIGIN = "TIMESTAMP '2000-01-03 00:00:00'"
+
+Level = namedtuple('Level', ['name', 'hours', 'bucket', 'source'])
+
+# Ordered from finest to coarsest. `bucket` is a SQL template applied to a
+# timestamp expression; `source` is the level the buckets are merged from.
+LEVELS = (
+    Level('1h', 1, "date_trunc('hour', {})", None),
+    Level('6h', 6, "date_bin('6 hours', {}, " + BIN_ORIGIN + ")", '1h'),
+    Level('1d', 24, "date_trunc('day', {})", '6h'),
+    Level('1w', 168, "date_trunc('week', {})", '1d'),
+    Level('1mo', None, "date_trunc('month', {})", '1d'),
+)
+LEVELS_BY_NAME = {level.name: level for level in LEVELS}
+
+RESOLUTION_RE = re.compile(r'^(\d+)(h|d|w|mo)$')
+UNIT_HOURS = {'h': 1, 'd': 24, 'w': 168}
+
+# Bucket sizes `auto_resolution` chooses from, finest first
+AUTO_RESOLUTIONS = ('1h', '3h', '6h', '12h', '1d', '2d', '1w', '2w', '1mo')
+# Average month, for estimating the number of monthly buckets
+MONTH_HOURS = 730
+
+
+def resolve_resolution(resolution):
+    """
+    Map a requested bucket size to the coarsest rollup level that answers it.
+
+    Returns ``(level, bin_hours)``; ``bin_hours`` is None when the level
+    already has the requested size, otherwise level buckets are merged into
+    ``bin_hours``-wide bins at query time. Raises ValueError when the
+    resolution cannot be served from the pyramid.
+    """
+    match = RESOLUTION_RE.match(resolution or '')
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid resolution '{resolution}'")
+
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == 'mo':
+        if count != 1:
+            raise ValueError("Only '1mo' is supported for monthly resolution")
+        return LEVELS_BY_NAME['1mo'], None
+
+    hours = count * UNIT_HOURS[unit]
+    level = max(
+        (lvl for lvl in LEVELS if lvl.hours and hours % lvl.hours == 0),
+        key=lambda lvl: lvl.hours,
+    )
+    return level, (None if level.hours == hours else hours)
+
+
+def resolution_hours(resolution):
+    """Hours per bucket of a resolution (a month counts as MONTH_HOURS)."""
+    match = RESOLUTION_RE.match(resolution or '')
+    if not match:
+        raise ValueError(f"Invalid resolution '{resolution}'")
+    count, unit = int(match.group(1)), match.group(2)
+    return count * (MONTH_HOURS if unit == 'mo' else UNIT_HOURS[unit])
+
+
+def auto_resolution(span_hours, target_points):
+    """
+    The finest of AUTO_RESOLUTIONS giving at most `target_points` buckets
+    over `span_hours`, so a response has between roughly half and all of
+    the target; the coarsest when none does.
+    """
+    for resolution in AUTO_RESOLUTIONS:
+        if span_hours / resolution_hours(resolution) <= target_points:
+            return resolution
+    return AUTO_RESOLUTIONS[-1]
+
+
+def _refresh_level(cursor, level, start, end):
+    """Recompute the buckets of one level that overlap [start, end]."""
+    lo = level.bucket.format('%(start)s::timestamp')
+    hi = level.bucket.format('%(end)s::timestamp')
+    params = {'level': level.name, 'start': start, 'end': end}
+
+    # Bounds are bucket starts, so the whole of every touched bucket is
+    # rebuilt even when [start, end] covers only part of it.
+    cursor.execute(f"""
+        DELETE FROM unified_data_rollup
+        WHERE resolution = %(level)s
+          AND bucket_start >= {lo}
+          AND bucket_start <= {hi}
+    """, params)
+
+    if level.source is None:
+        values = ', '.join(f"('{col}', u.{col}::double precision)" for col in COLUMNS)
+        cursor.execute(f"""
+            INSERT INTO unified_data_rollup
+                (resolution, parameter, bucket_start,
+                 value_count, value_sum, value_min, value_max)
+            SELECT
+                %(level)s,
+                p.parameter,
+                {level.bucket.format('u.timestamp_utc')} AS bucket,
+                COUNT(*), SUM(p.value), MIN(p.value), MAX(p.value)
+            FROM unified_data u
+            CROSS JOIN LATERAL (VALUES {values}) AS p(parameter, value)
+            WHERE p.value IS NOT NULL
+              AND u.timestamp_utc >= {lo}
+              AND u.timestamp_utc < {hi} + INTERVAL '1 hour'
+            GROUP BY p.parameter, bucket
+        """, params)
+    else:
+        cursor.execute(f"""
+            INSERT INTO unified_data_rollup
+                (resolution, parameter, bucket_start,
+                 value_count, value_sum, value_min, value_max)
+            SELECT
+                %(level)s,
+                parameter,
+                {level.bucket.format('bucket_start')} AS bucket,
+                SUM(value_count), SUM(value_sum), MIN(value_min), MAX(value_max)
+            FROM unified_data_rollup
+            WHERE resolution = %(source)s
+              AND bucket_start >= {lo}
+              AND {level.bucket.format('bucket_start')} <= {hi}
+            GROUP BY parameter, bucket
+        """, {**params, 'source': level.source})
+
+
+def refresh_rollups(cursor, start=None, end=None):
+    """
+    Bring every rollup level up to date for rows in [start, end].
+
+    Without bounds the whole of unified_data is re-aggregated. Run inside a
+    transaction so readers never see a level half-rebuilt.
+    """
+    if start is None or end is None:
+        cursor.execute("SELECT MIN(timestamp_utc), MAX(timestamp_utc) FROM unified_data")
+        first, last = cursor.fetchone()
+        start = start or first
+        end = end or last
+        if start is None:
+            return
+
+    # Finest first: each coarser level is merged from the one before it.
+    for level in LEVELS:
+        _refresh_level(cursor, level, start, end)
+
+
+def rebuild_rollups(cursor):
+    """Drop and recompute every rollup level from scratch."""
+    cursor.execute("TRUNCATE unified_data_rollup")
+    refresh_rollups(cursor)
+
+
+# Start of the newest hourly bucket of one parameter (NULL without data)
+LATEST_BUCKET_SQL = """
+    SELECT MAX(bucket_start)
+    FROM unified_data_rollup
+    WHERE resolution = '1h' AND parameter = %s
+"""
+
+
+def latest_bucket(cursor, column):
+    """Start of the newest hourly bucket holding `column`, or None."""
+    cursor.execute(LATEST_BUCKET_SQL, [column])
+    return cursor.fetchone()[0]
+
+
+def bucket_query(columns, resolution, days=None, anchor=None, start=None, end=None):
+    """
+    Build SQL returning one row per bucket for the last `days` days.
+
+    Each row is ``(bucket, <col>_avg, <col>_min, <col>_max, <col>_count, ...)``
+    for every column in `columns`. The window ends at the newest hourly
+    bucket of `anchor` (defaults to the first column), matching the
+    "last available data" convention of the raw queries; other columns are
+    cut to the same window so all series share one time axis.
+
+    With `start` and `end` the window is the buckets that start between
+    them instead. Either way the query is one range scan of the rollup
+    primary key per column.
+    """
+    unknown = set(columns) - set(COLUMNS)
+    if unknown:
+        raise ValueError(f"Columns are not rolled up: {', '.join(sorted(unknown))}")
+
+    level, bin_hours = resolve_resolution(resolution)
+    anchor = anchor or columns[0]
+
+    if bin_hours is None:
+        bucket = 'bucket_start'
+    else:
+        bucket = f"date_bin(INTERVAL '{bin_hours} hours', bucket_start, {BIN_ORIGIN})"
+
+    params = {'level': level.name}
+    if start is not None:
+        since, latest = '%(start)s::timestamp', '%(end)s::timestamp'
+        params.update(start=start, end=end)
+    else:
+        latest = """(
+            SELECT MAX(bucket_start)
+            FROM unified_data_rollup
+            WHERE resolution = '1h' AND parameter = %(anchor)s
+        )"""
+        since = f"({latest} - INTERVAL '{int(days)} days')"
+        params['anchor'] = anchor
+
+    selects = []
+    for col in columns:
+        where = f"FILTER (WHERE parameter = '{col}')"
+        selects.append(
+            f"SUM(value_sum) {where} / NULLIF(SUM(value_count) {where}, 0) AS {col}_avg, "
+            f"MIN(value_min) {where} AS {col}_min, "
+            f"MAX(value_max) {where} AS {col}_max, "
+            f"COALESCE(SUM(value_count) {where}, 0) AS {col}_count"
+        )
+
+    sql = f"""
+        SELECT {bucket} AS bucket, {', '.join(selects)}
+        FROM unified_data_rollup
+        WHERE resolution = %(level)s
+          AND parameter IN ({', '.join(f"'{col}'" for col in columns)})
+          AND bucket_start >= {level.bucket.format(since)}
+          AND bucket_start <= {latest}
+        GROUP BY 1
+        ORDER BY 1 ASC
+    """
+    return sql, params
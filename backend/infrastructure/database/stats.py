@@ -0,0 +1,107 @@
+"""
+Summary statistics of unified_data kept per (parameter, year, season).
+
+Each row of unified_data_stats is a mergeable accumulator (count, mean,
+M2, min, max, first/last timestamp) plus PM2.5 category counts. Ingestion
+recomputes only the calendar years a batch touched; readers merge the
+handful of cells they need instead of scanning unified_data.
+"""
+
+from collections import namedtuple
+
+from backend.domain.services.statistics import (
+    PM25_CATEGORIES,
+    PM25_DECIMALS,
+    RunningStats,
+)
+from backend.infrastructure.database.rollups import COLUMNS
+
+Cell = namedtuple('Cell', ['year', 'season', 'stats', 'categories'])
+
+# Season of rows without one, so they still count towards the totals
+UNKNOWN_SEASON = 'unknown'
+
+
+def _category_counts():
+    """SQL array of PM2.5 counts per category, in PM25_CATEGORIES order."""
+    # Truncated like the AQI engine, so 12.05 is 'Good' there and here
+    scale = 10 ** PM25_DECIMALS
+    value = f"floor(GREATEST(p.value, 0) * {scale} + 1e-6) / {scale}"
+    counts, lower = [], None
+    for _, upper in PM25_CATEGORIES:
+        conditions = []
+        if lower is not None:
+            conditions.append(f"{value} > {lower}")
+        if upper is not None:
+            conditions.append(f"{value} <= {upper}")
+        counts.append(f"COUNT(*) FILTER (WHERE {' AND '.join(conditions)})")
+        lower = upper
+    return f"CASE WHEN p.parameter = 'pm25' THEN ARRAY[{', '.join(counts)}] END"
+
+
+def refresh_stats(cursor, start=None, end=None):
+    """
+    Recompute the cells of every calendar year overlapping [start, end].
+
+    Without bounds every cell is rebuilt. A year is the unit because the
+    winter cell holds both its January/February and its December.
+    """
+    if start is None or end is None:
+        cursor.execute("TRUNCATE unified_data_stats")
+        params = {'first_year': None, 'last_year': None}
+        where = "TRUE"
+    else:
+        params = {'first_year': start.year, 'last_year': end.year}
+        cursor.execute("""
+            DELETE FROM unified_data_stats
+            WHERE year BETWEEN %(first_year)s AND %(last_year)s
+        """, params)
+        where = """
+            u.timestamp_utc >= make_timestamp(%(first_year)s, 1, 1, 0, 0, 0)
+            AND u.timestamp_utc < make_timestamp(%(last_year)s + 1, 1, 1, 0, 0, 0)
+        """
+
+    values = ', '.join(f"('{col}', u.{col}::double precision)" for col in COLUMNS)
+    cursor.execute(f"""
+        INSERT INTO unified_data_stats
+            (parameter, year, season, value_count, value_mean, value_m2,
+             value_min, value_max, first_record, last_record, category_counts)
+        SELECT
+            p.parameter,
+            EXTRACT(YEAR FROM u.timestamp_utc)::int AS year,
+            COALESCE(u.season, %(unknown)s) AS season,
+            COUNT(*),
+            AVG(p.value),
+            VAR_POP(p.value) * COUNT(*),
+            MIN(p.value),
+            MAX(p.value),
+            MIN(u.timestamp_utc),
+            MAX(u.timestamp_utc),
+            {_category_counts()}
+        FROM unified_data u
+        CROSS JOIN LATERAL (VALUES {values}) AS p(parameter, value)
+        WHERE p.value IS NOT NULL
+          AND {where}
+        GROUP BY p.parameter, year, COALESCE(u.season, %(unknown)s)
+    """, {**params, 'unknown': UNKNOWN_SEASON})
+
+
+# All cells of one parameter, ordered by year and season
+CELLS_SQL = """
+    SELECT year, season, value_count, value_mean, value_m2,
+           value_min, value_max, first_record, last_record, category_counts
+    FROM unified_data_stats
+    WHERE parameter = %s
+    ORDER BY year, season
+"""
+
+
+def cells_from_rows(rows):
+    """Cell tuples from rows of CELLS_SQL."""
+    return [Cell(row[0], row[1], RunningStats(*row[2:9]), row[9]) for row in rows]
+
+
+def fetch_cells(cursor, column):
+    """All cells of one column as Cell tuples, ordered by year and season."""
+    cursor.execute(CELLS_SQL, [column])
+    return cells_from_rows(cursor.fetchall())
@@ -0,0 +1,221 @@
+"""
+Bulk loading of synthetic series into unified_data, measurements and weather.
+
+A generated frame (see ``domain.services.synthetic``) is written to each
+table in its own shape with one COPY, as CSV (formatted by pyarrow when
+installed). Rows are marked with the 'synthetic' source
+(unified_data.weather_source, data_source of the others), which is how
+reloading a city and period replaces only the rows generated before and
+never touches ingested data. Nothing keys the tables by location and
+time, so a city and period that already hold ingested rows are refused
+rather than loaded next to them (see `ingested_locations`).
+"""
+
+import io
+
+from backend.domain.services.aqi import UNITS
+from backend.domain.services.synthetic import POLLUTANTS
+from backend.infrastructure.database import partitions
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+SOURCE = 'synthetic'
+SOURCE_FILE = 'generate_synthetic_data'
+
+TABLES = ('unified_data', 'measurements', 'weather')
+
+UNIFIED_COLUMNS = (
+    'timestamp_utc', 'location',
+    'pm25', 'pm10', 'no2', 'o3', 'so2', 'co',
+    'temperature_c', 'humidity_pct', 'pressure_hpa', 'wind_speed_ms',
+    'wind_direction_deg', 'precipitation_mm', 'cloud_cover_pct',
+    'hour', 'day_of_week', 'day_of_month', 'month', 'season', 'is_weekend', 'is_heating_season',
+    'pm25_source', 'weather_source', 'completeness_score',
+)
+
+MEASUREMENT_COLUMNS = (
+    'timestamp_utc', 'location', 'latitude', 'longitude', 'parameter', 'value',
+    'unit', 'data_source', 'data_quality', 'source_file',
+)
+
+WEATHER_COLUMNS = (
+    'timestamp_utc', 'location', 'latitude', 'longitude',
+    'temperature_c', 'feels_like_c', 'dew_point_c',
+    'humidity_pct', 'precipitation_mm', 'rain_mm', 'snow_cm',
+    'pressure_msl_hpa', 'surface_pressure_hpa',
+    'wind_speed_ms', 'wind_direction_deg', 'wind_gust_ms',
+    'cloud_cover_pct', 'weather_code', 'data_source', 'source_file',
+)
+
+# Column of each table carrying the source marker
+SOURCE_COLUMNS = {'unified_data': 'weather_source', 'measurements': 'data_source', 'weather': 'data_source'}
+
+# The normalized tables as archive/etl_scripts/create_normalized_schema.sql
+# defines them, for databases initialised with unified_data only
+SCHEMA = {
+    'measurements': """
+        CREATE TABLE IF NOT EXISTS measurements (
+            id SERIAL PRIMARY KEY,
+            timestamp_utc TIMESTAMP NOT NULL,
+            location VARCHAR(100) NOT NULL,
+            latitude DECIMAL(9,6),
+            longitude DECIMAL(9,6),
+            parameter VARCHAR(50) NOT NULL,
+            value DECIMAL(12,6) NOT NULL,
+            unit VARCHAR(20) NOT NULL,
+            data_source VARCHAR(50) NOT NULL,
+            data_quality VARCHAR(20),
+            source_file VARCHAR(255),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS idx_measurements_timestamp ON measurements(timestamp_utc);
+        CREATE INDEX IF NOT EXISTS idx_measurements_parameter ON measurements(parameter);
+        CREATE INDEX IF NOT EXISTS idx_measurements_location ON measurements(location);
+        CREATE INDEX IF NOT EXISTS idx_measurements_composite
+            ON measurements(timestamp_utc, location, parameter);
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_measurements_unique
+            ON measurements(timestamp_utc, location, parameter, data_source);
+    """,
+    'weather': """
+        CREATE TABLE IF NOT EXISTS weather (
+            id SERIAL PRIMARY KEY,
+            timestamp_utc TIMESTAMP NOT NULL,
+            location VARCHAR(100) NOT NULL,
+            latitude DECIMAL(9,6),
+            longitude DECIMAL(9,6),
+            temperature_c DECIMAL(5,2),
+            feels_like_c DECIMAL(5,2),
+            dew_point_c DECIMAL(5,2),
+            humidity_pct INTEGER,
+            precipitation_mm DECIMAL(6,2),
+            rain_mm DECIMAL(6,2),
+            snow_cm DECIMAL(6,2),
+            snow_depth_m DECIMAL(6,2),
+            pressure_msl_hpa DECIMAL(7,2),
+            surface_pressure_hpa DECIMAL(7,2),
+            wind_speed_ms DECIMAL(5,2),
+            wind_direction_deg INTEGER,
+            wind_gust_ms DECIMAL(5,2),
+            cloud_cover_pct INTEGER,
+            weather_code INTEGER,
+            data_source VARCHAR(50) NOT NULL,
+            source_file VARCHAR(255),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS idx_weather_timestamp ON weather(timestamp_utc);
+        CREATE INDEX IF NOT EXISTS idx_weather_location ON weather(location);
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_weather_unique
+            ON weather(timestamp_utc, location, data_source);
+    """,
+}
+
+
+def ensure_tables(cursor, tables):
+    """Create measurements and weather if they are wanted and missing."""
+    for table in tables:
+        if table in SCHEMA and not partitions.table_exists(cursor, table):
+            cursor.execute(SCHEMA[table])
+
+
+def ensure_partitions(cursor, first_year, last_year):
+    """Create the unified_data partitions of the years to load; returns them."""
+    if not partitions.is_partitioned(cursor):
+        return []
+    created = sorted(set(range(first_year, last_year + 1)) - set(partitions.partition_years(cursor)))
+    for year in created:
+        partitions.create_partition(cursor, year)
+    return created
+
+
+def ingested_locations(cursor, table, locations, start, end):
+    """Those of `locations` with non-synthetic rows in [start, end) of `table`."""
+    cursor.execute(f"""
+        SELECT DISTINCT location
+        FROM {table}
+        WHERE location = ANY(%(locations)s)
+          AND timestamp_utc >= %(start)s AND timestamp_utc < %(end)s
+          AND {SOURCE_COLUMNS[table]} IS DISTINCT FROM %(source)s
+        ORDER BY location
+    """, {'locations': list(locations), 'start': start, 'end': end, 'source': SOURCE})
+    return [row[0] for row in cursor.fetchall()]
+
+
+def delete_rows(cursor, table, location, start, end):
+    """Drop the synthetic rows of `location` in [start, end) from `table`."""
+    cursor.execute(f"""
+        DELETE FROM {table}
+        WHERE location = %(location)s
+          AND timestamp_utc >= %(start)s AND timestamp_utc < %(end)s
+          AND {SOURCE_COLUMNS[table]} = %(source)s
+    """, {'location': location, 'start': start, 'end': end, 'source': SOURCE})
+
+
+def unified_rows(frame):
+    rows = frame.assign(pm25_source=frame['pm25'].notna().map({True: SOURCE, False: None}),
+                        weather_source=SOURCE)
+    return rows[list(UNIFIED_COLUMNS)]
+
+
+def measurement_rows(frame, city):
+    rows = frame.melt(
+        id_vars=['timestamp_utc', 'location'], value_vars=list(POLLUTANTS),
+        var_name='parameter', value_name='value',
+    ).dropna(subset=['value'])
+    rows = rows.assign(
+        latitude=city.latitude, longitude=city.longitude,
+        unit=rows['parameter'].map(UNITS), data_source=SOURCE, data_quality=SOURCE, source_file=SOURCE_FILE,
+    )
+    return rows[list(MEASUREMENT_COLUMNS)]
+
+
+def weather_rows(frame, city):
+    rows = frame.rename(columns={'pressure_hpa': 'surface_pressure_hpa'}).assign(
+        latitude=city.latitude, longitude=city.longitude,
+        data_source=SOURCE, source_file=SOURCE_FILE,
+    )
+    # INTEGER columns of weather; the frame holds them as rounded floats
+    for column in ('humidity_pct', 'wind_direction_deg', 'cloud_cover_pct'):
+        rows[column] = rows[column].astype(int)
+    return rows[list(WEATHER_COLUMNS)]
+
+
+def to_csv(rows):
+    """CSV of a DataFrame without header; nulls as empty fields."""
+    if pa is None:
+        return rows.to_csv(index=False, header=False).encode()
+    # Arrow's writer is about ten times faster than pandas'
+    out = io.BytesIO()
+    pa_csv.write_csv(
+        pa.Table.from_pandas(rows, preserve_index=False), out,
+        pa_csv.WriteOptions(include_header=False, quoting_style='needed'),
+    )
+    return out.getvalue()
+
+
+def copy_rows(cursor, table, rows):
+    """COPY a DataFrame into `table`; empty fields load as NULL."""
+    data = to_csv(rows)
+    with cursor.copy(f"COPY {table} ({', '.join(rows.columns)}) FROM STDIN (FORMAT csv)") as copy:
+        copy.write(data)
+    return len(rows)
+
+
+def load(cursor, frame, city, start, end, tables=TABLES):
+    """
+    Write the `frame` generated for `city` over [start, end) to `tables`,
+    replacing its earlier synthetic rows there. Returns row counts per table.
+    """
+    shapes = {
+        'unified_data': lambda: unified_rows(frame),
+        'measurements': lambda: measurement_rows(frame, city),
+        'weather': lambda: weather_rows(frame, city),
+    }
+    counts = {}
+    for table in tables:
+        delete_rows(cursor, table, city.name, start, end)
+        counts[table] = copy_rows(cursor, table, shapes[table]())
+    return counts
@@ -0,0 +1,190 @@
+"""
+Prometheus metrics of the API and the Celery workers.
+
+Requests are timed per URL name with their query count, SQL time and
+response size; Celery tasks per task name and outcome. Recording is a
+few histogram observations per request. Queries are counted by an
+execute wrapper installed on every database connection, which adds to
+the counters of the request or task running in the current context and
+does nothing outside one.
+
+Each process keeps its own values. Under several worker processes (gunicorn,
+Celery prefork) set ``PROMETHEUS_MULTIPROC_DIR`` to a directory shared by
+them, emptied on deploy, and `render` merges every process's values.
+"""
+
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Histogram, multiprocess
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+except ImportError:  # pragma: no cover - optional dependency
+    prometheus_client = None
+
+CONTENT_TYPE = prometheus_client.CONTENT_TYPE_LATEST if prometheus_client else 'text/plain'
+
+# Seconds; the API answers in milliseconds from cache, seconds for exports
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+TASK_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram(
+        'aaqis_http_request_duration_seconds', 'Request latency by URL name',
+        ['view', 'method'], buckets=LATENCY_BUCKETS,
+    )
+    REQUESTS = Counter(
+        'aaqis_http_requests', 'Requests by URL name and status code',
+        ['view', 'method', 'status'],
+    )
+    REQUEST_QUERIES = Histogram(
+        'aaqis_http_request_queries', 'SQL queries per request',
+        ['view'], buckets=QUERY_BUCKETS,
+    )
+    REQUEST_SQL_TIME = Histogram(
+        'aaqis_http_request_sql_seconds', 'Total SQL time per request',
+        ['view'], buckets=LATENCY_BUCKETS,
+    )
+    RESPONSE_SIZE = Histogram(
+        'aaqis_http_response_bytes', 'Size of non-streamed response bodies',
+        ['view'], buckets=SIZE_BUCKETS,
+    )
+    TASK_DURATION = Histogram(
+        'aaqis_celery_task_duration_seconds', 'Celery task run time',
+        ['task', 'state'], buckets=TASK_BUCKETS,
+    )
+    TASK_QUERIES = Counter(
+        'aaqis_celery_task_queries', 'SQL queries run by Celery tasks', ['task'],
+    )
+
+class _SqlCounter:
+    """
+    Query count and SQL seconds of one request or task.
+
+    Threads started with a copy of the request's context (the dashboard
+    bundle's queries) share the counter, so updates take a lock.
+    """
+
+    __slots__ = ('queries', 'seconds', 'lock')
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, seconds):
+        with self.lock:
+            self.queries += 1
+            self.seconds += seconds
+
+
+# _SqlCounter of the request or task of the current context
+_sql = ContextVar('aaqis_sql', default=None)
+
+
+def start_sql():
+    """Start counting queries in this context; returns the token for `stop_sql`."""
+    return _sql.set(_SqlCounter())
+
+
+def stop_sql(token):
+    """Stop counting and return (queries, seconds) since `start_sql`."""
+    counter = _sql.get()
+    _sql.reset(token)
+    with counter.lock:
+        return counter.queries, counter.seconds
+
+
+def record_query(seconds):
+    """Add one query to the counters of the current context, if any."""
+    counter = _sql.get()
+    if counter is not None:
+        counter.add(seconds)
+
+
+def _timed_execute(execute, sql, params, many, context):
+    if _sql.get() is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record_query(time.perf_counter() - start)
+
+
+def _install_wrapper(sender, connection, **kwargs):
+    # Fires on every connect, pooled or not; the wrapper list lives on
+    # the thread's connection object, so install once
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_timed_execute)
+
+
+if prometheus_client is not None:
+    connection_created.connect(_install_wrapper, dispatch_uid='aaqis-metrics-sql')
+
+
+def observe_request(view, method, status, seconds, queries, sql_seconds, size=None):
+    if prometheus_client is None:
+        return
+    REQUEST_LATENCY.labels(view, method).observe(seconds)
+    REQUESTS.labels(view, method, str(status)).inc()
+    REQUEST_QUERIES.labels(view).observe(queries)
+    REQUEST_SQL_TIME.labels(view).observe(sql_seconds)
+    if size is not None:
+        RESPONSE_SIZE.labels(view).observe(size)
+
+
+def observe_task(task, state, seconds, queries):
+    if prometheus_client is None:
+        return
+    TASK_DURATION.labels(task, state).observe(seconds)
+    TASK_QUERIES.labels(task).inc(queries)
+
+
+class PoolCollector:
+    """Connection pool gauges and counters of the scraped process, read at scrape time."""
+
+    GAUGES = ('size', 'available', 'in_use', 'waiting')
+    COUNTERS = ('checkouts', 'waits', 'timeouts', 'connections_lost')
+
+    def describe(self):
+        # Nothing to check for name clashes; keeps registering from collecting
+        return []
+
+    def collect(self):
+        from backend.infrastructure.database.pools import pool_stats
+
+        stats = pool_stats()
+        for field in self.GAUGES:
+            family = GaugeMetricFamily(f'aaqis_db_pool_{field}', f'Connection pool {field}', labels=['pool'])
+            for name, values in stats.items():
+                family.add_metric([name], values[field])
+            yield family
+        for field in self.COUNTERS:
+            family = CounterMetricFamily(f'aaqis_db_pool_{field}', f'Connection pool {field}', labels=['pool'])
+            for name, values in stats.items():
+                family.add_metric([name], values[field])
+            yield family
+
+
+if prometheus_client is not None and not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    prometheus_client.REGISTRY.register(PoolCollector())
+
+
+def render():
+    """All metrics in the Prometheus text format, as bytes."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        # Pool statistics are not shared; they describe the scraped process
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(PoolCollector())
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry)
@@ -0,0 +1,139 @@
+"""
+Serialization throughput of the row-layout JSON paths.
+
+Compares, on the same unified_data rows:
+
+- ``decimal``: DECIMAL values as Decimal objects, converted cell by cell
+  (the path before unified_data moved to DOUBLE PRECISION)
+- ``float``: native floats rendered through ``row_payload`` and the
+  standard library encoder
+- ``orjson``: the same rows through the orjson encoder (the API default)
+- ``postgres``: rows serialized by PostgreSQL (``fetch_json_rows``)
+
+Usage (from the repository root, with the database configured)::
+
+    python benchmarks/serialization.py --rows 30000 --repeat 5 [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from backend.application.api.json_encoding import ENCODERS, dumps  # noqa: E402
+from backend.application.api.renderers import row_payload  # noqa: E402
+from backend.infrastructure.database.cursors import fetch_json_rows  # noqa: E402
+
+COLUMNS = {
+    'timestamp': 'timestamp_utc',
+    'pm25': 'pm25',
+    'temperature': 'temperature_c',
+    'humidity': 'humidity_pct',
+    'wind_speed': 'wind_speed_ms',
+    'pressure': 'pressure_hpa',
+}
+
+
+def select_sql(rows, cast=None):
+    fields = ', '.join(
+        f"{col}{'' if name == 'timestamp' or not cast else '::' + cast} AS {name}"
+        for name, col in COLUMNS.items()
+    )
+    return f"""
+        SELECT {fields}
+        FROM unified_data
+        WHERE pm25 IS NOT NULL
+        ORDER BY timestamp_utc DESC
+        LIMIT {int(rows)}
+    """
+
+
+def decimal_path(rows):
+    with connection.cursor() as cursor:
+        cursor.execute(select_sql(rows, 'numeric(10, 2)'))
+        names = [col[0] for col in cursor.description]
+        data = []
+        for row in cursor.fetchall():
+            item = {}
+            for name, value in zip(names, row):
+                if isinstance(value, Decimal):
+                    value = float(value)
+                elif hasattr(value, 'isoformat'):
+                    value = value.isoformat()
+                item[name] = value
+            data.append(item)
+    return json.dumps({'data': data}).encode()
+
+
+def float_path(rows, encoder='json'):
+    with connection.cursor() as cursor:
+        cursor.execute(select_sql(rows))
+        names = [col[0] for col in cursor.description]
+        columns = dict(zip(names, (list(c) for c in zip(*cursor.fetchall()))))
+    return dumps(row_payload({}, columns, {}), encoder)
+
+
+def orjson_path(rows):
+    return float_path(rows, 'orjson')
+
+
+def postgres_path(rows):
+    return ('{"data": ' + fetch_json_rows(select_sql(rows), 'timestamp DESC') + '}').encode()
+
+
+PATHS = {'decimal': decimal_path, 'float': float_path, 'orjson': orjson_path, 'postgres': postgres_path}
+if 'orjson' not in ENCODERS:
+    del PATHS['orjson']
+
+
+def run(rows, repeat):
+    results = {}
+    for name, func in PATHS.items():
+        func(rows)  # warm-up
+        timings, size = [], 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            size = len(func(rows))
+            timings.append(time.perf_counter() - start)
+        median = statistics.median(timings)
+        results[name] = {
+            'median_ms': round(median * 1000, 2),
+            'rows_per_s': round(rows / median),
+            'bytes': size,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=30000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeat)
+    base = results['decimal']['median_ms']
+    print(f"{'path':<10} {'median ms':>10} {'rows/s':>12} {'bytes':>10} {'speedup':>8}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['median_ms']:>10} {r['rows_per_s']:>12} {r['bytes']:>10} "
+              f"{base / r['median_ms']:>7.1f}x")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({'rows': args.rows, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
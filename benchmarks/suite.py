@@ -0,0 +1,420 @@
+"""
+Latency of the data API views and the ETL transforms at several data scales.
+
+Each scale is its own database, ``<POSTGRES_DB>_bench_<scale>``, seeded
+once by ``generate_synthetic_data`` with about that many unified_data rows
+(plus one city's measurements and weather for the ETL join) and reused by
+later runs. Per scale the suite measures, in a fresh process:
+
+- ``views``: every request of REQUESTS through the full middleware stack,
+  ``cold`` (response cache cleared before each request) and ``warm``
+- ``etl``: the ``normalize_data.py`` transforms on synthetic raw input of
+  the scale's size, and its unified_data join query on the seeded tables
+
+and records p50/p95/p99 latency and throughput of each. Results are
+written as JSON so runs on two commits can be diffed or compared::
+
+    python benchmarks/suite.py --scales 70k 1m 10m --json results/$(git rev-parse --short HEAD).json
+    python benchmarks/suite.py --compare results/abc1234.json results/def5678.json
+
+Run from the repository root with the database configured; the database
+user needs CREATEDB. The ETL part needs the ETL extras (sqlalchemy,
+xarray) and is skipped without them.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+
+# Scale name -> (cities, years) of synthetic data, from START_YEAR
+SCALES = {
+    '70k': (1, 8),
+    '1m': (12, 10),
+    '10m': (114, 10),
+}
+START_YEAR = 2016
+
+# One or more representative requests per view of data_views.py
+REQUESTS = (
+    ('overview', '/api/'),
+    ('current', '/api/current/'),
+    ('timeseries_7d', '/api/timeseries/?days=7'),
+    ('timeseries_365d_daily', '/api/timeseries/?days=365&resolution=1d'),
+    ('timeseries_year_auto', f'/api/timeseries/?start={START_YEAR + 1}-01-01&end={START_YEAR + 1}-12-31'),
+    ('timeseries_export', '/api/timeseries/?days=365&stream=1'),
+    ('daily_30d', '/api/daily/?days=30'),
+    ('statistics', '/api/statistics/'),
+    ('statistics_by_season', '/api/statistics/?by=season'),
+    ('hourly_pattern', '/api/hourly-pattern/'),
+    ('hourly_pattern_filtered', '/api/hourly-pattern/?is_heating_season=true&is_weekend=true'),
+    ('monthly_pattern', '/api/monthly-pattern/'),
+    ('dashboard_bundle', '/api/dashboard-bundle/'),
+    ('aqi_bulk_30d', '/api/aqi/bulk/?days=30'),
+    ('correlation', '/api/correlation/'),
+    ('correlation_binned', '/api/correlation/?mode=binned'),
+    ('cache_stats', '/api/cache-stats/'),
+    ('pool_stats', '/api/pool-stats/'),
+    ('nearest_stations', '/api/stations/nearest/?lat=51.17&lon=71.45'),
+)
+
+# Raw ETL input rows per file, as the collectors write them
+ROWS_PER_FILE = 500_000
+OPENAQ_PARAMETERS = ('pm25', 'pm10', 'no2', 'o3', 'so2', 'co')
+# CAMS grid over the Astana bounding box at 0.75°
+CAMS_GRID = [(lat, lon) for lat in (52.5, 51.75, 51.0) for lon in (70.0, 70.75, 71.5, 72.25, 73.0)]
+
+
+def summarize(timings, **extra):
+    """Percentiles (ms) and throughput of a list of durations in seconds."""
+    ms = np.array(timings) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        'n': len(ms),
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'mean_ms': round(float(ms.mean()), 3),
+        'max_ms': round(float(ms.max()), 3),
+        'per_s': round(len(ms) / (ms.sum() / 1000), 2),
+        **extra,
+    }
+
+
+def database_name(scale):
+    return f"{settings.DATABASES['default']['NAME']}_bench_{scale}"
+
+
+# -- Seeding (worker process, connected to the scale's database) ------------
+
+def prepare_database(scale, reseed=False):
+    """Create the schema and seed the scale's data unless already there."""
+    from backend.infrastructure.database import partitions
+
+    cities, years = SCALES[scale]
+    with connection.cursor() as cursor:
+        if not partitions.table_exists(cursor):
+            cursor.execute((ROOT / 'docker' / '01-init-schema.sql').read_text())
+    call_command('migrate', verbosity=0)
+
+    hours = (datetime(START_YEAR + years, 1, 1) - datetime(START_YEAR, 1, 1)).days * 24
+    expected = cities * hours
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM unified_data")
+        present = cursor.fetchone()[0]
+    if present == expected and not reseed:
+        return present, 0.0
+
+    start = time.perf_counter()
+    common = {'years': years, 'start_year': START_YEAR, 'seed': 0}
+    call_command('generate_synthetic_data', cities=cities, tables=['unified_data'], **common)
+    call_command('generate_synthetic_data', cities=1, tables=['measurements', 'weather'], no_refresh=True, **common)
+    with connection.cursor() as cursor:
+        cursor.execute("VACUUM ANALYZE")
+    return expected, round(time.perf_counter() - start, 1)
+
+
+# -- Views ---------------------------------------------------------------------
+
+def bench_views(requests):
+    from django.test import Client
+
+    from backend.infrastructure.cache import response_cache
+
+    client = Client()
+    cache = response_cache.get_cache()
+
+    def fetch(path):
+        start = time.perf_counter()
+        response = client.get(path)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        elapsed = time.perf_counter() - start
+        if response.status_code != 200:
+            raise RuntimeError(f"{path}: HTTP {response.status_code} {body[:200]!r}")
+        return elapsed, len(body)
+
+    results = {}
+    for name, path in REQUESTS:
+        fetch(path)  # warm-up: connections, imports, station index
+        cold, warm = [], []
+        for _ in range(requests):
+            cache.clear()
+            elapsed, size = fetch(path)
+            cold.append(elapsed)
+        for _ in range(requests):
+            warm.append(fetch(path)[0])
+        results[name] = {
+            'path': path,
+            'cold': summarize(cold, bytes=size),
+            'warm': summarize(warm, bytes=size),
+        }
+        print(f"  {name:<26} cold p50 {results[name]['cold']['p50_ms']:>9.2f} ms"
+              f"  warm p50 {results[name]['warm']['p50_ms']:>8.2f} ms", flush=True)
+    return results
+
+
+# -- ETL -----------------------------------------------------------------------
+
+def _files(frame):
+    return [(f'bench_{k:03d}.csv', frame.iloc[i:i + ROWS_PER_FILE].reset_index(drop=True))
+            for k, i in enumerate(range(0, len(frame), ROWS_PER_FILE))]
+
+
+def openaq_input(rows, rng):
+    """Long-format OpenAQ CSV frames, as collect_openaq_historical.py writes them."""
+    hours = -(-rows // len(OPENAQ_PARAMETERS))
+    times = pd.date_range('1900-01-01', periods=hours, freq='h')
+    utc = np.repeat(times.strftime('%Y-%m-%dT%H:%M:%SZ').to_numpy(), len(OPENAQ_PARAMETERS))[:rows]
+    local = np.repeat((times + pd.Timedelta(hours=5)).strftime('%Y-%m-%dT%H:%M:%S+05:00').to_numpy(),
+                      len(OPENAQ_PARAMETERS))[:rows]
+    values = rng.gamma(2.0, 10.0, rows)
+    # Fill values and gaps the transform filters out
+    values[rng.random(rows) < 0.01] = -999
+    values[rng.random(rows) < 0.01] = np.nan
+    frame = pd.DataFrame({
+        'timestamp_utc': utc,
+        'timestamp_local': local,
+        'city': 'Astana',
+        'country_code': 'KZ',
+        'location_id': 10508,
+        'sensor_id': 34816,
+        'parameter': np.tile(OPENAQ_PARAMETERS, hours)[:rows],
+        'value': values,
+        'units': 'µg/m³',
+        'data_quality': 'OK',
+    })
+    return _files(frame)
+
+
+def cams_input(rows, rng):
+    """CAMS grid frames, as ``ds.to_dataframe().reset_index()`` yields them."""
+    steps = -(-rows // len(CAMS_GRID))
+    times = pd.date_range('1900-01-01', periods=steps, freq='3h')
+    lat, lon = np.array(CAMS_GRID).T
+    frame = pd.DataFrame({
+        'valid_time': np.repeat(times.to_numpy(), len(CAMS_GRID))[:rows],
+        'latitude': np.tile(lat, steps)[:rows],
+        'longitude': np.tile(lon, steps)[:rows],
+        'pm2p5': rng.gamma(2.0, 1e-8, rows),
+        'pm10': rng.gamma(2.0, 2e-8, rows),
+    })
+    return _files(frame)
+
+
+def weather_input(rows, rng):
+    """Open-Meteo CSV frames, as collect_openmeteo_weather.py writes them."""
+    # 15-minute steps keep 10M rows inside pandas' timestamp range
+    times = pd.date_range('1900-01-01', periods=rows, freq='15min')
+    frame = pd.DataFrame({
+        'timestamp_local': times.strftime('%Y-%m-%dT%H:%M').to_numpy(),
+        'temp_c': rng.normal(3, 15, rows).round(1),
+        'humidity_pct': rng.integers(15, 100, rows),
+        'dew_point_c': rng.normal(-3, 12, rows).round(1),
+        'feels_like_c': rng.normal(0, 17, rows).round(1),
+        'precip_mm': rng.exponential(0.05, rows).round(1),
+        'rain_mm': rng.exponential(0.04, rows).round(1),
+        'snow_cm': rng.exponential(0.01, rows).round(2),
+        'snow_depth_m': rng.exponential(0.1, rows).round(2),
+        'weather_code': rng.choice([0, 1, 2, 3, 61, 71], rows),
+        'pressure_msl_hpa': rng.normal(1015, 8, rows).round(1),
+        'surface_pressure_hpa': rng.normal(975, 8, rows).round(1),
+        'cloud_cover_pct': rng.integers(0, 101, rows),
+        'wind_speed_ms': rng.gamma(2.0, 2.0, rows).round(1),
+        'wind_dir_deg': rng.integers(0, 360, rows),
+        'wind_gust_ms': rng.gamma(2.0, 3.0, rows).round(1),
+        'city': 'Astana',
+        'country_code': 'KZ',
+        'lat': 51.1694,
+        'lon': 71.4491,
+        'data_source': 'open-meteo',
+    })
+    return _files(frame)
+
+
+def bench_etl(rows, repeat):
+    sys.path.insert(0, str(ROOT / 'archive' / 'etl_scripts'))
+    try:
+        import normalize_data
+    except ImportError as exc:
+        print(f"  ETL skipped: {exc}")
+        return {'skipped': str(exc)}
+
+    rng = np.random.default_rng(0)
+    transforms = {
+        'normalize_openaq': (normalize_data.normalize_openaq, openaq_input),
+        'normalize_cams': (normalize_data.normalize_cams, cams_input),
+        'normalize_weather': (normalize_data.normalize_weather, weather_input),
+    }
+    results = {}
+    for name, (transform, make_input) in transforms.items():
+        files = make_input(rows, rng)
+        timings, out = [], 0
+        for _ in range(repeat):
+            # The transforms add columns to their input; hand them fresh frames
+            fresh = [(file, frame.copy(deep=False)) for file, frame in files]
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                output = transform(fresh)
+            timings.append(time.perf_counter() - start)
+            out = len(output)
+        results[name] = summarize(timings, rows_in=rows, rows_out=out,
+                                  rows_per_s=round(rows / np.median(timings)))
+        print(f"  {name:<26} p50 {results[name]['p50_ms']:>10.1f} ms"
+              f"  {results[name]['rows_per_s']:>12,} rows/s", flush=True)
+        del files
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(normalize_data.UNIFIED_SQL)
+            out = len(cursor.fetchall())
+        timings.append(time.perf_counter() - start)
+    results['unified_data_join'] = summarize(timings, rows_out=out)
+    print(f"  {'unified_data_join':<26} p50 {results['unified_data_join']['p50_ms']:>10.1f} ms", flush=True)
+    return results
+
+
+def worker(args):
+    """Benchmark one scale against the database this process is configured for."""
+    print(f"[{args.worker}] {settings.DATABASES['default']['NAME']}", flush=True)
+    rows, seed_s = prepare_database(args.worker, args.reseed)
+    result = {'unified_data_rows': rows, 'seed_s': seed_s}
+    with connection.cursor() as cursor:
+        cursor.execute("SHOW server_version")
+        result['postgres'] = cursor.fetchone()[0]
+    result['views'] = bench_views(args.requests)
+    if not args.skip_etl:
+        result['etl'] = bench_etl(rows, args.etl_repeat)
+    Path(args.out).write_text(json.dumps(result))
+
+
+# -- Driver --------------------------------------------------------------------
+
+def create_database(name):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", [name])
+        if not cursor.fetchone():
+            cursor.execute(f'CREATE DATABASE "{name}"')
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    results = {
+        'commit': git_commit(),
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'requests': args.requests,
+        'etl_repeat': args.etl_repeat,
+        'scales': {},
+    }
+    for scale in args.scales:
+        name = database_name(scale)
+        create_database(name)
+        # A process per scale: connections and pools stay bound to one database
+        env = {**os.environ, 'POSTGRES_DB': name, 'DEBUG': 'False',
+               'ALLOWED_HOSTS': 'testserver,localhost,127.0.0.1'}
+        env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+        with tempfile.NamedTemporaryFile(suffix='.json') as out:
+            command = [sys.executable, __file__, '--worker', scale, '--out', out.name,
+                       '--requests', str(args.requests), '--etl-repeat', str(args.etl_repeat)]
+            command += ['--reseed'] * args.reseed + ['--skip-etl'] * args.skip_etl
+            subprocess.run(command, env=env, check=True)
+            results['scales'][scale] = json.loads(Path(out.name).read_text())
+
+    text = json.dumps(results, indent=2)
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(text)
+    else:
+        print(text)
+
+
+def measurements(results):
+    """Flat {(scale, section, name, state): summary} of a results file."""
+    flat = {}
+    for scale, data in results['scales'].items():
+        for name, entry in data.get('views', {}).items():
+            for state in ('cold', 'warm'):
+                flat[(scale, 'views', name, state)] = entry[state]
+        for name, entry in data.get('etl', {}).items():
+            if isinstance(entry, dict):
+                flat[(scale, 'etl', name, '')] = entry
+    return flat
+
+
+def compare(old_path, new_path, threshold):
+    """Print p50/p95 changes between two result files; nonzero exit on regressions."""
+    old = measurements(json.loads(Path(old_path).read_text()))
+    new = measurements(json.loads(Path(new_path).read_text()))
+    print(f"{'benchmark':<50} {'p50 old':>10} {'p50 new':>10} {'ratio':>7} {'p95 ratio':>10}")
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        a, b = old[key], new[key]
+        ratio = b['p50_ms'] / a['p50_ms'] if a['p50_ms'] else float('inf')
+        ratio95 = b['p95_ms'] / a['p95_ms'] if a['p95_ms'] else float('inf')
+        flag = ''
+        if ratio > threshold:
+            regressions += 1
+            flag = '  <-- slower'
+        label = '/'.join(part for part in key if part)
+        print(f"{label:<50} {a['p50_ms']:>10.2f} {b['p50_ms']:>10.2f} {ratio:>6.2f}x {ratio95:>9.2f}x{flag}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scales', nargs='+', choices=SCALES, default=['70k'])
+    parser.add_argument('--requests', type=int, default=30, help="Requests per view and cache state")
+    parser.add_argument('--etl-repeat', type=int, default=5, help="Runs per ETL transform")
+    parser.add_argument('--reseed', action='store_true', help="Regenerate the scale databases")
+    parser.add_argument('--skip-etl', action='store_true')
+    parser.add_argument('--json', help="Write the results to this file instead of stdout")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help="Compare two result files instead of running")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="p50 ratio reported as a regression by --compare (default: 1.2)")
+    parser.add_argument('--worker', choices=SCALES, help=argparse.SUPPRESS)
+    parser.add_argument('--out', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare, args.threshold))
+    if args.worker:
+        worker(args)
+    else:
+        run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,28 +4,29 @@
 -- Data is loaded from seed_data.sql.gz
 -- ===========================================
 
--- Create unified_data table
+-- Create unified_data table, partitioned by year on timestamp_utc
+-- (new partitions: python manage.py maintain_partitions)
 CREATE TABLE IF NOT EXISTS unified_data (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     timestamp_utc TIMESTAMP NOT NULL,
     location VARCHAR(100) DEFAULT 'Astana',
     
     -- Air Quality Parameters
-    pm25 DECIMAL(10, 2),
-    pm10 DECIMAL(10, 2),
-    no2 DECIMAL(10, 4),
-    o3 DECIMAL(10, 4),
-    so2 DECIMAL(10, 4),
-    co DECIMAL(10, 4),
+    pm25 DOUBLE PRECISION,
+    pm10 DOUBLE PRECISION,
+    no2 DOUBLE PRECISION,
+    o3 DOUBLE PRECISION,
+    so2 DOUBLE PRECISION,
+    co DOUBLE PRECISION,
     
     -- Weather Parameters
-    temperature_c DECIMAL(5, 2),
-    humidity_pct DECIMAL(5, 2),
-    pressure_hpa DECIMAL(7, 2),
-    wind_speed_ms DECIMAL(5, 2),
-    wind_direction_deg DECIMAL(5, 2),
-    precipitation_mm DECIMAL(5, 2),
-    cloud_cover_pct DECIMAL(5, 2),
+    temperature_c DOUBLE PRECISION,
+    humidity_pct DOUBLE PRECISION,
+    pressure_hpa DOUBLE PRECISION,
+    wind_speed_ms DOUBLE PRECISION,
+    wind_direction_deg DOUBLE PRECISION,
+    precipitation_mm DOUBLE PRECISION,
+    cloud_cover_pct DOUBLE PRECISION,
     
     -- Temporal Features
     hour INTEGER,
@@ -39,16 +40,32 @@ CREATE TABLE IF NOT EXISTS unified_data (
     -- Data Source Tracking
     pm25_source VARCHAR(50),
     weather_source VARCHAR(50),
-    completeness_score DECIMAL(5, 4),
+    completeness_score DOUBLE PRECISION,
     
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
--- Create indexes for better query performance
-CREATE INDEX IF NOT EXISTS idx_unified_data_timestamp ON unified_data(timestamp_utc);
-CREATE INDEX IF NOT EXISTS idx_unified_data_pm25 ON unified_data(pm25);
-CREATE INDEX IF NOT EXISTS idx_unified_data_month ON unified_data(month);
-CREATE INDEX IF NOT EXISTS idx_unified_data_hour ON unified_data(hour);
+    PRIMARY KEY (id, timestamp_utc)
+) PARTITION BY RANGE (timestamp_utc);
+
+-- One partition per year of the seed data through next year, plus a
+-- default partition for anything outside them
+DO $$
+BEGIN
+    FOR y IN 2017..EXTRACT(YEAR FROM CURRENT_DATE)::int + 1 LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS unified_data_y%s PARTITION OF unified_data
+             FOR VALUES FROM (%L) TO (%L)',
+            y, make_date(y, 1, 1), make_date(y + 1, 1, 1)
+        );
+    END LOOP;
+END $$;
+CREATE TABLE IF NOT EXISTS unified_data_default PARTITION OF unified_data DEFAULT;
+
+-- BRIN for time ranges; a partial B-tree for latest-reading lookups
+CREATE INDEX IF NOT EXISTS unified_data_timestamp_brin ON unified_data
+    USING brin (timestamp_utc) WITH (pages_per_range = 16, autosummarize = on);
+CREATE INDEX IF NOT EXISTS unified_data_latest_pm25_idx ON unified_data
+    (timestamp_utc) WHERE pm25 IS NOT NULL;
 
 -- Log
 DO $$
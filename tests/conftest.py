@@ -0,0 +1,56 @@
+"""Shared pytest configuration."""
+
+from pathlib import Path
+
+import pytest
+from django.core.cache import caches
+from django.db import connections
+from django.db.models.signals import pre_migrate
+from django.test.utils import setup_databases, teardown_databases
+
+SCHEMA_SQL = Path(__file__).resolve().parent.parent / 'docker' / '01-init-schema.sql'
+
+
+def create_unified_data(sender, using, **kwargs):
+    """Create unified_data from docker/01-init-schema.sql before migrating."""
+    if sender.label != 'domain':
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(SCHEMA_SQL.read_text())
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_test_environment, django_db_blocker):
+    """
+    Build a separate test database and drop it after the session.
+
+    unified_data and the tables derived from it are created by
+    docker/01-init-schema.sql, not by migrations, so the schema is applied
+    to the fresh test database just before migrate runs. Each test marked
+    ``django_db`` runs in a transaction that is rolled back afterwards; the
+    configured database is never touched.
+    """
+    pre_migrate.connect(create_unified_data, dispatch_uid='tests.create_unified_data')
+    try:
+        with django_db_blocker.unblock():
+            old_config = setup_databases(verbosity=0, interactive=False, serialized_aliases=[])
+    finally:
+        pre_migrate.disconnect(dispatch_uid='tests.create_unified_data')
+
+    yield
+
+    with django_db_blocker.unblock():
+        teardown_databases(old_config, verbosity=0)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Drop cached responses after each test.
+
+    Tests roll their rows back without bumping data_version, so a response
+    cached by one test would otherwise be served to the next.
+    """
+    yield
+    for cache in caches.all(initialized_only=True):
+        cache.clear()
@@ -0,0 +1,39 @@
+"""Tests for the vectorized multi-pollutant AQI engine."""
+
+import numpy as np
+
+from backend.domain.services import aqi
+
+
+def test_pm25_breakpoints():
+    index = aqi.sub_index('pm25', [0.0, 12.0, 12.05, 16.0, 35.4, 55.5, 600.0])
+    assert index.tolist() == [0, 50, 50, 59, 100, 151, 500]
+
+
+def test_missing_values_are_nan():
+    index = aqi.sub_index('pm10', [np.nan, 54.0])
+    assert np.isnan(index[0]) and index[1] == 50
+
+
+def test_dominant_pollutant_and_overall_index():
+    result = aqi.compute_aqi({
+        'pm25': [10.0, np.nan, np.nan],
+        'o3': [150.0, 20.0, np.nan],  # µg/m³, ~76 ppb
+    })
+    assert result.aqi[0] == result.sub_indices['o3'][0] > result.sub_indices['pm25'][0]
+    assert result.dominant.tolist() == ['o3', 'o3', None]
+    assert np.isnan(result.aqi[2])
+    assert aqi.categories(result.aqi).tolist() == ['unhealthy_sensitive', 'good', 'unknown']
+
+
+def test_single_reading():
+    assert aqi.single(pm25=16.0) == (59, 'moderate', 'pm25')
+    assert aqi.single(pm25=None, co=None) == (None, 'unknown', None)
+
+
+def test_o3_uses_the_higher_of_the_8_hour_and_1_hour_tables():
+    # ppb -> µg/m³
+    ppb = np.array([54, 105, 150, 200, 300, 604, 700])
+    index = aqi.sub_index('o3', ppb / aqi.TO_TABLE_UNITS['o3'])
+    # 150 ppb: 8-hour 247 beats 1-hour 132; 300 ppb is above the 8-hour table
+    assert index.tolist() == [50, 200, 247, 300, 248, 500, 500]
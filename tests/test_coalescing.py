@@ -0,0 +1,106 @@
+"""Tests for single-flight computation of cache misses."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+
+from backend.infrastructure.cache import coalescing
+from backend.infrastructure.cache.coalescing import ajoin, join
+
+
+def test_concurrent_callers_share_one_computation():
+    calls = []
+    started, release = threading.Event(), threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'response', {'content': b'{}'}
+
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(join, 'resp:statistics:a', compute, 5) for _ in range(8)]
+        started.wait(5)
+        threading.Timer(0.2, release.set).start()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert sorted(result for result, _ in results if result) == ['response']
+    assert all(payload == {'content': b'{}'} for _, payload in results)
+
+
+def test_waiters_compute_themselves_without_a_payload():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'error', None
+
+    async def main():
+        return await asyncio.gather(*(ajoin('resp:hourly_pattern:a', compute, 5) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 3
+    assert [result for result, _ in results] == ['error'] * 3
+
+
+def test_nested_computation_of_the_same_key_does_not_wait_on_itself(settings, tmp_path):
+    settings.CACHES = {**settings.CACHES, 'api': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(tmp_path),
+    }}
+    settings.API_COALESCE_TIMEOUT = 5
+    assert coalescing._shared()
+
+    def sync_view():
+        return 'inner', None
+
+    async def async_view():
+        # What a coroutine view handing over to the decorated sync view does
+        return await sync_to_async(coalescing.run)('resp:timeseries:a', sync_view)
+
+    began = time.monotonic()
+    result = asyncio.run(coalescing.arun('resp:timeseries:a', async_view))
+    assert result == ('inner', None)
+    assert time.monotonic() - began < 1
+
+
+def test_shared_lock_calls_leave_the_event_loop_free(settings, tmp_path, monkeypatch):
+    settings.CACHES = {**settings.CACHES, 'api': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(tmp_path),
+    }}
+    settings.API_COALESCE_TIMEOUT = 5
+    acquire = coalescing._acquire
+
+    def slow_acquire(*args):
+        # A slow round trip to the shared cache
+        time.sleep(0.2)
+        return acquire(*args)
+
+    monkeypatch.setattr(coalescing, '_acquire', slow_acquire)
+
+    async def compute():
+        return 'response', None
+
+    async def main():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        result = await coalescing.arun('resp:statistics:b', compute)
+        ticker.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(main())
+    assert result == ('response', None)
+    assert ticks >= 5
@@ -0,0 +1,39 @@
+"""Tests for binned correlation summaries."""
+
+import numpy as np
+import pytest
+
+from backend.domain.services import correlation
+
+
+def make_pairs(n=2000):
+    rng = np.random.default_rng(1)
+    x = rng.normal(0, 10, n)
+    y = 20 - 0.5 * x + rng.normal(0, 3, n)
+    return x, y
+
+
+def test_coefficients_match_reference():
+    x, y = make_pairs()
+    assert correlation.pearson(x, y) == pytest.approx(np.corrcoef(x, y)[0, 1])
+    ranks_x = np.argsort(np.argsort(x)) + 1
+    ranks_y = np.argsort(np.argsort(y)) + 1
+    assert correlation.spearman(x, y) == pytest.approx(np.corrcoef(ranks_x, ranks_y)[0, 1])
+
+
+def test_average_ranks_with_ties():
+    ranks = correlation.average_ranks(np.array([3.0, 1.0, 3.0, 2.0]))
+    assert ranks.tolist() == [3.5, 1.0, 3.5, 2.0]
+
+
+def test_summary_counts_every_point():
+    x, y = make_pairs()
+    x[:5] = np.nan
+    grid = correlation.summarize(x, y, bins=20)
+    assert grid['n'] == 1995
+    assert np.sum(grid['grid']['counts']) == 1995
+    assert sum(grid['x_bins']['count']) == 1995
+    assert grid['regression']['slope'] == pytest.approx(-0.5, abs=0.05)
+
+    hexes = correlation.summarize(x, y, bins=20, shape='hex')
+    assert sum(hexes['hex']['counts']) == 1995
@@ -0,0 +1,125 @@
+"""Tests for query parameter handling of the data API views."""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import msgpack
+import pytest
+from django.db import connection
+from django.test import AsyncRequestFactory, RequestFactory
+
+from backend.application.api import data_views
+from backend.application.api.renderers import stream_tabular_response, tabular_response
+from backend.infrastructure.database import rollups
+from backend.infrastructure.database.cursors import fetch_json_rows, iter_batches
+
+factory = RequestFactory()
+
+
+def test_int_param_defaults_and_clamps():
+    request = factory.get('/api/daily/', {'days': '900', 'bins': '1', 'limit': ' '})
+    assert data_views.int_param(request, 'days', 30, high=365) == 365
+    assert data_views.int_param(request, 'bins', 40, low=2) == 2
+    assert data_views.int_param(request, 'limit', None) is None
+
+
+@pytest.mark.parametrize('parse, params', [
+    (data_views.dashboard_args, {'days': 'abc'}),
+    (data_views.dashboard_args, {'max_points': '1.5'}),
+    (data_views.aqi_bulk_args, {'days': 'week'}),
+    (data_views.binned_args, {'bins': 'many'}),
+    (data_views.daily_args, {'days': '7d'}),
+])
+def test_non_integer_parameters_are_rejected(parse, params):
+    with pytest.raises(ValueError, match='must be an integer'):
+        parse(factory.get('/api/', params))
+
+
+def test_invalid_parameter_is_a_client_error():
+    response = data_views.nearest_stations(factory.get('/api/stations/nearest/', {'lat': '51', 'lon': '71', 'k': 'x'}))
+    assert response.status_code == 400
+
+
+def test_msgpack_carries_a_bounded_window():
+    meta = {'start': datetime(2024, 1, 1), 'end': datetime(2024, 12, 31, 23, 59, 59, 999999)}
+    columns = {'t': [datetime(2024, 1, 1, 1)], 'v': [12.5]}
+    response = tabular_response(factory.get('/api/', {'format': 'msgpack'}), meta, columns)
+    assert msgpack.unpackb(response.content) == {
+        'start': '2024-01-01T00:00:00', 'end': '2024-12-31T23:59:59.999999',
+        't': [1704070800], 'v': [12.5],
+    }
+
+
+def test_asgi_streams_get_an_async_iterator():
+    def batches():
+        yield [(1, 2.5), (2, None)]
+        yield [(3, 4.0)]
+
+    sync = stream_tabular_response(factory.get('/api/', {'format': 'ndjson'}), {}, ['t', 'v'], batches())
+    response = stream_tabular_response(
+        AsyncRequestFactory().get('/api/', {'format': 'ndjson'}), {}, ['t', 'v'], batches(),
+    )
+
+    async def consume():
+        return b''.join([chunk async for chunk in response.streaming_content])
+
+    assert response.is_async and not sync.is_async
+    assert asyncio.run(consume()) == b''.join(sync.streaming_content)
+
+
+@pytest.mark.django_db
+def test_json_rows_follow_order_by_and_columns():
+    sql = "SELECT * FROM (VALUES (2, 'b'), (1, 'a'), (3, 'c')) v(k, name)"
+    assert json.loads(fetch_json_rows(sql, 'k DESC', columns=['name'])) == [
+        {'name': 'c'}, {'name': 'b'}, {'name': 'a'},
+    ]
+    assert fetch_json_rows(sql + ' WHERE k > 3', 'k') == '[]'
+
+
+@pytest.mark.django_db
+def test_iter_batches_fetches_in_bounded_batches():
+    batches = iter_batches('SELECT g FROM generate_series(1, 5) g ORDER BY g', batch_size=2)
+    assert list(batches) == [[(1,), (2,)], [(3,), (4,)], [(5,)]]
+
+
+@pytest.mark.django_db
+def test_streamed_timeseries_matches_the_buffered_rows():
+    hours = [datetime(2033, 5, 1) + timedelta(hours=h) for h in range(5)]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO unified_data (timestamp_utc, pm25) VALUES (%s, %s)",
+            [(hour, 10.0 + k) for k, hour in enumerate(hours)],
+        )
+        rollups.refresh_rollups(cursor, hours[0], hours[-1])
+
+    query = data_views.timeseries_query('pm25', '1h', 1)
+    _, columns = data_views.fetch_series(query)
+    response = data_views.timeseries_stream(factory.get('/api/timeseries/', {'format': 'ndjson'}), query)
+    lines = b''.join(response.streaming_content).splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {'timestamp': t.isoformat(), 'value': v} for t, v in zip(columns['t'], columns['v'])
+    ]
+    assert len(lines) == len(hours)
+
+
+@pytest.mark.parametrize('max_points', ['-5', '0', '1', '5001'])
+def test_out_of_range_max_points_is_rejected(max_points):
+    with pytest.raises(ValueError, match='max_points must be between 3 and 5000'):
+        data_views.timeseries_args(factory.get('/api/timeseries/', {'max_points': max_points}))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('max_points', ['-5', '1', '5001'])
+def test_dashboard_bundle_rejects_out_of_range_max_points(max_points):
+    request = factory.get('/api/dashboard-bundle/', {'max_points': max_points})
+    with pytest.raises(ValueError, match='max_points must be between 3 and 5000'):
+        data_views.dashboard_args(request)
+    response = data_views.dashboard_bundle(request)
+    assert response.status_code == 400
+    assert json.loads(response.content) == {'error': 'max_points must be between 3 and 5000'}
+
+
+def test_max_points_bounds_are_accepted():
+    for max_points in (3, 5000):
+        assert data_views.timeseries_args(factory.get('/api/timeseries/', {'max_points': max_points}))[1] == max_points
@@ -0,0 +1,16 @@
+"""Tests for reading the global data version."""
+
+import pytest
+from django.db import connection
+
+from backend.infrastructure.database.data_version import get_data_version
+
+
+@pytest.mark.django_db
+def test_missing_table_reads_as_no_version():
+    with connection.cursor() as cursor:
+        cursor.execute("ALTER TABLE data_version RENAME TO data_version_renamed")
+        assert get_data_version() is None
+        # The enclosing transaction is still usable
+        cursor.execute("ALTER TABLE data_version_renamed RENAME TO data_version")
+    assert get_data_version() is not None
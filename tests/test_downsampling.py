@@ -0,0 +1,53 @@
+"""Tests for chart downsampling (LTTB and min/max)."""
+
+import numpy as np
+import pytest
+
+from backend.domain.services.downsampling import (
+    downsample_indices,
+    lttb_indices,
+    minmax_indices,
+)
+
+
+def make_series(n=5000, spike_at=None):
+    rng = np.random.default_rng(42)
+    x = np.arange(n, dtype=float) * 3600
+    y = 15 + 5 * np.sin(np.arange(n) / 24 * 2 * np.pi) + rng.normal(0, 1, n)
+    if spike_at is not None:
+        y[spike_at] = 400.0
+    return x, y
+
+
+def test_lttb_bounds_output_and_keeps_endpoints():
+    x, y = make_series()
+    idx = lttb_indices(x, y, 200)
+    assert len(idx) == 200
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_spike():
+    x, y = make_series(spike_at=3217)
+    idx = lttb_indices(x, y, 100)
+    assert 3217 in idx
+
+
+def test_minmax_keeps_global_extremes():
+    x, y = make_series(spike_at=1234)
+    y[4000] = -50.0
+    idx = minmax_indices(y, 100)
+    assert len(idx) <= 100
+    assert 1234 in idx and 4000 in idx
+
+
+def test_short_series_is_returned_unchanged():
+    x, y = make_series(n=50)
+    assert list(lttb_indices(x, y, 100)) == list(range(50))
+    assert list(minmax_indices(y, 100)) == list(range(50))
+
+
+def test_unknown_method_raises():
+    x, y = make_series(n=10)
+    with pytest.raises(ValueError):
+        downsample_indices(x, y, 5, method='median')
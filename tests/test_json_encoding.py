@@ -0,0 +1,42 @@
+"""Tests for the API JSON encoders."""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from backend.application.api.json_encoding import ENCODERS, dumps
+
+
+@pytest.mark.parametrize('encoder', sorted(ENCODERS))
+def test_native_values(encoder):
+    payload = {
+        'timestamp': datetime(2024, 3, 4, 12, 0),
+        'day': date(2024, 3, 4),
+        'pm25': Decimal('16.5'),
+        'aqi': np.int64(59),
+        'mean': np.float64(12.5),
+        'series': np.array([1.0, 2.5]),
+        1: 'non-string key',
+    }
+    assert json.loads(dumps(payload, encoder)) == {
+        'timestamp': '2024-03-04T12:00:00',
+        'day': '2024-03-04',
+        'pm25': 16.5,
+        'aqi': 59,
+        'mean': 12.5,
+        'series': [1.0, 2.5],
+        '1': 'non-string key',
+    }
+
+
+@pytest.mark.parametrize('encoder', sorted(ENCODERS))
+def test_compact_utf8(encoder):
+    assert dumps({'unit': 'µg/m³', 'v': [1, None]}, encoder) == '{"unit":"µg/m³","v":[1,null]}'.encode()
+
+
+def test_unknown_type_raises():
+    with pytest.raises(TypeError):
+        dumps({'x': object()}, 'json')
@@ -0,0 +1,97 @@
+"""Tests for request and task metrics."""
+
+import threading
+from contextvars import copy_context
+
+import pytest
+from django.test import Client
+
+from backend.infrastructure import metrics
+
+prometheus_client = pytest.importorskip('prometheus_client')
+
+
+def sample(name, **labels):
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_queries_count_only_inside_a_request():
+    metrics.record_query(1.0)  # outside any request: ignored
+    token = metrics.start_sql()
+    metrics.record_query(0.25)
+    metrics.record_query(0.5)
+    assert metrics.stop_sql(token) == (2, 0.75)
+
+    token = metrics.start_sql()
+    assert metrics.stop_sql(token) == (0, 0.0)
+
+
+def test_threads_sharing_a_request_context_add_up():
+    # The dashboard bundle runs its queries in threads on a copy of the context
+    token = metrics.start_sql()
+
+    def run_queries():
+        for _ in range(1000):
+            metrics.record_query(0.001)
+
+    threads = [threading.Thread(target=copy_context().run, args=(run_queries,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    queries, seconds = metrics.stop_sql(token)
+    assert queries == 8000
+    assert seconds == pytest.approx(8.0)
+
+
+@pytest.mark.django_db
+def test_requests_are_recorded_under_their_url_name():
+    view = {'view': 'api:hourly_pattern'}
+    before = {
+        name: sample(name, **view)
+        for name in ('aaqis_http_request_queries_count', 'aaqis_http_request_queries_sum')
+    }
+    client = Client()
+    response = client.get('/api/hourly-pattern/')
+    assert response.status_code == 200
+
+    assert sample('aaqis_http_requests_total', method='GET', status='200', **view) >= 1
+    assert sample('aaqis_http_request_queries_count', **view) == before['aaqis_http_request_queries_count'] + 1
+    assert sample('aaqis_http_request_queries_sum', **view) > before['aaqis_http_request_queries_sum']
+
+    scrape = client.get('/metrics')
+    assert scrape['Content-Type'] == metrics.CONTENT_TYPE
+    text = scrape.content.decode()
+    for series in (
+        'aaqis_http_request_duration_seconds_count{method="GET",view="api:hourly_pattern"}',
+        'aaqis_http_request_queries_count{view="api:hourly_pattern"}',
+        'aaqis_http_request_sql_seconds_count{view="api:hourly_pattern"}',
+        'aaqis_http_response_bytes_count{view="api:hourly_pattern"}',
+    ):
+        assert series in text
+    # Unknown paths share one label instead of one series per URL
+    client.get('/no-such-page/')
+    assert 'view="unresolved"' in client.get('/metrics').content.decode()
+
+
+def test_celery_signals_time_tasks():
+    pytest.importorskip('celery')
+    from celery.signals import task_postrun, task_prerun
+
+    from backend.core.celery import app
+
+    @app.task(name='tests.metrics_probe')
+    def probe():
+        pass
+
+    labels = {'task': 'tests.metrics_probe', 'state': 'SUCCESS'}
+    before = sample('aaqis_celery_task_duration_seconds_count', **labels)
+    queries = sample('aaqis_celery_task_queries_total', task='tests.metrics_probe')
+
+    task_prerun.send(sender=probe, task_id='probe-1', task=probe, args=(), kwargs={})
+    metrics.record_query(0.01)
+    metrics.record_query(0.02)
+    task_postrun.send(sender=probe, task_id='probe-1', task=probe, args=(), kwargs={}, retval=None, state='SUCCESS')
+
+    assert sample('aaqis_celery_task_duration_seconds_count', **labels) == before + 1
+    assert sample('aaqis_celery_task_queries_total', task='tests.metrics_probe') == queries + 2
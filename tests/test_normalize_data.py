@@ -0,0 +1,52 @@
+"""Tests that the ETL transforms match the output of the pre-refactor pipeline."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('sqlalchemy')
+pytest.importorskip('xarray')
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / 'fixtures' / 'etl'
+sys.path.insert(0, str(ROOT / 'archive' / 'etl_scripts'))
+
+import normalize_data  # noqa: E402
+
+
+def expected(name):
+    """Rows the pipeline inserted for a sample file before the transforms were split out."""
+    return pd.read_csv(FIXTURES / f'expected_{name}.csv', parse_dates=['timestamp_utc'])
+
+
+def sample(file_name, **kwargs):
+    return [(file_name, pd.read_csv(FIXTURES / file_name, **kwargs))]
+
+
+def assert_same_rows(actual, name):
+    # Dtypes differ only in how the CSV round trip stores strings and datetimes
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True), expected(name), check_dtype=False,
+    )
+
+
+def test_openaq_output_is_unchanged():
+    assert_same_rows(normalize_data.normalize_openaq(sample('openaq_sample.csv')), 'openaq')
+
+
+def test_cams_output_is_unchanged():
+    # The CSV holds the grid as ds.to_dataframe().reset_index() yields it
+    # from cams_sample.nc.zip, the archive the expected rows were read from
+    frames = [('cams_sample.nc.zip', frame) for _, frame in sample('cams_sample.csv', parse_dates=['valid_time'])]
+    assert_same_rows(normalize_data.normalize_cams(frames), 'cams')
+
+
+def test_weather_output_is_unchanged():
+    assert_same_rows(normalize_data.normalize_weather(sample('openmeteo_sample.csv')), 'openmeteo')
+
+
+def test_cams_without_pollutants_is_none():
+    frame = pd.DataFrame({'valid_time': pd.to_datetime(['2024-01-01']), 'latitude': [51.0], 'longitude': [71.2]})
+    assert normalize_data.normalize_cams([('empty.nc.zip', frame)]) is None
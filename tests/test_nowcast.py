@@ -0,0 +1,58 @@
+"""Tests for the EPA NowCast."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from django.db import connection
+
+from backend.application.api.data_views import fetch_current
+from backend.domain.services import nowcast
+from backend.infrastructure.database.nowcast import refresh_nowcast
+
+
+def test_steady_air_is_the_plain_average():
+    assert nowcast.nowcast([20.0] * 12) == 20.0
+    assert nowcast.nowcast([0.0] * 12) == 0.0
+
+
+def test_sudden_rise_weights_recent_hours_at_the_floor():
+    # min/max = 0.25 -> weight 0.5: (40 + 10 * (1 - 0.5**11)) / (2 - 0.5**11)
+    assert nowcast.nowcast([10.0] * 11 + [40.0]) == 25.0
+
+
+def test_two_of_the_last_three_hours_required():
+    assert nowcast.nowcast([10.0] * 10 + [None, 12.0]) == 10.4
+    assert nowcast.nowcast([10.0] * 10 + [None, None]) is None
+    assert nowcast.nowcast([12.0]) is None
+    assert nowcast.nowcast([10.0, 12.0]) == 11.0
+
+
+def test_series_slides_over_gaps_and_truncates_pm10():
+    series = nowcast.nowcast_series([50.0, 51.0, np.nan, np.nan, 60.0, 61.0], 'pm10')
+    assert np.isnan(series[[0, 3, 4]]).all()
+    assert series[[1, 2, 5]].tolist() == [50.0, 50.0, 57.0]
+
+
+@pytest.mark.django_db
+def test_each_location_gets_its_own_nowcast():
+    start = datetime(2030, 1, 1)
+    hours = [start + timedelta(hours=h) for h in range(12)]
+    # Astana has no PM2.5 in the last hour, so the current reading is Almaty's
+    rows = [('Almaty', hour, 50.0, 80.0) for hour in hours] + [
+        ('Astana', hour, None if hour == hours[-1] else 10.0, 20.0) for hour in hours
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO unified_data (location, timestamp_utc, pm25, pm10) VALUES (%s, %s, %s, %s)", rows,
+        )
+        refresh_nowcast(cursor, hours[0], hours[-1])
+        cursor.execute("""
+            SELECT location, pm25, pm10 FROM unified_data_nowcast
+            WHERE timestamp_utc = %s ORDER BY location
+        """, [hours[-1]])
+        assert cursor.fetchall() == [('Almaty', 50.0, 80.0), ('Astana', 10.0, 20.0)]
+
+    current = fetch_current()
+    assert current['timestamp'] == hours[-1] and current['pm25'] == 50.0
+    assert current['nowcast'] == {'pm25': 50.0, 'pm10': 80.0}
@@ -0,0 +1,54 @@
+"""Tests for keyset pagination of the measurement API."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from rest_framework.test import APIClient
+
+from backend.domain.models import AirQualityMeasurement, City, MonitoringStation
+
+URL = '/api/measurements/'
+# Far enough in the future to be the only rows in the window
+START = datetime(2099, 1, 1, tzinfo=timezone.utc)
+WINDOW = {'start_date': '2099-01-01T00:00:00Z', 'end_date': '2099-12-31T00:00:00Z', 'page_size': 2}
+
+
+@pytest.fixture
+def measurements(db):
+    city = City.objects.create(name='Test City', latitude=51.1, longitude=71.4)
+    station = MonitoringStation.objects.create(
+        station_id='test-keyset', name='Test', city=city, source='openaq', latitude=51.1, longitude=71.4,
+    )
+    # Two readings share a timestamp across a page boundary, so the id has
+    # to break the tie
+    stamps = [START + timedelta(hours=h) for h in (0, 1, 2, 2, 3)]
+    rows = [
+        AirQualityMeasurement.objects.create(station=station, timestamp=stamp, pollutant=pollutant, value=k)
+        for k, (stamp, pollutant) in enumerate(zip(stamps, ['pm25', 'pm25', 'pm25', 'pm10', 'pm25']))
+    ]
+    return sorted(rows, key=lambda row: (row.timestamp, row.id), reverse=True)
+
+
+def test_cursor_round_trip(measurements):
+    client = APIClient()
+    page = client.get(URL, WINDOW).json()
+    assert page['previous'] is None
+    ids = [row['id'] for row in page['results']]
+
+    while page['next']:
+        previous_ids = [row['id'] for row in page['results']]
+        page = client.get(page['next']).json()
+        ids += [row['id'] for row in page['results']]
+        # Going back returns the page we came from
+        back = client.get(page['previous']).json()
+        assert [row['id'] for row in back['results']] == previous_ids
+
+    assert ids == [row.id for row in measurements]
+    # The last page is short and has no next link
+    assert len(page['results']) == 1 and page['next'] is None
+
+
+def test_invalid_cursor_is_not_found(db):
+    response = APIClient().get(URL, {'cursor': 'not-a-cursor'})
+    assert response.status_code == 404
+    assert response.json() == {'detail': 'Invalid cursor'}
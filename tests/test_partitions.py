@@ -0,0 +1,50 @@
+"""Tests for yearly partition maintenance of unified_data."""
+
+from datetime import date, datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from backend.infrastructure.database import partitions
+
+
+def rows_of(cursor, table):
+    cursor.execute(f"SELECT timestamp_utc, pm25 FROM {table} ORDER BY timestamp_utc")
+    return cursor.fetchall()
+
+
+@pytest.mark.django_db
+def test_next_year_partition_takes_over_its_rows_from_the_default():
+    with connection.cursor() as cursor:
+        last = partitions.partition_years(cursor)[-1]
+        upcoming = datetime(last + 1, 3, 1)
+        # Written before its partition exists, so it sits in the default one
+        cursor.execute("INSERT INTO unified_data (timestamp_utc, pm25) VALUES (%s, 12.5)", [upcoming])
+        assert rows_of(cursor, partitions.DEFAULT_PARTITION) == [(upcoming, 12.5)]
+
+        created = partitions.ensure_partitions(cursor, ahead=1, today=date(last, 6, 1))
+
+        assert created == [last + 1]
+        assert partitions.partition_years(cursor)[-1] == last + 1
+        assert rows_of(cursor, partitions.partition_name(last + 1)) == [(upcoming, 12.5)]
+        assert rows_of(cursor, partitions.DEFAULT_PARTITION) == []
+        # The new partition carries the parent's BRIN index
+        cursor.execute("""
+            SELECT am.amname FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_am am ON am.oid = c.relam
+            WHERE i.indrelid = to_regclass(%s)
+        """, [partitions.partition_name(last + 1)])
+        assert 'brin' in {row[0] for row in cursor.fetchall()}
+
+        # A second run has nothing left to do
+        assert partitions.ensure_partitions(cursor, ahead=1, today=date(last, 6, 1)) == []
+
+
+@pytest.mark.django_db
+def test_command_reports_when_partitions_are_present():
+    out = StringIO()
+    call_command('maintain_partitions', ahead=0, stdout=out)
+    assert 'All partitions present' in out.getvalue()
@@ -0,0 +1,110 @@
+"""Tests for the pattern cube and the pattern endpoints."""
+
+import json
+from datetime import datetime
+
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+
+from backend.application.api import data_views
+from backend.infrastructure.database import patterns
+
+
+def test_filters_become_any_conditions_in_dimension_order():
+    where, params = patterns.where_clause({'hour': range(6, 10), 'year': [2023]})
+    assert where == "year = ANY(%(year)s) AND hour = ANY(%(hour)s)"
+    assert params == {'year': [2023], 'hour': [6, 7, 8, 9]}
+    assert patterns.where_clause({}) == ('TRUE', {})
+
+
+def test_pattern_sql_merges_sums_and_counts():
+    sql, params = patterns.pattern_sql(
+        'month', {'avg_pm25': 'pm25', 'avg_no2': 'no2'}, {'season': ['winter']},
+        count='count', temperature='avg_temp',
+    )
+    assert params == {'season': ['winter'], 'parameter_0': 'pm25', 'parameter_1': 'no2'}
+    assert "SUM(value_sum) FILTER (WHERE parameter = %(parameter_1)s)" in sql
+    assert "SUM(temperature_sum) FILTER (WHERE parameter = %(parameter_0)s)" in sql
+    assert "AS count" in sql and "GROUP BY month" in sql
+
+
+# Readings over two months; None calendar fields are left NULL
+READINGS = [
+    # timestamp, pm25, temperature, calendar fields set
+    (datetime(2035, 1, 6, 3), 40.0, -12.0, True),
+    (datetime(2035, 1, 6, 3, 30), 44.0, None, False),
+    (datetime(2035, 1, 7, 3), None, -20.0, True),
+    (datetime(2035, 1, 8, 14), 12.0, -5.0, False),
+    (datetime(2035, 6, 9, 14), 6.0, 24.0, True),
+    (datetime(2035, 6, 10, 14), 8.0, 28.0, False),
+]
+
+
+@pytest.fixture
+def readings(db):
+    rows = []
+    for timestamp, pm25, temperature, calendar in READINGS:
+        fields = (None,) * 5
+        if calendar:
+            month = timestamp.month
+            season = {1: 'winter', 6: 'summer'}[month]
+            fields = (month, (timestamp.weekday() + 1) % 7, timestamp.hour, season, month in (10, 11, 12, 1, 2, 3, 4))
+        rows.append((timestamp, pm25, temperature, *fields))
+    with connection.cursor() as cursor:
+        cursor.executemany("""
+            INSERT INTO unified_data
+                (timestamp_utc, pm25, temperature_c, month, day_of_week, hour, season, is_heating_season)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, rows)
+        patterns.refresh_patterns(cursor)
+
+
+def raw_rows(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        names = [column.name for column in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def response_rows(view, params=None):
+    response = view(RequestFactory().get('/api/', params or {}))
+    assert response.status_code == 200
+    return json.loads(response.content)['data']
+
+
+def test_hourly_pattern_matches_a_group_by_over_unified_data(readings):
+    # Temperature only counts where there is PM2.5, like the original query
+    expected = raw_rows("""
+        SELECT EXTRACT(HOUR FROM timestamp_utc)::int AS hour,
+               AVG(pm25) AS avg_pm25, AVG(temperature_c) AS avg_temp
+        FROM unified_data
+        WHERE pm25 IS NOT NULL
+        GROUP BY 1 ORDER BY 1
+    """)
+    assert [row['hour'] for row in expected] == [3, 14]
+    assert response_rows(data_views.hourly_pattern) == [pytest.approx(row) for row in expected]
+
+
+def test_monthly_pattern_matches_a_group_by_over_unified_data(readings):
+    expected = raw_rows("""
+        SELECT EXTRACT(MONTH FROM timestamp_utc)::int AS month,
+               AVG(pm25) AS avg_pm25, COUNT(*) AS count,
+               to_char(make_date(2000, EXTRACT(MONTH FROM timestamp_utc)::int, 1), 'Mon') AS month_name
+        FROM unified_data
+        WHERE pm25 IS NOT NULL
+        GROUP BY 1 ORDER BY 1
+    """)
+    assert response_rows(data_views.monthly_pattern) == [
+        {**row, 'avg_pm25': pytest.approx(row['avg_pm25'])} for row in expected
+    ]
+
+
+def test_rows_without_calendar_fields_follow_their_timestamp(readings):
+    # 2035-01-08 is a Monday in the heating season; 2035-06-10 a Sunday
+    assert response_rows(data_views.hourly_pattern, {'is_heating_season': 'true', 'hour': '14'}) == [
+        {'hour': 14, 'avg_pm25': 12.0, 'avg_temp': -5.0},
+    ]
+    assert response_rows(data_views.hourly_pattern, {'season': 'summer', 'day_of_week': '0'}) == [
+        {'hour': 14, 'avg_pm25': 8.0, 'avg_temp': 28.0},
+    ]
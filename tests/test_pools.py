@@ -0,0 +1,51 @@
+"""Tests for the database connection pool settings and statistics."""
+
+import runpy
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.db import connection
+
+from backend.infrastructure.database import pools
+
+SETTINGS = Path(settings.BASE_DIR) / 'backend' / 'core' / 'settings.py'
+
+
+def load_settings(monkeypatch, **env):
+    """Settings module globals as evaluated under `env`."""
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path(str(SETTINGS))
+
+
+def test_pool_sizes_and_recycling_come_from_the_environment(monkeypatch):
+    database = load_settings(
+        monkeypatch, DB_POOL='True', DB_POOL_MIN_SIZE='4', DB_POOL_MAX_SIZE='16',
+        DB_POOL_TIMEOUT='2.5', DB_POOL_MAX_IDLE='60', DB_POOL_MAX_LIFETIME='600',
+    )['DATABASES']['default']
+    assert database['OPTIONS']['pool'] == {
+        'min_size': 4, 'max_size': 16, 'timeout': 2.5,
+        'max_idle': 60.0, 'max_lifetime': 600.0, 'name': 'aaqis',
+    }
+    # The pool owns connection reuse; health checks run as its check callback
+    assert database['CONN_MAX_AGE'] == 0 and database['CONN_HEALTH_CHECKS']
+
+
+def test_without_a_pool_connections_persist_per_thread(monkeypatch):
+    database = load_settings(monkeypatch, DB_POOL='False', CONN_MAX_AGE='120')['DATABASES']['default']
+    assert 'pool' not in database['OPTIONS']
+    assert database['CONN_MAX_AGE'] == 120 and database['CONN_HEALTH_CHECKS']
+
+
+@pytest.mark.skipif(not settings.DB_POOL, reason='DB_POOL is off')
+@pytest.mark.django_db
+def test_pool_stats_describe_the_open_pool():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        stats = pools.pool_stats()['default']
+
+    configured = settings.DATABASES['default']['OPTIONS']['pool']
+    assert (stats['min_size'], stats['max_size']) == (configured['min_size'], configured['max_size'])
+    assert stats['in_use'] >= 1 and stats['checkouts'] >= 1
+    assert stats['saturation'] == round(stats['in_use'] / stats['max_size'], 3)
@@ -0,0 +1,135 @@
+"""Tests for content negotiation of tabular API responses."""
+
+import json
+from datetime import datetime
+
+import msgpack
+import pytest
+from django.test import RequestFactory
+
+from backend.application.api import renderers
+from backend.application.api.renderers import tabular_response
+
+factory = RequestFactory()
+
+META = {'parameter': 'pm25'}
+COLUMNS = {'t': [datetime(2024, 1, 1), datetime(2024, 1, 1, 1)], 'v': [12.5, None]}
+
+
+@pytest.mark.parametrize('headers, params, expected', [
+    ({}, {}, renderers.JSON),
+    ({'Accept': 'application/msgpack'}, {}, renderers.MSGPACK),
+    ({'Accept': 'application/x-msgpack'}, {}, renderers.MSGPACK),
+    ({'Accept': 'text/html;q=0.9, application/vnd.aaqis.columnar+json'}, {}, renderers.COLUMNAR_JSON),
+    ({'Accept': 'application/msgpack'}, {'format': 'arrow'}, renderers.ARROW),
+    ({'Accept': 'text/csv'}, {}, None),
+    ({}, {'format': 'xml'}, None),
+])
+def test_negotiate_prefers_format_then_accept(headers, params, expected):
+    assert renderers.negotiate(factory.get('/api/', params, headers=headers)) == expected
+
+
+def test_json_keeps_the_row_layout():
+    response = tabular_response(factory.get('/api/'), META, COLUMNS, row_names={'t': 'timestamp'})
+    assert response['Content-Type'] == renderers.JSON
+    assert json.loads(response.content) == {'parameter': 'pm25', 'data': [
+        {'timestamp': '2024-01-01T00:00:00', 'v': 12.5},
+        {'timestamp': '2024-01-01T01:00:00', 'v': None},
+    ]}
+
+
+def test_columnar_and_msgpack_carry_the_same_payload():
+    expected = {'parameter': 'pm25', 't': [1704067200, 1704070800], 'v': [12.5, None]}
+    columnar = tabular_response(factory.get('/api/', {'format': 'columnar'}), META, COLUMNS)
+    packed = tabular_response(factory.get('/api/', headers={'Accept': 'application/msgpack'}), META, COLUMNS)
+    assert columnar['Content-Type'] == renderers.COLUMNAR_JSON
+    assert json.loads(columnar.content) == expected
+    assert packed['Content-Type'] == renderers.MSGPACK
+    assert msgpack.unpackb(packed.content) == expected
+
+
+def test_arrow_puts_meta_in_the_schema():
+    pa = pytest.importorskip('pyarrow')
+    response = tabular_response(factory.get('/api/', {'format': 'arrow'}), META, COLUMNS)
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert response['Content-Type'] == renderers.ARROW
+    assert table.schema.field('t').type == pa.timestamp('s')
+    assert table.column('t').to_pylist() == COLUMNS['t']
+    assert table.column('v').to_pylist() == [12.5, None]
+    assert json.loads(table.schema.metadata[b'aaqis']) == META
+
+
+def test_unacceptable_format_lists_what_is_available():
+    response = tabular_response(factory.get('/api/', headers={'Accept': 'text/csv'}), META, COLUMNS)
+    assert response.status_code == 406
+    assert json.loads(response.content)['available'] == renderers.available_media_types()
+    assert response['Vary'] == 'Accept'
+
+
+@pytest.mark.parametrize('fmt', ['json', 'columnar', 'msgpack'])
+def test_every_format_varies_on_accept(fmt):
+    response = tabular_response(factory.get('/api/', {'format': fmt}), META, COLUMNS)
+    assert response.status_code == 200
+    assert response['Vary'] == 'Accept'
+
+
+def batches_of(rows, size):
+    for k in range(0, len(rows), size):
+        yield rows[k:k + size]
+
+
+ROWS = [(datetime(2024, 1, 1, h), float(h)) for h in range(5)]
+
+
+def stream(fmt, rows=ROWS):
+    return renderers.stream_tabular_response(
+        factory.get('/api/', {'format': fmt}), META, ['t', 'v'], batches_of(rows, 2),
+        row_names={'t': 'timestamp'},
+    )
+
+
+def streamed(fmt, rows=ROWS):
+    response = stream(fmt, rows)
+    return response, b''.join(response.streaming_content)
+
+
+def test_streamed_json_matches_the_buffered_layout():
+    columns = {'t': [t for t, _ in ROWS], 'v': [v for _, v in ROWS]}
+    buffered = tabular_response(factory.get('/api/'), META, columns, row_names={'t': 'timestamp'})
+    response, content = streamed('json')
+    assert response['Vary'] == 'Accept'
+    assert json.loads(content) == json.loads(buffered.content)
+    assert json.loads(streamed('json', rows=[])[1]) == {'parameter': 'pm25', 'data': []}
+
+
+def test_ndjson_writes_one_row_per_line():
+    response, content = streamed('ndjson')
+    lines = content.decode().splitlines()
+    assert response['Content-Type'] == renderers.NDJSON
+    assert [json.loads(line) for line in lines] == [
+        {'timestamp': t.isoformat(), 'v': v} for t, v in ROWS
+    ]
+
+
+def test_arrow_stream_is_written_batch_by_batch():
+    pa = pytest.importorskip('pyarrow')
+    _, content = streamed('arrow')
+    reader = pa.ipc.open_stream(content)
+    batches = list(reader)
+    assert [batch.num_rows for batch in batches] == [2, 2, 1]
+    assert pa.Table.from_batches(batches).to_pylist() == [{'t': t, 'v': v} for t, v in ROWS]
+    assert json.loads(reader.schema.metadata[b'aaqis']) == META
+
+
+def test_empty_arrow_stream_is_still_readable():
+    pa = pytest.importorskip('pyarrow')
+    _, content = streamed('arrow', rows=[])
+    table = pa.ipc.open_stream(content).read_all()
+    assert table.num_rows == 0
+    assert table.column_names == ['t', 'v']
+
+
+def test_streams_reject_formats_that_need_the_whole_result():
+    response = stream('msgpack')
+    assert response.status_code == 406
+    assert json.loads(response.content)['available'] == renderers.available_stream_types()
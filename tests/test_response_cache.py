@@ -0,0 +1,62 @@
+"""Tests for response cache keys, time-range dependencies and cached views."""
+
+import asyncio
+from datetime import datetime
+
+from django.test import AsyncRequestFactory
+from django.utils.datastructures import MultiValueDict
+
+from backend.application.api.caching import cached_response
+from backend.application.api.json_encoding import FastJsonResponse
+from backend.infrastructure.cache.response_cache import (
+    ALL,
+    BASE,
+    TAIL,
+    dependency_keys,
+    make_key,
+    month_keys,
+)
+
+
+def test_key_ignores_parameter_order_and_empty_values():
+    a = MultiValueDict({'days': ['7'], 'parameter': ['pm25']})
+    b = MultiValueDict({'parameter': [' pm25 '], 'days': ['7'], 'format': ['']})
+    assert make_key('timeseries_data', a) == make_key('timeseries_data', b)
+
+
+def test_key_depends_on_endpoint_and_media_type():
+    params = MultiValueDict({'days': ['7']})
+    assert make_key('timeseries_data', params) != make_key('daily_averages', params)
+    assert make_key('timeseries_data', params, 'application/json') != make_key(
+        'timeseries_data', params, 'application/msgpack'
+    )
+
+
+def test_month_keys_cross_year_boundary():
+    keys = month_keys(datetime(2024, 11, 20), datetime(2025, 2, 1))
+    assert keys == ['gen:2024-11', 'gen:2024-12', 'gen:2025-01', 'gen:2025-02']
+
+
+def test_dependency_keys():
+    assert dependency_keys(None) == [BASE, ALL]
+    open_ended = dependency_keys((datetime(2025, 2, 20), None), latest=datetime(2025, 3, 4))
+    assert open_ended == [BASE, 'gen:2025-02', 'gen:2025-03', TAIL]
+
+
+def test_coroutine_views_are_cached():
+    calls = []
+
+    @cached_response()
+    async def hourly_pattern(request):
+        calls.append(1)
+        return FastJsonResponse({'data': []})
+
+    async def get():
+        request = AsyncRequestFactory().get('/api/hourly-pattern/')
+        request._data_version = None  # no data_version row to read
+        return await hourly_pattern(request)
+
+    responses = [asyncio.run(get()) for _ in range(2)]
+    assert [response['X-Cache'] for response in responses] == ['MISS', 'HIT']
+    assert responses[1].content == b'{"data":[]}'
+    assert len(calls) == 1
@@ -0,0 +1,68 @@
+"""Tests for rollup resolution handling and refreshes."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from django.db import connection
+
+from backend.infrastructure.database import rollups
+
+
+def test_resolution_hours():
+    assert rollups.resolution_hours('6h') == 6
+    assert rollups.resolution_hours('2w') == 336
+    assert rollups.resolution_hours('1mo') == rollups.MONTH_HOURS
+    with pytest.raises(ValueError):
+        rollups.resolution_hours('5m')
+
+
+@pytest.mark.parametrize('span_days, target, expected', [
+    (2, 500, '1h'),
+    (30, 500, '3h'),
+    (365, 500, '1d'),
+    (8 * 365, 500, '1w'),
+    (8 * 365, 100, '1mo'),
+    (100 * 365, 10, '1mo'),
+])
+def test_auto_resolution_stays_under_the_target(span_days, target, expected):
+    assert rollups.auto_resolution(span_days * 24, target) == expected
+
+
+def rollup_rows(cursor, resolution):
+    cursor.execute("""
+        SELECT bucket_start, value_count, value_sum, value_min, value_max
+        FROM unified_data_rollup
+        WHERE resolution = %s AND parameter = 'pm25'
+        ORDER BY bucket_start
+    """, [resolution])
+    return cursor.fetchall()
+
+
+@pytest.mark.django_db
+def test_refresh_of_a_partial_bucket_rebuilds_every_level():
+    day = datetime(2032, 3, 2)
+    hours = [day + timedelta(hours=h) for h in range(8)]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO unified_data (timestamp_utc, pm25) VALUES (%s, %s)",
+            [(hour, float(k)) for k, hour in enumerate(hours)],
+        )
+        rollups.refresh_rollups(cursor, hours[0], hours[-1])
+
+        # A late reading lands inside the 03:00 hour and the first 6h bucket;
+        # only its own instant is refreshed
+        late = day + timedelta(hours=3, minutes=30)
+        cursor.execute("INSERT INTO unified_data (timestamp_utc, pm25) VALUES (%s, 100.0)", [late])
+        rollups.refresh_rollups(cursor, late, late)
+
+        hourly = rollup_rows(cursor, '1h')
+        assert hourly[3] == (hours[3], 2, 103.0, 3.0, 100.0)
+        assert [row[1] for row in hourly] == [1, 1, 1, 2, 1, 1, 1, 1]
+        # Whole buckets are recomputed, so neither the readings outside the
+        # refreshed instant are lost nor the old ones counted twice
+        assert rollup_rows(cursor, '6h') == [
+            (hours[0], 7, 115.0, 0.0, 100.0),
+            (hours[6], 2, 13.0, 6.0, 7.0),
+        ]
+        assert rollup_rows(cursor, '1d') == [(day, 9, 128.0, 0.0, 100.0)]
+        assert rollup_rows(cursor, '1mo') == [(datetime(2032, 3, 1), 9, 128.0, 0.0, 100.0)]
@@ -0,0 +1,59 @@
+"""Tests for the nearest-neighbour index on the sphere and station interpolation."""
+
+import numpy as np
+import pytest
+
+from backend.application import stations
+from backend.domain.models import City, MonitoringStation
+from backend.domain.services import spatial
+
+
+def test_haversine_astana_almaty():
+    assert spatial.haversine_km(51.1694, 71.4491, 43.2389, 76.8897) == pytest.approx(969, abs=5)
+
+
+def test_nearest_matches_brute_force_across_the_antimeridian():
+    rng = np.random.default_rng(7)
+    lat, lon = rng.uniform(-80, 80, 500), rng.uniform(-180, 180, 500)
+    index = spatial.SphereIndex(lat, lon)
+    for q_lat, q_lon in [(51.17, 71.45), (0.0, 179.9), (-60.0, -179.9), (89.0, 0.0)]:
+        positions, distances = index.nearest(q_lat, q_lon, k=5)
+        brute = spatial.haversine_km(q_lat, q_lon, lat, lon)
+        assert positions.tolist() == np.argsort(brute)[:5].tolist()
+        assert np.allclose(distances, np.sort(brute)[:5])
+
+
+def test_nearest_with_few_points():
+    index = spatial.SphereIndex([10.0, 20.0], [30.0, 40.0])
+    positions, _ = index.nearest(19.0, 39.0, k=5)
+    assert positions.tolist() == [1, 0]
+    assert len(spatial.SphereIndex([], []).nearest(0.0, 0.0, k=3)[0]) == 0
+
+
+def test_idw_blend():
+    assert spatial.idw([1.0, 2.0], [10.0, 20.0]) == pytest.approx(12.0)
+    assert spatial.idw([0.0, 5.0], [3.0, 100.0]) == 3.0
+    assert spatial.idw([1.0, 2.0], [None, 20.0]) == 20.0
+    assert spatial.idw([1.0], [None]) is None
+
+
+@pytest.mark.django_db
+def test_interpolation_widens_the_search_past_stations_without_readings():
+    city = City.objects.create(name='Astana', latitude=51.17, longitude=71.45)
+    # Due north of the query point at roughly 11, 22, 33 and 44 km
+    created = [
+        MonitoringStation.objects.create(
+            station_id=f'test-{k}', name=f'Station {k}', city=city, source='openaq',
+            latitude=51.0 + 0.1 * k, longitude=71.4,
+        )
+        for k in range(1, 5)
+    ]
+    readings = {created[1].id: 20.0, created[2].id: 30.0, created[3].id: 100.0}
+
+    # The nearest station has no reading; the next two are blended
+    distances = spatial.haversine_km(51.0, 71.4, [51.2, 51.3], [71.4, 71.4])
+    expected = spatial.idw(distances, [20.0, 30.0])
+    assert stations.interpolate(51.0, 71.4, readings, k=2) == pytest.approx(expected)
+    assert 20.0 < expected < 25.0
+    assert stations.interpolate(51.0, 71.4, {}, k=2) is None
+    assert [s.station_id for s, _ in stations.nearest(51.0, 71.4, k=2)] == ['test-1', 'test-2']
@@ -0,0 +1,67 @@
+"""Tests for mergeable summary statistics."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from django.db import connection
+
+from backend.domain.services import aqi
+from backend.domain.services.statistics import PM25_CATEGORIES, RunningStats, merge_all
+from backend.infrastructure.database.stats import (
+    UNKNOWN_SEASON,
+    fetch_cells,
+    refresh_stats,
+)
+
+
+def accumulate(values):
+    """RunningStats of `values` computed directly with NumPy."""
+    values = np.asarray(values, dtype=float)
+    mean = values.mean()
+    return RunningStats(len(values), mean, ((values - mean) ** 2).sum(), values.min(), values.max())
+
+
+def test_merge_equals_single_pass():
+    values = np.random.default_rng(3).normal(1e4, 5.0, 1000)
+    merged = merge_all(accumulate(chunk) for chunk in np.array_split(values, 7))
+    assert merged.count == 1000
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.std == pytest.approx(values.std(ddof=1))
+    assert (merged.min, merged.max) == (values.min(), values.max())
+
+
+def test_empty_and_single_value():
+    assert RunningStats().merge(RunningStats()).count == 0
+    single = accumulate([4.0])
+    assert single.variance is None and single.std is None
+    assert RunningStats().merge(single) == single
+
+
+@pytest.mark.django_db
+def test_refreshed_cells_merge_to_the_whole_range():
+    stamps = [datetime(2031, 1, 1) + timedelta(days=5 * k) for k in range(200)]
+    values = np.random.default_rng(11).gamma(2.0, 10.0, len(stamps))
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO unified_data (timestamp_utc, pm25, season) VALUES (%s, %s, %s)",
+            [(t, float(v), None if k % 9 == 0 else 'winter') for k, (t, v) in enumerate(zip(stamps, values))],
+        )
+        refresh_stats(cursor, stamps[0], stamps[-1])
+        cells = fetch_cells(cursor, 'pm25')
+
+    # Cells span both calendar years and the season-less rows
+    assert {(c.year, c.season) for c in cells} >= {(2031, UNKNOWN_SEASON), (2032, 'winter')}
+    merged = merge_all(c.stats for c in cells)
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.std == pytest.approx(values.std(ddof=1))
+    assert (merged.first, merged.last) == (stamps[0], stamps[-1])
+
+
+def test_pm25_categories_match_the_aqi_engine():
+    for k, (label, upper) in enumerate(PM25_CATEGORIES[:-1]):
+        # Truncated to 0.1 µg/m³, so upper + 0.05 still belongs to this category
+        found = aqi.categories(aqi.sub_index('pm25', [upper, upper + 0.05, upper + 0.1]))
+        expected = [aqi.CATEGORIES[k][0]] * 2 + [aqi.CATEGORIES[k + 1][0]]
+        assert found.tolist() == expected, label
@@ -0,0 +1,70 @@
+"""Tests for the synthetic air quality and weather generator."""
+
+from datetime import datetime
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+
+from backend.domain.services import synthetic
+
+
+def test_ar1_matches_recursion():
+    rng = np.random.default_rng(3)
+    shocks = rng.normal(size=500)
+    expected, prev = [], 1.5
+    for shock in shocks:
+        prev = 0.9 * prev + shock
+        expected.append(prev)
+    assert np.allclose(synthetic.ar1(shocks, 0.9, start=1.5), expected)
+
+
+def test_calendar_uses_postgres_day_of_week():
+    columns = synthetic.calendar(pd.DatetimeIndex(['2024-03-31 23:00', '2024-04-01 00:00']))
+    assert columns['day_of_week'].tolist() == [0, 1]  # Sunday, Monday
+    assert columns['is_weekend'].tolist() == [True, False]
+    assert columns['season'].tolist() == ['spring', 'spring']
+    assert columns['is_heating_season'].all()
+
+
+def test_generated_series_reproduce_astana_patterns():
+    city = synthetic.CITIES[0]
+    frame = synthetic.generate(city, datetime(2020, 1, 1), datetime(2023, 1, 1), np.random.default_rng(1))
+    assert len(frame) == 3 * 8760 + 24  # 2020 is a leap year
+    pm25 = frame['pm25']
+
+    heating = frame['is_heating_season']
+    assert 1.8 < pm25[heating].mean() / pm25[~heating].mean() < 3.2
+    assert pm25.corr(frame['temperature_c']) == pytest.approx(-0.4, abs=0.12)
+
+    by_local_hour = pm25.groupby((frame['hour'] + city.utc_offset) % 24).mean()
+    assert by_local_hour[8] > by_local_hour[13] and by_local_hour[19] > by_local_hour[13]
+    assert 0.01 < pm25.isna().mean() < 0.12
+
+
+def unified_count(location):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM unified_data WHERE location = %s", [location])
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_loading_refuses_periods_with_ingested_rows():
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO unified_data (timestamp_utc, location, pm25, weather_source)
+            VALUES ('2036-05-01 12:00', 'Astana', 9.0, 'open-meteo')
+        """)
+    options = {'cities': 1, 'tables': ['unified_data'], 'no_refresh': True, 'stdout': StringIO()}
+    with pytest.raises(CommandError, match='unified_data already holds ingested rows for Astana in 2036-2036'):
+        call_command('generate_synthetic_data', start_year=2036, **options)
+    assert unified_count('Astana') == 1
+
+    # Another year is free, and reloading it replaces the synthetic rows
+    call_command('generate_synthetic_data', start_year=2037, **options)
+    call_command('generate_synthetic_data', start_year=2037, **options)
+    assert unified_count('Astana') == 1 + 8760
@@ -0,0 +1,61 @@
+"""Tests for multi-parameter timeseries queries."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from django.db import connection
+
+from backend.application.api import data_views
+from backend.infrastructure.database import rollups
+
+DAY = datetime(2034, 7, 1)
+HOURS = [DAY + timedelta(hours=h) for h in range(8)]
+
+
+@pytest.mark.parametrize('parameter', ['pm25,radon', 'pm25,pm10,pm25'])
+def test_invalid_parameter_lists_are_rejected(parameter):
+    with pytest.raises(ValueError, match='Invalid parameter list'):
+        data_views.timeseries_query(parameter, '1h', 7)
+
+
+def test_each_parameter_gets_its_own_columns():
+    query = data_views.timeseries_query('pm25, temperature', '6h', 7)
+    assert query.meta['parameters'] == ['pm25', 'temperature']
+    assert query.meta['units'] == {'pm25': 'µg/m³', 'temperature': '°C'}
+    assert query.names == [
+        't', 'pm25', 'pm25_min', 'pm25_max', 'temperature', 'temperature_min', 'temperature_max',
+    ]
+    assert data_views.timeseries_query('pm25,temperature', '1h', 7).names == ['t', 'pm25', 'temperature']
+
+
+@pytest.fixture
+def readings(db):
+    # PM2.5 stops after 06:00; temperature carries on and skips 01:00
+    rows = [
+        (hour, float(k) if k < 6 else None, None if k == 1 else 20.0 + k)
+        for k, hour in enumerate(HOURS)
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO unified_data (timestamp_utc, pm25, temperature_c) VALUES (%s, %s, %s)", rows,
+        )
+        rollups.refresh_rollups(cursor, HOURS[0], HOURS[-1])
+
+
+def test_series_share_the_anchor_time_axis(readings):
+    _, columns = data_views.fetch_series(data_views.timeseries_query('pm25,temperature', '1h', 1))
+    # The window ends with the first parameter, so temperature past it is cut
+    assert columns['t'] == HOURS[:6]
+    assert columns['pm25'] == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+    assert columns['temperature'] == [20.0, None, 22.0, 23.0, 24.0, 25.0]
+
+    _, columns = data_views.fetch_series(data_views.timeseries_query('temperature,pm25', '1h', 1))
+    assert columns['t'] == HOURS
+    assert columns['pm25'] == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, None, None]
+
+
+def test_coarse_buckets_carry_the_spread_of_every_series(readings):
+    _, columns = data_views.fetch_series(data_views.timeseries_query('pm25,temperature', '6h', 1))
+    assert columns['t'] == [HOURS[0]]
+    assert (columns['pm25'], columns['pm25_min'], columns['pm25_max']) == ([2.5], [0.0], [5.0])
+    assert (columns['temperature_min'], columns['temperature_max']) == ([20.0], [25.0])